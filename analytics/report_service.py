@@ -1,13 +1,30 @@
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime, time
+from time import monotonic
+from typing import Dict, List, Optional, Tuple, Union
 
+from analytics.tracking import write_generation
 from config.settings import load_settings
 from db.connection import database_connection_scope
-from db.selectors import get_funnel_conversion_summary
+from db.selectors import (
+    get_funnel_conversion_summary,
+    get_funnel_conversion_summary_daily,
+)
 
 
-@dataclass
+# Conversion reports are frequently regenerated with identical bounds
+# (dashboard refreshes, cron re-runs). Cache results per (from, to) tuple for
+# a short TTL, and invalidate eagerly when funnel_entries is written to in
+# this process (tracked via analytics.tracking.write_generation).
+_REPORT_CACHE_TTL_SECONDS = 300.0
+
+_report_cache: Dict[
+    Tuple[Optional[datetime], Optional[datetime]],
+    Tuple[float, int, List["FunnelConversion"]],
+] = {}
+
+
+@dataclass(slots=True, frozen=True)
 class FunnelConversion:
     """Conversion statistics for a single funnel type.
 
@@ -35,45 +52,150 @@ class FunnelConversion:
         return self.total_purchased / self.total_entries
 
 
-def generate_conversion_report(
+def compute_conversion_rates(report: List[FunnelConversion]) -> List[float]:
+    """Computes conversion rates for a whole report batch in a single pass.
+
+    The per-object conversion_rate property is convenient for row-level access
+    but pays a Python-level attribute lookup and branch per call. Callers that
+    render many rows (e.g. if the report is ever extended to per-day buckets)
+    should compute the whole rate column here instead of looping over the
+    property.
+
+    Args:
+        report: Report rows as returned by generate_conversion_report.
+
+    Returns:
+        List of conversion rates as decimal fractions, aligned with the input
+        rows. Rows without entries yield 0.0.
+    """
+    return [
+        item.total_purchased / item.total_entries if item.total_entries else 0.0
+        for item in report
+    ]
+
+
+def _normalize_period(
+    from_date: Optional[Union[date, datetime]],
+    to_date: Optional[Union[date, datetime]],
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Normalizes a reporting period to half-open [from, to) datetime bounds.
+
+    Plain dates are widened to midnight datetimes so the period convention is
+    always "from inclusive, to exclusive". Normalizing on the Python side
+    keeps the SQL filter as bare comparisons on entered_at; wrapping the
+    column in DATE() or similar expressions would prevent MySQL from using
+    the index on entered_at.
+
+    Args:
+        from_date: Start of period (inclusive) as date or datetime. None means
+            no lower bound.
+        to_date: End of period (exclusive) as date or datetime. None means no
+            upper bound.
+
+    Returns:
+        Tuple of (from_datetime, to_datetime) with dates converted to
+        midnight datetimes. None values pass through unchanged.
+    """
+
+    def to_datetime_bound(value: Optional[Union[date, datetime]]) -> Optional[datetime]:
+        if value is None or isinstance(value, datetime):
+            return value
+        return datetime.combine(value, time.min)
+
+    return to_datetime_bound(from_date), to_datetime_bound(to_date)
+
+
+def _is_whole_day_period(
     from_date: Optional[datetime],
     to_date: Optional[datetime],
+) -> bool:
+    """Checks whether both period bounds fall on day boundaries.
+
+    Whole-day periods can be served from the funnel_daily_stats rollup, which
+    has daily granularity; intraday bounds require scanning funnel_entries.
+    """
+    return all(
+        bound is None or bound.time() == time.min
+        for bound in (from_date, to_date)
+    )
+
+
+def generate_conversion_report(
+    from_date: Optional[Union[date, datetime]],
+    to_date: Optional[Union[date, datetime]],
 ) -> List[FunnelConversion]:
     """Generates conversion report for all funnel types within optional date range.
 
     Loads database settings, establishes connection, and aggregates statistics
-    from funnel_entries table. Returns results for all funnel types found in
-    the database.
+    from the funnel_daily_stats rollup (whole-day periods) or the
+    funnel_entries table (intraday bounds). Returns results for all funnel
+    types found in the database.
 
     Edge case: Returns empty list if no funnel entries exist, allowing callers
     to handle zero-state gracefully.
 
     Args:
-        from_date: Start of reporting period (inclusive). None means no lower bound.
-        to_date: End of reporting period (exclusive). None means no upper bound.
+        from_date: Start of reporting period (inclusive). Plain dates are
+            normalized to midnight. None means no lower bound.
+        to_date: End of reporting period (exclusive). Plain dates are
+            normalized to midnight. None means no upper bound.
 
     Returns:
         List of FunnelConversion objects, one per funnel type. Empty list if
         no entries exist in the specified period.
     """
-    settings = load_settings()
+    from_date, to_date = _normalize_period(from_date, to_date)
 
-    with database_connection_scope(settings.database) as connection:
-        rows = get_funnel_conversion_summary(
-            connection=connection,
-            from_date=from_date,
-            to_date=to_date,
-        )
+    cache_key = (from_date, to_date)
+    generation = write_generation()
+    cached = _report_cache.get(cache_key)
 
-    report: List[FunnelConversion] = []
+    if cached is not None:
+        cached_at, cached_generation, cached_report = cached
+        is_fresh = monotonic() - cached_at < _REPORT_CACHE_TTL_SECONDS
+        if is_fresh and cached_generation == generation:
+            return cached_report
+
+    settings = load_settings()
 
-    for funnel_type, total_entries, total_purchased in rows:
-        report.append(
-            FunnelConversion(
-                funnel_type=funnel_type,
-                total_entries=total_entries,
-                total_purchased=total_purchased,
+    # Whole-day periods are served from the funnel_daily_stats rollup, which
+    # costs O(days) instead of O(entries); intraday datetime bounds fall back
+    # to aggregating funnel_entries directly.
+    with database_connection_scope(settings.database) as connection:
+        if _is_whole_day_period(from_date, to_date):
+            rows = get_funnel_conversion_summary_daily(
+                connection=connection,
+                from_day=from_date.date() if from_date is not None else None,
+                to_day=to_date.date() if to_date is not None else None,
+            )
+            if not rows:
+                # An empty result usually means an empty period, but on a
+                # deployment whose rollup was never backfilled it means the
+                # report would silently return nothing. Falling back to the
+                # funnel_entries aggregation keeps the report correct either
+                # way; for a genuinely empty period the fallback is equally
+                # empty and costs one extra indexed query.
+                rows = get_funnel_conversion_summary(
+                    connection=connection,
+                    from_date=from_date,
+                    to_date=to_date,
+                )
+        else:
+            rows = get_funnel_conversion_summary(
+                connection=connection,
+                from_date=from_date,
+                to_date=to_date,
             )
+
+    report = [
+        FunnelConversion(
+            funnel_type=funnel_type,
+            total_entries=total_entries,
+            total_purchased=total_purchased,
         )
+        for funnel_type, total_entries, total_purchased in rows
+    ]
+
+    _report_cache[cache_key] = (monotonic(), generation, report)
 
     return report
@@ -1,11 +1,28 @@
+"""Per-funnel-type conversion reports against an existing connection.
+
+Not to be confused with analytics.report_service, which builds the all-types
+summary report and owns its own connection scope and result cache. This module
+serves cli/report_job.py, which reports on one funnel type at a time.
+"""
+
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from mysql.connector import MySQLConnection
 
 
-@dataclass
+# Primary-key bounds per fully-bounded (start, end) window. entered_at is set
+# at insert time, so a window whose end has passed can never gain rows and its
+# id bounds are safe to cache. Still-open windows are never cached (their
+# max_id keeps moving), and the cache is capped so callers generating many
+# distinct windows cannot grow it without bound in a long-lived process.
+_ID_BOUNDS_CACHE_MAX_ENTRIES = 128
+
+_id_bounds_cache: Dict[Tuple[datetime, datetime], Tuple[int, int]] = {}
+
+
+@dataclass(slots=True, frozen=True)
 class FunnelConversionReport:
     """Aggregated conversion statistics for a single funnel type.
 
@@ -61,14 +78,7 @@ def get_funnel_conversion_report(
         FunnelConversionReport with aggregated statistics. If no entries exist,
         returns report with zero values (conversion_rate will be 0.0).
     """
-    total_entries = _count_funnel_entries(
-        connection=connection,
-        funnel_type=funnel_type,
-        period_start=period_start,
-        period_end=period_end,
-    )
-
-    total_purchases = _count_funnel_purchases(
+    total_entries, total_purchases = _count_funnel_entries_and_purchases(
         connection=connection,
         funnel_type=funnel_type,
         period_start=period_start,
@@ -86,64 +96,120 @@ def get_funnel_conversion_report(
     return report
 
 
-def _count_funnel_entries(
-    connection: MySQLConnection,
-    funnel_type: str,
-    period_start: Optional[datetime],
-    period_end: Optional[datetime],
-) -> int:
-    cursor = connection.cursor()
+def _id_bounds_for_period(
+    cursor: Any,
+    period_start: datetime,
+    period_end: datetime,
+) -> Optional[Tuple[int, int]]:
+    """Resolves a date window to primary-key bounds on funnel_entries.
 
-    base_query = """
-    SELECT COUNT(*)
-    FROM funnel_entries
-    WHERE funnel_type = %s
+    Fetching MIN(id)/MAX(id) for the window is cheap with the entered_at
+    index, and adding the resulting id range to the aggregation query lets
+    MySQL narrow the scan to a contiguous primary-key slice instead of
+    walking the whole date range. Bounds are cached per process only for
+    windows whose end has already passed: entered_at is assigned at insert
+    time, so a closed window cannot gain rows, while a still-open window
+    (e.g. report_job's "up to now" runs) would serve a stale max_id and
+    silently undercount rows inserted after the first computation.
+
+    Args:
+        cursor: Open cursor on the funnel database.
+        period_start: Start of the window (inclusive).
+        period_end: End of the window (exclusive).
+
+    Returns:
+        Tuple of (min_id, max_id) for the window, or None if the window
+        contains no rows. Empty windows are not cached in case rows arrive
+        before the window closes.
     """
+    key = (period_start, period_end)
+    bounds = _id_bounds_cache.get(key)
 
-    params: List[Any] = [funnel_type]
+    if bounds is None:
+        cursor.execute(
+            """
+            SELECT MIN(id), MAX(id)
+            FROM funnel_entries
+            WHERE entered_at >= %s
+              AND entered_at < %s
+            """,
+            (period_start, period_end),
+        )
+        row = cursor.fetchone()
 
-    if period_start is not None:
-        base_query += " AND entered_at >= %s"
-        params.append(period_start)  # type: ignore[arg-type]
+        if row is None or row[0] is None:
+            return None
 
-    if period_end is not None:
-        base_query += " AND entered_at < %s"
-        params.append(period_end)  # type: ignore[arg-type]
+        bounds = (int(row[0]), int(row[1]))
 
-    cursor.execute(base_query, tuple(params))
-    row = cursor.fetchone()
-    cursor.close()
+        # now is taken in the window's own timezone (naive windows compare
+        # against naive local time) so aware and naive callers both work.
+        if period_end <= datetime.now(period_end.tzinfo):
+            if len(_id_bounds_cache) >= _ID_BOUNDS_CACHE_MAX_ENTRIES:
+                _id_bounds_cache.pop(next(iter(_id_bounds_cache)))
+            _id_bounds_cache[key] = bounds
 
-    return int(row[0]) if row is not None and row[0] is not None else 0  # type: ignore[arg-type]
+    return bounds
 
 
-def _count_funnel_purchases(
+def _count_funnel_entries_and_purchases(
     connection: MySQLConnection,
     funnel_type: str,
     period_start: Optional[datetime],
     period_end: Optional[datetime],
-) -> int:
+) -> Tuple[int, int]:
+    """Counts total entries and purchases for a funnel type in a single query.
+
+    Uses a conditional aggregate (SUM over the certificate_purchased flag) so
+    both totals are computed in one scan instead of two nearly identical
+    COUNT(*) round-trips.
+    """
     cursor = connection.cursor()
 
     base_query = """
-    SELECT COUNT(*)
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(certificate_purchased = 1), 0)
     FROM funnel_entries
     WHERE funnel_type = %s
-      AND certificate_purchased = 1
     """
 
-    params: List[Any] = [funnel_type]
-
-    if period_start is not None:
-        base_query += " AND entered_at >= %s"
-        params.append(period_start)  # type: ignore[arg-type]
-
-    if period_end is not None:
-        base_query += " AND entered_at < %s"
-        params.append(period_end)  # type: ignore[arg-type]
-
-    cursor.execute(base_query, tuple(params))
+    # Each branch builds its params tuple directly and produces one of four
+    # stable statement texts, so there is no per-call list mutation and
+    # server-side statement caches see the same SQL every time.
+    params: Tuple[Any, ...]
+
+    if period_start is not None and period_end is not None:
+        bounds = _id_bounds_for_period(cursor, period_start, period_end)
+
+        if bounds is None:
+            cursor.close()
+            return 0, 0
+
+        # The id range narrows the scan to a contiguous primary-key slice;
+        # the entered_at predicates stay in place so correctness does not
+        # depend on ids being ordered by entry time.
+        query = base_query + (
+            " AND id BETWEEN %s AND %s AND entered_at >= %s AND entered_at < %s"
+        )
+        params = (funnel_type, bounds[0], bounds[1], period_start, period_end)
+    elif period_start is not None:
+        query = base_query + " AND entered_at >= %s"
+        params = (funnel_type, period_start)
+    elif period_end is not None:
+        query = base_query + " AND entered_at < %s"
+        params = (funnel_type, period_end)
+    else:
+        query = base_query
+        params = (funnel_type,)
+
+    cursor.execute(query, params)
     row = cursor.fetchone()
     cursor.close()
 
-    return int(row[0]) if row is not None else 0  # type: ignore[arg-type]
+    if row is None:
+        return 0, 0
+
+    total_entries, total_purchases = row
+
+    return int(total_entries), int(total_purchases)  # type: ignore[arg-type]
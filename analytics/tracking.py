@@ -1,10 +1,76 @@
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
 from mysql.connector import IntegrityError, MySQLConnection
 
 
+# Incremented on every funnel_entries write so read-side caches (e.g. the
+# report cache in analytics.report_service) can detect staleness.
+_write_generation = 0
+
+
+def write_generation() -> int:
+    """Returns a counter that increments on every funnel_entries write.
+
+    Cache consumers snapshot this value alongside cached results and treat a
+    changed counter as an invalidation signal. The counter is bumped when the
+    write is issued, before the caller commits, which errs on the side of
+    invalidating early rather than serving stale data.
+
+    Returns:
+        Monotonically increasing write counter for this process.
+    """
+    return _write_generation
+
+
+def _record_write() -> None:
+    global _write_generation
+    _write_generation += 1
+
+
+# Inserting one row per (funnel_type, day) keeps a running entry count; the
+# purchase counters are bumped by the INSERT ... SELECT statements below, which
+# attribute each purchase to the day the entry entered the funnel so the rollup
+# aggregates line up with entered_at-windowed reports.
+_DAILY_STATS_ENTRY_BUMP = """
+INSERT INTO funnel_daily_stats (funnel_type, day, entries, purchases)
+VALUES (%s, CURRENT_DATE(), 1, 0)
+ON DUPLICATE KEY UPDATE entries = entries + 1
+"""
+
+
+def _get_prepared_cursor(connection: MySQLConnection, query: str):
+    """Returns a server-side prepared cursor for the query, cached on the connection.
+
+    The hot per-row queries in this module are executed hundreds of times per
+    sync run. Preparing each statement once and reusing the cursor skips the
+    server-side parse/plan step on subsequent executions. Cursors are cached
+    on the connection object keyed by SQL text and must not be closed by
+    callers; database_connection_scope closes them when the connection goes
+    back to the pool, because the pool's session reset deallocates the
+    server-side statements.
+
+    Args:
+        connection: Active MySQL database connection.
+        query: SQL text with %s placeholders to prepare.
+
+    Returns:
+        A prepared cursor bound to the connection for the given query.
+    """
+    cache = getattr(connection, "_prepared_cursors", None)
+    if cache is None:
+        cache = {}
+        setattr(connection, "_prepared_cursors", cache)
+
+    cursor = cache.get(query)
+    if cursor is None:
+        cursor = connection.cursor(prepared=True)
+        cache[query] = cursor
+
+    return cursor
+
+
 def funnel_entry_exists(
     connection: MySQLConnection,
     email: str,
@@ -17,6 +83,12 @@ def funnel_entry_exists(
     duplicate processing. When test_id is provided, matching is more specific,
     allowing the same email to exist in multiple funnels for different tests.
 
+    The lookup is a single B-tree probe backed by the unique index
+    uk_funnel_entry_email_type_test (email, funnel_type, test_id) from
+    migration 001. Note that MySQL treats NULL as distinct in unique indexes,
+    so entries with test_id=NULL are not deduplicated by the index itself;
+    the test_id=None branch below covers that case by matching any test_id.
+
     Edge case: If test_id is None, matches any entry with the email+funnel_type
     combination, which may be too broad for some use cases but ensures no
     duplicates when test context is unavailable.
@@ -31,8 +103,6 @@ def funnel_entry_exists(
     Returns:
         True if matching entry exists, False otherwise.
     """
-    cursor = connection.cursor()
-
     if test_id is None:
         query = """
         SELECT id
@@ -53,9 +123,9 @@ def funnel_entry_exists(
         """
         params = (email, funnel_type, test_id)  # type: ignore[assignment]
 
+    cursor = _get_prepared_cursor(connection, query)
     cursor.execute(query, params)
     row = cursor.fetchone()
-    cursor.close()
 
     return row is not None
 
@@ -69,10 +139,12 @@ def create_funnel_entry(
 ) -> Optional[int]:
     """Records a new funnel entry when a user is added to a funnel.
 
-    This function enforces idempotency at the database level using a unique constraint
-    on (email, funnel_type, test_id). If a duplicate entry already exists, the function
-    handles the IntegrityError gracefully by logging an informational message and
-    returning None, without raising an exception.
+    This function enforces idempotency at the database level using the unique
+    constraint on (email, funnel_type, test_id). The insert uses
+    INSERT ... ON DUPLICATE KEY UPDATE so a duplicate costs a single
+    round-trip instead of a failed insert: on duplicate, MySQL reports zero
+    (or two) affected rows and the function returns None without raising.
+    No caller-side funnel_entry_exists pre-check is needed.
 
     This function does not perform transaction control (commit/rollback). The caller
     is responsible for managing transactions.
@@ -93,28 +165,48 @@ def create_funnel_entry(
             duplicate entry (e.g., connection error, other constraint violations).
     """
     logger = logging.getLogger("analytics.tracking")
-    cursor = None
-
-    try:
-        cursor = connection.cursor()
 
-        query = """
-        INSERT INTO funnel_entries (
-            email,
-            funnel_type,
-            user_id,
-            test_id
-        ) VALUES (%s, %s, %s, %s)
-        """
+    query = """
+    INSERT INTO funnel_entries (
+        email,
+        funnel_type,
+        user_id,
+        test_id
+    ) VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+    """
 
-        params = (email, funnel_type, user_id, test_id)
+    params = (email, funnel_type, user_id, test_id)
 
+    try:
+        cursor = _get_prepared_cursor(connection, query)
         cursor.execute(query, params)
+
+        # MySQL reports 1 affected row for a fresh insert; a duplicate hitting
+        # the unique key reports 0 (or 2, depending on client flags).
+        if cursor.rowcount != 1:
+            logger.info(
+                "Duplicate funnel entry already exists (email=%s, funnel_type=%s, test_id=%s)",
+                email,
+                funnel_type,
+                test_id,
+            )
+            return None
+
         new_id = cursor.lastrowid
+
+        # Keep the funnel_daily_stats rollup current: one more entry today.
+        # entered_at defaults to CURRENT_TIMESTAMP, so CURRENT_DATE() is the
+        # entry's rollup day.
+        stats_cursor = _get_prepared_cursor(connection, _DAILY_STATS_ENTRY_BUMP)
+        stats_cursor.execute(_DAILY_STATS_ENTRY_BUMP, (funnel_type,))
+
+        _record_write()
         return new_id
 
     except IntegrityError:
-        # Handle duplicate entry due to unique constraint on (email, funnel_type, test_id)
+        # Safety net for races not covered by ON DUPLICATE KEY UPDATE
+        # (e.g. entries with NULL test_id are distinct for the unique index)
         logger.info(
             "Duplicate funnel entry already exists (email=%s, funnel_type=%s, test_id=%s)",
             email,
@@ -123,9 +215,77 @@ def create_funnel_entry(
         )
         return None
 
+
+def create_funnel_entries_bulk(
+    connection: MySQLConnection,
+    rows: Sequence[Tuple[str, str, Optional[int], Optional[int]]],
+) -> int:
+    """Inserts a batch of funnel entries in a single round-trip.
+
+    Uses cursor.executemany so the driver sends one multi-row INSERT instead
+    of one statement per candidate, cutting network round-trips from O(N) to
+    O(1). Duplicates are absorbed by the same ON DUPLICATE KEY UPDATE clause
+    as create_funnel_entry, so the batch is idempotent.
+
+    Unlike create_funnel_entry, this helper does not report per-row entry IDs,
+    so it is only suitable for callers that do not need to act on individual
+    inserted rows (e.g. backfills). Callers that enqueue per-entry outbox jobs
+    should keep using create_funnel_entry.
+
+    This function does not perform transaction control (commit/rollback). The
+    caller is responsible for committing once after the batch.
+
+    Args:
+        connection: Active MySQL database connection.
+        rows: Sequence of (email, funnel_type, user_id, test_id) tuples.
+
+    Returns:
+        Number of rows in the submitted batch. Zero if rows is empty.
+
+    Raises:
+        mysql.connector.Error: If the batch insert fails (e.g., connection
+            error, constraint violations other than duplicates).
+    """
+    if not rows:
+        return 0
+
+    cursor = connection.cursor()
+
+    try:
+        query = """
+        INSERT INTO funnel_entries (
+            email,
+            funnel_type,
+            user_id,
+            test_id
+        ) VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+        """
+
+        cursor.executemany(query, list(rows))
+
+        # Refresh today's funnel_daily_stats rows from the table instead of
+        # bumping counters: executemany does not report which batch rows were
+        # fresh inserts vs absorbed duplicates, and every fresh row lands on
+        # CURRENT_DATE() because entered_at defaults to CURRENT_TIMESTAMP.
+        cursor.execute(
+            """
+            INSERT INTO funnel_daily_stats (funnel_type, day, entries, purchases)
+            SELECT funnel_type, DATE(entered_at), COUNT(*),
+                   COALESCE(SUM(certificate_purchased = 1), 0)
+            FROM funnel_entries
+            WHERE entered_at >= CURRENT_DATE()
+            GROUP BY funnel_type, DATE(entered_at)
+            ON DUPLICATE KEY UPDATE entries = VALUES(entries),
+                                    purchases = VALUES(purchases)
+            """
+        )
+
+        _record_write()
+        return len(rows)
+
     finally:
-        if cursor:
-            cursor.close()
+        cursor.close()
 
 
 def mark_certificate_purchased(
@@ -160,31 +320,141 @@ def mark_certificate_purchased(
     Raises:
         mysql.connector.Error: If database update fails (e.g., connection error).
     """
+    if test_id is None:
+        stats_query = """
+        INSERT INTO funnel_daily_stats (funnel_type, day, entries, purchases)
+        SELECT funnel_type, DATE(entered_at), 0, COUNT(*)
+        FROM funnel_entries
+        WHERE email = %s
+          AND funnel_type = %s
+          AND certificate_purchased = 0
+        GROUP BY funnel_type, DATE(entered_at)
+        ON DUPLICATE KEY UPDATE purchases = purchases + VALUES(purchases)
+        """
+        stats_params = (email, funnel_type)
+
+        query = """
+        UPDATE funnel_entries
+        SET certificate_purchased = 1,
+            certificate_purchased_at = %s
+        WHERE email = %s
+          AND funnel_type = %s
+          AND certificate_purchased = 0
+        """
+        params = (purchased_at, email, funnel_type)
+    else:
+        stats_query = """
+        INSERT INTO funnel_daily_stats (funnel_type, day, entries, purchases)
+        SELECT funnel_type, DATE(entered_at), 0, COUNT(*)
+        FROM funnel_entries
+        WHERE email = %s
+          AND funnel_type = %s
+          AND test_id = %s
+          AND certificate_purchased = 0
+        GROUP BY funnel_type, DATE(entered_at)
+        ON DUPLICATE KEY UPDATE purchases = purchases + VALUES(purchases)
+        """
+        stats_params = (email, funnel_type, test_id)  # type: ignore[assignment]
+
+        query = """
+        UPDATE funnel_entries
+        SET certificate_purchased = 1,
+            certificate_purchased_at = %s
+        WHERE email = %s
+          AND funnel_type = %s
+          AND test_id = %s
+          AND certificate_purchased = 0
+        """
+        params = (purchased_at, email, funnel_type, test_id)  # type: ignore[assignment]
+
+    # Bump the funnel_daily_stats rollup before flipping the flag: the SELECT
+    # counts the still-unmarked rows per entry day, crediting each purchase to
+    # the day the entry entered the funnel.
+    stats_cursor = _get_prepared_cursor(connection, stats_query)
+    stats_cursor.execute(stats_query, stats_params)
+
+    cursor = _get_prepared_cursor(connection, query)
+    cursor.execute(query, params)
+    _record_write()
+
+
+def mark_certificates_purchased_bulk(
+    connection: MySQLConnection,
+    purchases: Sequence[Tuple[str, str, Optional[int], datetime]],
+) -> None:
+    """Marks a batch of certificate purchases with one UPDATE per funnel group.
+
+    Groups purchases by (funnel_type, test_id) and issues a single UPDATE with
+    an email IN (...) list per group, instead of one round-trip per email as
+    mark_certificate_purchased does. Per-email purchase timestamps are applied
+    via a CASE expression so rows keep their individual purchased_at values.
+
+    The nullable test_id is matched with the NULL-safe <=> operator so entries
+    with test_id=NULL group and match correctly. As with the single-row
+    variant, only rows with certificate_purchased=0 are touched, keeping the
+    operation idempotent.
+
+    This function does not perform transaction control (commit/rollback). The
+    caller is responsible for committing once after the batch.
+
+    Args:
+        connection: Active MySQL database connection.
+        purchases: Sequence of (email, funnel_type, test_id, purchased_at)
+            tuples.
+
+    Raises:
+        mysql.connector.Error: If a batch update fails (e.g., connection error).
+    """
+    if not purchases:
+        return
+
+    groups: dict[Tuple[str, Optional[int]], list[Tuple[str, datetime]]] = {}
+    for email, funnel_type, test_id, purchased_at in purchases:
+        groups.setdefault((funnel_type, test_id), []).append((email, purchased_at))
+
     cursor = connection.cursor()
 
     try:
-        if test_id is None:
-            query = """
-            UPDATE funnel_entries
-            SET certificate_purchased = 1,
-                certificate_purchased_at = %s
-            WHERE email = %s
+        for (funnel_type, test_id), emails in groups.items():
+            case_clauses = " ".join("WHEN %s THEN %s" for _ in emails)
+            in_placeholders = ", ".join("%s" for _ in emails)
+
+            # Bump the funnel_daily_stats rollup before flipping the flags,
+            # crediting each purchase to the day its entry entered the funnel.
+            stats_query = f"""
+            INSERT INTO funnel_daily_stats (funnel_type, day, entries, purchases)
+            SELECT funnel_type, DATE(entered_at), 0, COUNT(*)
+            FROM funnel_entries
+            WHERE email IN ({in_placeholders})
               AND funnel_type = %s
+              AND test_id <=> %s
               AND certificate_purchased = 0
+            GROUP BY funnel_type, DATE(entered_at)
+            ON DUPLICATE KEY UPDATE purchases = purchases + VALUES(purchases)
             """
-            params = (purchased_at, email, funnel_type)
-        else:
-            query = """
+
+            stats_params: list[object] = [email for email, _ in emails]
+            stats_params.extend((funnel_type, test_id))
+            cursor.execute(stats_query, tuple(stats_params))
+
+            query = f"""
             UPDATE funnel_entries
             SET certificate_purchased = 1,
-                certificate_purchased_at = %s
-            WHERE email = %s
+                certificate_purchased_at = CASE email {case_clauses} END
+            WHERE email IN ({in_placeholders})
               AND funnel_type = %s
-              AND test_id = %s
+              AND test_id <=> %s
               AND certificate_purchased = 0
             """
-            params = (purchased_at, email, funnel_type, test_id)  # type: ignore[assignment]
 
-        cursor.execute(query, params)
+            params: list[object] = []
+            for email, purchased_at in emails:
+                params.extend((email, purchased_at))
+            params.extend(email for email, _ in emails)
+            params.extend((funnel_type, test_id))
+
+            cursor.execute(query, tuple(params))
+
+        _record_write()
     finally:
         cursor.close()
@@ -3,14 +3,10 @@ import sys
 import traceback
 from typing import Optional
 
-import sentry_sdk
-from sentry_sdk.integrations.logging import LoggingIntegration
-
 from config.settings import load_settings
 from db.connection import database_connection_scope
 from logging_config.logger import configure_logging
 from brevo.api_client import BrevoApiClient
-from brevo.sync_worker import BrevoSyncWorker
 from funnels.sync_service import FunnelSyncService
 from funnels.purchase_sync_service import PurchaseSyncService
 
@@ -19,6 +15,11 @@ def _init_sentry(dsn: Optional[str], environment: str) -> None:
     if not dsn:
         return
 
+    # Imported lazily: sentry_sdk adds noticeable import time and memory, so
+    # runs without a configured DSN (dev, CI) never pay for it.
+    import sentry_sdk
+    from sentry_sdk.integrations.logging import LoggingIntegration
+
     sentry_sdk.init(
         dsn=dsn,
         environment=environment,
@@ -47,11 +48,23 @@ def _setup_global_exception_handler(logger: logging.Logger) -> None:
             exc_info=(exc_type, exc_value, exc_traceback),
         )
 
-        sentry_sdk.capture_exception(exc_value)
+        _capture_exception(exc_value)
 
     sys.excepthook = exception_handler
 
 
+def _capture_exception(error: BaseException) -> None:
+    """Reports an exception to Sentry if the SDK has been loaded.
+
+    Without a configured DSN sentry_sdk is never imported, so the check keeps
+    error paths from dragging the SDK in just to drop the event.
+    """
+    if "sentry_sdk" in sys.modules:
+        import sentry_sdk
+
+        sentry_sdk.capture_exception(error)
+
+
 def main() -> None:
     logger: Optional[logging.Logger] = None
 
@@ -104,14 +117,25 @@ def main() -> None:
 
             purchase_sync_service.sync(max_rows=100)
 
+        try:
             if not settings.application.dry_run:
-                brevo_sync_worker = BrevoSyncWorker(
-                    connection=connection,
-                    brevo_client=brevo_client,
-                )
-                brevo_sync_worker.run_once(limit=100)
+                # Imported here because dry runs never construct the worker
+                from brevo.sync_worker import BrevoSyncWorker
+
+                # The worker performs Brevo HTTPS round-trips; give it its own
+                # connection scope so the sync services' session is not held
+                # open across external API I/O.
+                with database_connection_scope(settings.database) as connection:
+                    brevo_sync_worker = BrevoSyncWorker(
+                        connection=connection,
+                        brevo_client=brevo_client,
+                        max_workers=settings.brevo.sync_max_workers,
+                    )
+                    brevo_sync_worker.run_once(limit=100)
             else:
                 logger.info("Dry run mode: BrevoSyncWorker is not executed.")
+        finally:
+            brevo_client.close()
 
         logger.info("Job finished")
 
@@ -127,7 +151,7 @@ def main() -> None:
                 str(e),
                 exc_info=True,
             )
-        sentry_sdk.capture_exception(e)
+        _capture_exception(e)
         sys.exit(1)
 
 
@@ -4,7 +4,7 @@ from argparse import ArgumentParser
 from datetime import datetime
 from typing import Optional
 
-from analytics.report_service import generate_conversion_report
+from analytics.report_service import compute_conversion_rates, generate_conversion_report
 
 
 def parse_date(value: Optional[str]) -> Optional[datetime]:
@@ -50,11 +50,10 @@ def main() -> None:
     print("Funnel conversion report")
     print("------------------------")
 
-    for item in report:
-        rate = 0.0
+    rates = compute_conversion_rates(report)
 
-        if item.total_entries > 0:
-            rate = item.total_purchased / item.total_entries * 100.0
+    for item, rate in zip(report, rates):
+        rate = rate * 100.0
 
         print(
             f"{item.funnel_type}: "
@@ -1,12 +1,20 @@
 import logging
 import random
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import requests
 
-from brevo.models import BrevoContact
+from brevo.models import BrevoContact, payload_to_json_bytes
+
+__all__ = [
+    "BrevoApiClient",
+    "BrevoClientError",
+    "BrevoTransientError",
+    "BrevoFatalError",
+]
 
 
 class BrevoClientError(Exception):
@@ -17,8 +25,14 @@ class BrevoTransientError(BrevoClientError):
     """Error that is safe to retry later.
 
     This includes network issues, rate limiting (429), and server errors (5xx).
+    For rate-limited responses, retry_after carries the server's Retry-After
+    hint in seconds so the retry loop can wait exactly as long as asked.
     """
 
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 class BrevoFatalError(BrevoClientError):
     """Error that should not be retried.
@@ -76,6 +90,32 @@ class BrevoApiClient:
         self.circuit_error_threshold = circuit_error_threshold
         self.logger = logging.getLogger("brevo.api_client")
 
+        # Persistent session with HTTP keep-alive: reusing the pooled TLS
+        # connection to api.brevo.com avoids a fresh TCP+TLS handshake per
+        # request, which otherwise dominates per-call latency in the worker
+        # loop. Retries stay in create_or_update_contact where they interact
+        # with the circuit breaker, so the adapter itself does not retry.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=16,
+                max_retries=0,
+            ),
+        )
+        self._session.headers.update(
+            {
+                "api-key": self.api_key,
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            }
+        )
+
+        # The client only ever hits a handful of paths, so resolved URLs are
+        # cached per instance instead of re-concatenated on every request
+        self._url_cache: Dict[str, str] = {}
+
         # Rate limiting state
         self._request_timestamps: List[float] = []
 
@@ -83,10 +123,46 @@ class BrevoApiClient:
         self.consecutive_errors: int = 0
         self.circuit_open_until: Optional[datetime] = None
 
+        # One client instance is shared by the sync worker's thread pool, so
+        # the rate-limiter window and circuit-breaker counters above are
+        # read-modify-written under this lock. Requests themselves run
+        # outside the lock; only the bookkeeping is serialized.
+        self._state_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Closes the underlying HTTP session and its pooled connections."""
+        self._session.close()
+
+    @staticmethod
+    def _parse_retry_after(header_value: Optional[str]) -> Optional[float]:
+        """Parses a Retry-After header value into seconds.
+
+        Only the delay-seconds form is handled; the HTTP-date form (and any
+        other unparseable value) yields None so the normal backoff applies.
+
+        Args:
+            header_value: Raw header value, or None if the header was absent.
+
+        Returns:
+            Non-negative delay in seconds, or None.
+        """
+        if header_value is None:
+            return None
+
+        try:
+            seconds = float(header_value)
+        except ValueError:
+            return None
+
+        return max(seconds, 0.0)
+
     def _build_url(self, path: str) -> str:
-        if not path.startswith("/"):
-            path = "/" + path
-        return f"{self.base_url}{path}"
+        url = self._url_cache.get(path)
+        if url is None:
+            normalized = path if path.startswith("/") else "/" + path
+            url = f"{self.base_url}{normalized}"
+            self._url_cache[path] = url
+        return url
 
     def _check_circuit_breaker(self) -> None:
         """Checks circuit breaker state and raises BrevoTransientError if circuit is open.
@@ -95,84 +171,93 @@ class BrevoApiClient:
             BrevoTransientError: If circuit breaker is open and timeout hasn't passed.
         """
         now = datetime.now()
-        if self.circuit_open_until is not None:
-            if now < self.circuit_open_until:
-                self.logger.warning(
-                    "Circuit breaker is open until %s. Request blocked.",
-                    self.circuit_open_until,
-                )
-                raise BrevoTransientError(
-                    f"Circuit breaker is open. Retry after {self.circuit_open_until}"
-                )
-            else:
-                # Circuit timeout has passed, reset it
-                self.logger.info("Circuit breaker timeout expired. Resetting circuit.")
-                self.circuit_open_until = None
-                self.consecutive_errors = 0
+        with self._state_lock:
+            if self.circuit_open_until is not None:
+                if now < self.circuit_open_until:
+                    self.logger.warning(
+                        "Circuit breaker is open until %s. Request blocked.",
+                        self.circuit_open_until,
+                    )
+                    raise BrevoTransientError(
+                        f"Circuit breaker is open. Retry after {self.circuit_open_until}"
+                    )
+                else:
+                    # Circuit timeout has passed, reset it
+                    self.logger.info(
+                        "Circuit breaker timeout expired. Resetting circuit."
+                    )
+                    self.circuit_open_until = None
+                    self.consecutive_errors = 0
 
     def _apply_rate_limiting(self) -> None:
         """Applies rate limiting by sleeping if necessary.
 
-        Removes timestamps older than 60 seconds and sleeps if the number
-        of recent requests exceeds max_requests_per_minute.
+        Removes timestamps older than 60 seconds and sleeps if the number of
+        recent requests exceeds max_requests_per_minute. The window is only
+        inspected and pruned under the state lock; the sleep itself happens
+        outside it, and the loop re-checks afterwards in case other threads
+        filled the window during the wait.
         """
-        now = time.time()
-        cutoff_time = now - 60.0
-
-        # Remove timestamps older than 60 seconds
-        self._request_timestamps = [
-            ts for ts in self._request_timestamps if ts > cutoff_time
-        ]
-
-        # Check if we're at the rate limit
-        if len(self._request_timestamps) >= self.max_requests_per_minute:
-            # Calculate how long to sleep until the oldest timestamp moves out
-            oldest_timestamp = min(self._request_timestamps)
-            sleep_duration = (oldest_timestamp + 60.0) - now
-
-            if sleep_duration > 0:
-                self.logger.info(
-                    "Rate limit reached (%d requests in last 60s). "
-                    "Sleeping for %.2f seconds",
-                    len(self._request_timestamps),
-                    sleep_duration,
-                )
-                time.sleep(sleep_duration)
-
-                # Clean up again after sleep
+        while True:
+            with self._state_lock:
                 now = time.time()
                 cutoff_time = now - 60.0
+
+                # Remove timestamps older than 60 seconds
                 self._request_timestamps = [
                     ts for ts in self._request_timestamps if ts > cutoff_time
                 ]
 
+                recent_requests = len(self._request_timestamps)
+                if recent_requests < self.max_requests_per_minute:
+                    return
+
+                # Calculate how long to sleep until the oldest timestamp
+                # moves out of the window
+                oldest_timestamp = min(self._request_timestamps)
+                sleep_duration = (oldest_timestamp + 60.0) - now
+
+            if sleep_duration <= 0:
+                continue
+
+            self.logger.info(
+                "Rate limit reached (%d requests in last 60s). "
+                "Sleeping for %.2f seconds",
+                recent_requests,
+                sleep_duration,
+            )
+            time.sleep(sleep_duration)
+
     def _record_request_attempt(self) -> None:
         """Records a request attempt timestamp for rate limiting."""
-        self._request_timestamps.append(time.time())
+        with self._state_lock:
+            self._request_timestamps.append(time.time())
 
     def _handle_request_success(self) -> None:
         """Handles successful request by resetting circuit breaker error count."""
-        self.consecutive_errors = 0
+        with self._state_lock:
+            self.consecutive_errors = 0
 
     def _handle_request_error(self) -> None:
         """Handles request error by incrementing error count and opening circuit if needed."""
-        self.consecutive_errors += 1
-        if self.consecutive_errors >= self.circuit_error_threshold:
-            self.circuit_open_until = datetime.now() + timedelta(
-                seconds=self.circuit_open_seconds
-            )
-            self.logger.error(
-                "Circuit breaker opened after %d consecutive errors. "
-                "Will remain open until %s",
-                self.consecutive_errors,
-                self.circuit_open_until,
-            )
+        with self._state_lock:
+            self.consecutive_errors += 1
+            if self.consecutive_errors >= self.circuit_error_threshold:
+                self.circuit_open_until = datetime.now() + timedelta(
+                    seconds=self.circuit_open_seconds
+                )
+                self.logger.error(
+                    "Circuit breaker opened after %d consecutive errors. "
+                    "Will remain open until %s",
+                    self.consecutive_errors,
+                    self.circuit_open_until,
+                )
 
     def _request(
         self,
         method: str,
         path: str,
-        json_body: Optional[Dict[str, Any]] = None,
+        body: Optional[bytes] = None,
     ) -> Dict[str, Any]:
         """Performs HTTP request to Brevo API or logs it in dry-run mode.
 
@@ -190,7 +275,8 @@ class BrevoApiClient:
             method: HTTP method (GET, POST, PUT, DELETE).
             path: API endpoint path (e.g., "/contacts"). Leading slash is added
                 automatically if missing.
-            json_body: Optional JSON payload for request body.
+            body: Optional pre-serialized JSON request body. The session's
+                default Content-Type header already declares application/json.
 
         Returns:
             Response JSON as dictionary. Empty dict if response is not valid JSON.
@@ -207,28 +293,23 @@ class BrevoApiClient:
                 "Brevo dry run request: %s %s payload=%s",
                 method,
                 url,
-                json_body,
+                body,
             )
             return {"dry_run": True}
 
         if not self.api_key:
             raise RuntimeError("Brevo API key is not configured")
 
-        headers = {
-            "api-key": self.api_key,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-
         # Apply rate limiting before the actual request
         self._apply_rate_limiting()
 
+        # Auth and content headers are set once on the session in __init__;
+        # the body is already serialized, so requests sends it verbatim.
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=headers,
-                json=json_body,
+                data=body,
                 timeout=10,
             )
             # Record the request attempt (successful HTTP call)
@@ -253,8 +334,14 @@ class BrevoApiClient:
                     response.status_code,
                     response_text,
                 )
+                retry_after: Optional[float] = None
+                if response.status_code == 429:
+                    retry_after = self._parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
                 raise BrevoTransientError(
-                    f"Brevo API error {response.status_code}: {response_text}"
+                    f"Brevo API error {response.status_code}: {response_text}",
+                    retry_after=retry_after,
                 )
             else:
                 # Other 4xx errors are fatal
@@ -296,21 +383,117 @@ class BrevoApiClient:
             BrevoFatalError: If API returns 4xx (except 429). Fatal errors are
                 not retried.
         """
-        payload = contact.to_payload()
+        # Per-contact detail stays at DEBUG; batch summaries are logged at
+        # INFO by the callers, so the hot path does not build argument
+        # tuples for records that are dropped anyway.
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Sending contact to Brevo (email=%s, lists=%s, dry_run=%s)",
+                contact.email,
+                contact.list_ids,
+                self.dry_run,
+            )
+
+        return self._request_with_retries(
+            "POST",
+            "/contacts",
+            body=contact.to_json_bytes(),
+            description=f"contact {contact.email}",
+        )
+
+    def import_contacts(
+        self,
+        contacts: List[BrevoContact],
+        list_ids: List[int],
+    ) -> Dict[str, Any]:
+        """Imports a batch of contacts in a single Brevo API call.
+
+        Uses the bulk import endpoint (POST /contacts/import), which accepts
+        thousands of contacts per call, instead of one POST /contacts per
+        contact. Per-contact attributes are carried in the jsonBody entries;
+        list membership is applied batch-wide via listIds. Existing contacts
+        are updated, matching the upsert semantics of create_or_update_contact.
+
+        Side Effects:
+            - Creates or updates all contacts in Brevo (unless dry-run mode).
+            - Adds contacts to the specified lists if list_ids are provided.
+
+        Args:
+            contacts: BrevoContact objects to import. Their list_ids fields are
+                ignored; the batch-level list_ids argument applies to all.
+            list_ids: Brevo list IDs to add every contact in the batch to.
+
+        Returns:
+            API response dictionary. In dry-run mode, returns {"dry_run": True}.
+
+        Raises:
+            BrevoTransientError: If network error or API returns 429/5xx after
+                all retry attempts are exhausted.
+            BrevoFatalError: If API returns 4xx (except 429). Fatal errors are
+                not retried.
+        """
+        json_body_entries: List[Dict[str, Any]] = []
+        for contact in contacts:
+            entry: Dict[str, Any] = {"email": contact.email}
+            if contact.attributes:
+                entry["attributes"] = contact.attributes
+            json_body_entries.append(entry)
+
+        payload: Dict[str, Any] = {
+            "jsonBody": json_body_entries,
+            "updateExistingContacts": True,
+        }
+        if list_ids:
+            payload["listIds"] = list_ids
+
         self.logger.info(
-            "Sending contact to Brevo (email=%s, lists=%s, dry_run=%s)",
-            contact.email,
-            contact.list_ids,
+            "Importing %d contacts to Brevo (lists=%s, dry_run=%s)",
+            len(contacts),
+            list_ids,
             self.dry_run,
         )
 
+        return self._request_with_retries(
+            "POST",
+            "/contacts/import",
+            body=payload_to_json_bytes(payload),
+            description=f"import of {len(contacts)} contacts",
+        )
+
+    def _request_with_retries(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+        description: str,
+    ) -> Dict[str, Any]:
+        """Performs a request with circuit breaker check and transient-error retries.
+
+        The body is serialized once by the caller, so retries resend the same
+        bytes without re-encoding the payload.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE).
+            path: API endpoint path.
+            body: Pre-serialized JSON request body.
+            description: Human-readable label for log messages (e.g. the
+                contact email or batch size).
+
+        Returns:
+            Response JSON as dictionary.
+
+        Raises:
+            BrevoTransientError: If the request keeps failing transiently after
+                all retry attempts, or the circuit breaker is open.
+            BrevoFatalError: If the API returns a non-retryable error.
+        """
         # Check circuit breaker before starting retry loop
         self._check_circuit_breaker()
 
         last_error: Optional[BrevoTransientError] = None
         for attempt in range(self.max_retries + 1):
             try:
-                result = self._request("POST", "/contacts", json_body=payload)
+                result = self._request(method, path, body=body)
                 # Success - reset circuit breaker error count
                 self._handle_request_success()
                 return result
@@ -325,8 +508,11 @@ class BrevoApiClient:
                 self._handle_request_error()
 
                 if attempt < self.max_retries:
-                    # Calculate exponential backoff with jitter
+                    # Calculate exponential backoff with jitter; a rate-limited
+                    # response's Retry-After hint wins when it asks for longer
                     sleep_seconds = self.base_backoff_seconds * (2**attempt)
+                    if error.retry_after is not None:
+                        sleep_seconds = max(sleep_seconds, error.retry_after)
                     jitter = random.uniform(0, 0.5)
                     total_sleep = sleep_seconds + jitter
 
@@ -341,9 +527,9 @@ class BrevoApiClient:
                 else:
                     # All retries exhausted
                     self.logger.error(
-                        "All %d retry attempts exhausted for contact %s",
+                        "All %d retry attempts exhausted for %s",
                         self.max_retries + 1,
-                        contact.email,
+                        description,
                     )
                     raise
 
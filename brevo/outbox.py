@@ -2,17 +2,21 @@
 
 This module provides functions to enqueue, fetch, and update Brevo synchronization
 jobs stored in the brevo_sync_outbox table. All functions are transaction-friendly
-and do not perform commits or rollbacks - transaction control is the caller's responsibility.
+and do not perform commits or rollbacks - transaction control is the caller's
+responsibility. The exceptions are fetch_pending_jobs, whose atomic claim
+(pending -> in_progress) runs in its own short transaction so concurrent workers
+see claimed jobs immediately, and requeue_stale_jobs, whose recovery sweep
+commits for the same reason.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple, Union
 
 import mysql.connector
 from mysql.connector import MySQLConnection
 
 
-@dataclass
+@dataclass(slots=True)
 class BrevoSyncJob:
     """Represents a Brevo synchronization job from the outbox table."""
 
@@ -29,7 +33,7 @@ def enqueue_brevo_sync_job(
     connection: MySQLConnection,
     funnel_entry_id: int,
     operation_type: str,
-    payload: str,
+    payload: Union[str, bytes],
 ) -> int:
     """Enqueues a new Brevo synchronization job in the outbox.
 
@@ -39,7 +43,7 @@ def enqueue_brevo_sync_job(
         connection: Active MySQL database connection.
         funnel_entry_id: ID of the associated funnel entry.
         operation_type: Type of operation (e.g., 'upsert_contact', 'update_after_purchase').
-        payload: JSON string containing operation-specific data.
+        payload: JSON document (str or UTF-8 bytes) with operation-specific data.
 
     Returns:
         The ID of the newly created job row.
@@ -71,27 +75,81 @@ def enqueue_brevo_sync_job(
         cursor.close()
 
 
+def enqueue_brevo_sync_jobs_bulk(
+    connection: MySQLConnection,
+    jobs: Sequence[Tuple[int, str, Union[str, bytes]]],
+) -> None:
+    """Enqueues a batch of Brevo synchronization jobs in one round-trip.
+
+    Same row shape and semantics as enqueue_brevo_sync_job — each tuple is
+    (funnel_entry_id, operation_type, payload) and rows start as
+    status='pending', retry_count=0 — but the INSERTs are submitted via
+    executemany instead of one round-trip per job. Inserted row IDs are not
+    returned; callers that need the new job id should use
+    enqueue_brevo_sync_job.
+
+    Args:
+        connection: Active MySQL database connection.
+        jobs: Sequence of (funnel_entry_id, operation_type, payload) tuples.
+            Empty batches are a no-op without touching the database.
+
+    Raises:
+        mysql.connector.Error: If database insert fails.
+    """
+    if not jobs:
+        return
+
+    cursor = connection.cursor()
+
+    try:
+        query = """
+        INSERT INTO brevo_sync_outbox (
+            funnel_entry_id,
+            operation_type,
+            payload,
+            status,
+            retry_count
+        ) VALUES (%s, %s, %s, 'pending', 0)
+        """
+
+        cursor.executemany(query, list(jobs))
+
+    finally:
+        cursor.close()
+
+
 def fetch_pending_jobs(
     connection: MySQLConnection,
     limit: int = 100,
 ) -> List[BrevoSyncJob]:
-    """Fetches pending jobs from the outbox.
+    """Atomically claims pending jobs from the outbox.
 
-    Selects rows where status='pending', ordered by id, limited by limit.
+    Selects rows where status='pending', ordered by id, limited by limit,
+    locking them with FOR UPDATE SKIP LOCKED (MySQL 8.0+) and flipping them
+    to status='in_progress' before the claim transaction commits. Concurrent
+    workers skip each other's locked rows, so the same job is never handed
+    to two workers and a restart mid-run cannot double-send to Brevo.
+
+    Unlike the other functions in this module, the claim manages its own
+    transaction: the in_progress status has to become visible to other
+    workers immediately, not at the end of the caller's batch.
 
     Args:
         connection: Active MySQL database connection.
-        limit: Maximum number of jobs to fetch. Defaults to 100.
+        limit: Maximum number of jobs to claim. Defaults to 100.
 
     Returns:
-        List of BrevoSyncJob instances representing pending jobs.
+        List of BrevoSyncJob instances exclusively owned by this worker.
 
     Raises:
-        mysql.connector.Error: If database query fails.
+        mysql.connector.Error: If database query fails. The claim transaction
+            is rolled back, leaving the jobs pending for another run.
     """
     cursor = connection.cursor()
 
     try:
+        connection.start_transaction()
+
         query = """
         SELECT
             id,
@@ -106,6 +164,7 @@ def fetch_pending_jobs(
           AND (next_attempt_at IS NULL OR next_attempt_at <= NOW())
         ORDER BY id
         LIMIT %s
+        FOR UPDATE SKIP LOCKED
         """
 
         cursor.execute(query, (limit,))
@@ -118,14 +177,80 @@ def fetch_pending_jobs(
                 funnel_entry_id=int(row[1]),  # type: ignore[arg-type]
                 operation_type=str(row[2]),  # type: ignore[arg-type]
                 payload=str(row[3]),  # type: ignore[arg-type]
-                status=str(row[4]),  # type: ignore[arg-type]
+                status="in_progress",
                 retry_count=int(row[5]),  # type: ignore[arg-type]
                 next_attempt_at=str(row[6]) if row[6] is not None else None,  # type: ignore[arg-type]
             )
             jobs.append(job)
 
+        if jobs:
+            placeholders = ", ".join("%s" for _ in jobs)
+            claim_query = f"""
+            UPDATE brevo_sync_outbox
+            SET status = 'in_progress'
+            WHERE id IN ({placeholders})
+            """
+            cursor.execute(claim_query, tuple(job.id for job in jobs))
+
+        connection.commit()
         return jobs
 
+    except mysql.connector.Error:
+        connection.rollback()
+        raise
+
+    finally:
+        cursor.close()
+
+
+def requeue_stale_jobs(
+    connection: MySQLConnection,
+    stale_after_minutes: int = 30,
+) -> int:
+    """Returns stale in_progress jobs to the pending state.
+
+    The claim in fetch_pending_jobs commits before the Brevo calls run, so a
+    worker that dies mid-run (or loses its connection before the outcome
+    write-backs commit) leaves its claimed jobs stuck in_progress forever.
+    This sweep flips rows whose last update is older than stale_after_minutes
+    back to pending so the next run retries them. Like the claim, it manages
+    its own short transaction: recovered jobs must be visible immediately.
+
+    Jobs recovered this way may already have reached Brevo before the crash;
+    both outbox operations are idempotent upserts, so a duplicate send is safe.
+
+    Args:
+        connection: Active MySQL database connection.
+        stale_after_minutes: Minimum age of the last status change before an
+            in_progress job is considered abandoned. Defaults to 30, far above
+            a healthy run's duration.
+
+    Returns:
+        Number of jobs returned to pending.
+
+    Raises:
+        mysql.connector.Error: If the database update fails. The sweep
+            transaction is rolled back.
+    """
+    cursor = connection.cursor()
+
+    try:
+        query = """
+        UPDATE brevo_sync_outbox
+        SET status = 'pending'
+        WHERE status = 'in_progress'
+          AND updated_at < NOW() - INTERVAL %s MINUTE
+        """
+
+        cursor.execute(query, (stale_after_minutes,))
+        requeued = cursor.rowcount
+        connection.commit()
+        return requeued
+
+    except mysql.connector.Error:
+        connection.rollback()
+        raise
+
     finally:
         cursor.close()
 
@@ -158,6 +283,107 @@ def mark_job_success(connection: MySQLConnection, job_id: int) -> None:
         cursor.close()
 
 
+def mark_jobs_success_bulk(
+    connection: MySQLConnection,
+    job_ids: Sequence[int],
+) -> None:
+    """Marks a batch of jobs as successfully completed in one statement.
+
+    Same effect as calling mark_job_success per id, but a single UPDATE with
+    an id IN (...) list instead of one round-trip per job.
+
+    Args:
+        connection: Active MySQL database connection.
+        job_ids: IDs of the jobs to mark as successful. Empty batches are a
+            no-op without touching the database.
+
+    Raises:
+        mysql.connector.Error: If database update fails.
+    """
+    if not job_ids:
+        return
+
+    cursor = connection.cursor()
+
+    try:
+        placeholders = ", ".join("%s" for _ in job_ids)
+        query = f"""
+        UPDATE brevo_sync_outbox
+        SET status = 'success',
+            last_error = NULL
+        WHERE id IN ({placeholders})
+        """
+
+        cursor.execute(query, tuple(job_ids))
+
+    finally:
+        cursor.close()
+
+
+def mark_jobs_error_bulk(
+    connection: MySQLConnection,
+    errors: Sequence[Tuple[int, str]],
+    max_job_retries: int = 5,
+    is_fatal: bool = False,
+) -> None:
+    """Marks a batch of jobs as failed, each with its own error message.
+
+    Same retry/failed semantics as mark_job_error, but the per-row UPDATEs are
+    submitted via executemany in a single round-trip instead of one per job.
+
+    Args:
+        connection: Active MySQL database connection.
+        errors: Sequence of (job_id, error_message) tuples. Empty batches are
+            a no-op without touching the database.
+        max_job_retries: Maximum number of retry attempts. Defaults to 5.
+        is_fatal: If True, marks the jobs as permanently failed regardless of
+            retry_count. Defaults to False.
+
+    Raises:
+        mysql.connector.Error: If database update fails.
+    """
+    if not errors:
+        return
+
+    cursor = connection.cursor()
+
+    try:
+        if is_fatal:
+            query = """
+            UPDATE brevo_sync_outbox
+            SET status = 'failed',
+                last_error = %s,
+                retry_count = retry_count + 1,
+                next_attempt_at = NULL
+            WHERE id = %s
+            """
+            rows = [(error_message, job_id) for job_id, error_message in errors]
+        else:
+            query = """
+            UPDATE brevo_sync_outbox
+            SET retry_count = retry_count + 1,
+                last_error = %s,
+                status = CASE
+                    WHEN retry_count + 1 <= %s THEN 'pending'
+                    ELSE 'failed'
+                END,
+                next_attempt_at = CASE
+                    WHEN retry_count + 1 <= %s THEN NOW() + INTERVAL (retry_count + 1) * 5 MINUTE
+                    ELSE NULL
+                END
+            WHERE id = %s
+            """
+            rows = [
+                (error_message, max_job_retries, max_job_retries, job_id)  # type: ignore[misc]
+                for job_id, error_message in errors
+            ]
+
+        cursor.executemany(query, rows)
+
+    finally:
+        cursor.close()
+
+
 def mark_job_error(
     connection: MySQLConnection,
     job_id: int,
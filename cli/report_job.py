@@ -1,12 +1,10 @@
 import argparse
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from config.settings import load_settings
-from db.connection import database_connection_scope
 from logging_config.logger import configure_logging
-from analytics.reports import get_funnel_conversion_report
 from funnels.models import FunnelType
 
 
@@ -36,7 +34,7 @@ def build_period(days: int) -> tuple[Optional[datetime], Optional[datetime]]:
     if days <= 0:
         return None, None
 
-    period_end = datetime.utcnow()
+    period_end = datetime.now(timezone.utc)
     period_start = period_end - timedelta(days=days)
 
     return period_start, period_end
@@ -44,6 +42,12 @@ def build_period(days: int) -> tuple[Optional[datetime], Optional[datetime]]:
 
 def main() -> None:
     args = parse_arguments()
+
+    # Imported after argument parsing so --help and argparse error paths do
+    # not pay for mysql.connector and the analytics stack.
+    from analytics.reports import get_funnel_conversion_report
+    from db.connection import database_connection_scope
+
     settings = load_settings()
     configure_logging(settings.application.log_level)
 
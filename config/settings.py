@@ -1,11 +1,13 @@
 import os
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from dotenv import load_dotenv
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DatabaseSettings:
     host: str
     port: int
@@ -13,29 +15,31 @@ class DatabaseSettings:
     password: str
     name: str
     charset: str
+    pool_size: int = 8
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ApplicationSettings:
     environment: str
     dry_run: bool
     log_level: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BrevoSettings:
     api_key: Optional[str]
     base_url: str
     language_tests_list_id: int
     non_language_tests_list_id: int
+    sync_max_workers: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SentrySettings:
     dsn: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Settings:
     database: DatabaseSettings
     application: ApplicationSettings
@@ -43,28 +47,50 @@ class Settings:
     sentry: SentrySettings
 
 
+# Accepted truthy spellings for boolean environment variables
+_TRUTHY = frozenset({"1", "true", "yes", "y", "on"})
+
+# Valid integer spellings; checked up front so invalid values fall back to the
+# default without paying exception overhead
+_INT_RE = re.compile(r"^-?\d+$")
+
+
 def _load_boolean(name: str, default: bool) -> bool:
-    value = os.getenv(name)
+    value = os.environ.get(name)
     if value is None:
         return default
 
-    value_lower = value.strip().lower()
-    return value_lower in ["1", "true", "yes", "y"]
+    return value.strip().lower() in _TRUTHY
 
 
 def _load_integer(name: str, default: int) -> int:
-    value = os.getenv(name)
-    if value is None or value.strip() == "":
+    value = os.environ.get(name)
+    if value is None:
         return default
 
-    try:
-        return int(value)
-    except ValueError:
+    value = value.strip()
+    if not _INT_RE.fullmatch(value):
         return default
 
+    return int(value)
 
+
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
-    load_dotenv()
+    """Loads settings from the environment, parsing .env at most once per process.
+
+    The result is memoized: repeated calls from CLI entry points and report
+    generation reuse the same immutable Settings object instead of re-reading
+    the environment. All settings dataclasses are frozen, so sharing the
+    cached instance across callers is safe. Tests that need to re-read the
+    environment should call load_settings.cache_clear() first.
+
+    The .env file is only parsed when the environment does not already carry
+    the application config (detected via APP_ENV), so populated environments
+    (containers, CI) skip the file I/O entirely.
+    """
+    if not os.getenv("APP_ENV"):
+        load_dotenv()
 
     database_settings = DatabaseSettings(
         host=os.getenv("DB_HOST", "127.0.0.1"),
@@ -73,6 +99,7 @@ def load_settings() -> Settings:
         password=os.getenv("DB_PASSWORD", "change_me"),
         name=os.getenv("DB_NAME", "testizer"),
         charset=os.getenv("DB_CHARSET", "utf8mb4"),
+        pool_size=_load_integer("DB_POOL_SIZE", 8),
     )
 
     application_settings = ApplicationSettings(
@@ -86,6 +113,7 @@ def load_settings() -> Settings:
         base_url=os.getenv("BREVO_BASE_URL", "https://api.brevo.com/v3"),
         language_tests_list_id=_load_integer("BREVO_LANGUAGE_LIST_ID", 0),
         non_language_tests_list_id=_load_integer("BREVO_NON_LANGUAGE_LIST_ID", 0),
+        sync_max_workers=_load_integer("BREVO_SYNC_MAX_WORKERS", 8),
     )
 
     sentry_settings = SentrySettings(
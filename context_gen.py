@@ -1,4 +1,9 @@
+import json
 import os
+import shutil
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 IGNORE_DIRS = {
     ".git",
@@ -54,6 +59,8 @@ IGNORE_FILES = {
     "coverage.xml",
     ".pytest_cache",
     "full_project_context_testizer.txt",
+    "full_project_context_testizer.txt.tmp",
+    "full_project_context_testizer.cache.json",
 }
 
 IGNORE_EXTENSIONS = {
@@ -64,54 +71,262 @@ IGNORE_EXTENSIONS = {
     ".cache",
 }
 
+SPECIAL_FILES = {
+    "Dockerfile",
+    ".htaccess",
+    "requirements.txt",
+}
 
-def generate_context():
-    output_file = "full_project_context_testizer.txt"
+# str.endswith takes a tuple, letting one call replace the per-file
+# splitext + set lookup in the scan loop below.
+_INCLUDE_SUFFIXES = tuple(INCLUDE_EXT)
+_IGNORE_SUFFIXES = tuple(IGNORE_EXTENSIONS)
+
+# File reads are overlapped on a thread pool so syscall latency is hidden
+# behind other reads (I/O-bound work releases the GIL). The pending window
+# bounds how many read results can be buffered ahead of the writer.
+_READ_WORKERS = 8
+_MAX_PENDING_READS = 64
+
+# Files above this size (SQL dumps, JSON fixtures) are not buffered by the
+# read workers; the writer copies them with os.sendfile, which moves the
+# bytes entirely in kernel space with no user-space buffers. macOS sendfile
+# only accepts a socket destination, so the fast path is Linux-only.
+_LARGE_FILE_THRESHOLD = 1024 * 1024
+_USE_SENDFILE = sys.platform == "linux" and hasattr(os, "sendfile")
+
+# Marker for files the writer copies itself instead of buffering in the
+# pending window (too large for a worker read).
+_LARGE_FILE = object()
+
+
+def _filter_fingerprint():
+    """Returns the filter configuration in a JSON-comparable shape.
+
+    Stored alongside the mtime cache so the cache self-invalidates whenever
+    the include/ignore sets change.
+    """
+    return {
+        "ignore_dirs": sorted(IGNORE_DIRS),
+        "ignore_dir_patterns": list(IGNORE_DIR_PATTERNS),
+        "include_ext": sorted(INCLUDE_EXT),
+        "ignore_files": sorted(IGNORE_FILES),
+        "ignore_extensions": sorted(IGNORE_EXTENSIONS),
+        "special_files": sorted(SPECIAL_FILES),
+    }
+
+
+def _load_mtime_cache(cache_file):
+    """Loads the previous run's {path: [mtime_ns, size, offset, length]} map.
+
+    Returns an empty map when the cache is missing, unreadable, or was
+    written with a different filter configuration.
+    """
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    with open(output_file, "w", encoding="utf-8") as outfile:
-        outfile.write("=" * 80 + "\n")
-        outfile.write("TESTIZER EMAIL FUNNELS - FULL PROJECT CONTEXT\n")
-        outfile.write("=" * 80 + "\n\n")
-
-        for root, dirs, files in os.walk("."):
-            dirs[:] = [
-                d
-                for d in dirs
-                if d not in IGNORE_DIRS
-                and not any(pattern in d for pattern in IGNORE_DIR_PATTERNS)
-            ]
-
-            for file in files:
-                if file in IGNORE_FILES:
+    if cache.get("filters") != _filter_fingerprint():
+        return {}
+
+    files = cache.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _iter_context_files(root="."):
+    """Yields paths of files to include, in deterministic scan order."""
+
+    def _scan(dir_path):
+        # os.scandir yields cached type info with each entry, so filtering
+        # needs no extra stat call per file, and entry.path is already a
+        # normalized join of dir_path and the name.
+        subdirs = []
+
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                name = entry.name
+
+                if entry.is_dir(follow_symlinks=False):
+                    if name in IGNORE_DIRS or any(
+                        pattern in name for pattern in IGNORE_DIR_PATTERNS
+                    ):
+                        continue
+                    subdirs.append(entry.path)
                     continue
 
-                _, ext = os.path.splitext(file)
-                if ext in IGNORE_EXTENSIONS:
+                if name in IGNORE_FILES or name.endswith(_IGNORE_SUFFIXES):
                     continue
 
-                if ext in INCLUDE_EXT or file in (
-                    "Dockerfile",
-                    ".htaccess",
-                    "requirements.txt",
-                ):
-                    path = os.path.join(root, file)
-
-                    path = os.path.normpath(path)
-
-                    outfile.write(f"\n{'='*80}\n")
-                    outfile.write(f"FILE: {path}\n")
-                    outfile.write(f"{'='*80}\n\n")
-
-                    try:
-                        with open(
-                            path, "r", encoding="utf-8", errors="ignore"
-                        ) as infile:
-                            content = infile.read()
-                            outfile.write(content)
-                            if not content.endswith("\n"):
-                                outfile.write("\n")
-                    except Exception as e:
-                        outfile.write(f"Error reading file: {e}\n")
+                if name.endswith(_INCLUDE_SUFFIXES) or name in SPECIAL_FILES:
+                    path = entry.path
+                    if path.startswith("./"):
+                        path = path[2:]
+                    yield path
+
+        for subdir in subdirs:
+            yield from _scan(subdir)
+
+    yield from _scan(root)
+
+
+def _read_file(path):
+    """Reads one file's bytes for the context dump, newline-terminated."""
+    try:
+        with open(path, "rb") as infile:
+            data = infile.read()
+    except Exception as e:
+        return f"Error reading file: {e}\n".encode()
+
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    return data
+
+
+def _splice_previous(prev_dump, offset, length, outfile):
+    """Copies one payload region from the previous dump into the output."""
+    if _USE_SENDFILE:
+        outfile.flush()
+        out_fd = outfile.fileno()
+        in_fd = prev_dump.fileno()
+        remaining = length
+        while remaining > 0:
+            sent = os.sendfile(out_fd, in_fd, offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+    else:
+        prev_dump.seek(offset)
+        remaining = length
+        while remaining > 0:
+            chunk = prev_dump.read(min(remaining, 128 * 1024))
+            if not chunk:
+                break
+            outfile.write(chunk)
+            remaining -= len(chunk)
+
+
+def _copy_large_file(path, outfile):
+    """Copies one large file into the output, preferring kernel-side sendfile."""
+    try:
+        with open(path, "rb") as infile:
+            size = infile.seek(0, os.SEEK_END)
+            last = b""
+            if size > 0:
+                infile.seek(-1, os.SEEK_END)
+                last = infile.read(1)
+            infile.seek(0)
+
+            if _USE_SENDFILE:
+                # sendfile bypasses the output file's Python-level buffer,
+                # so flush it first to keep the bytes in order.
+                outfile.flush()
+                out_fd = outfile.fileno()
+                in_fd = infile.fileno()
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            else:
+                shutil.copyfileobj(infile, outfile, length=128 * 1024)
+
+            if last != b"\n":
+                outfile.write(b"\n")
+    except Exception as e:
+        outfile.write(f"Error reading file: {e}\n".encode())
+
+
+def generate_context():
+    output_file = "full_project_context_testizer.txt"
+    cache_file = "full_project_context_testizer.cache.json"
+    tmp_file = output_file + ".tmp"
+
+    # Unchanged files (same mtime and size as the cached run) are spliced
+    # from the previous dump instead of re-read, so a dev-loop rerun only
+    # touches the files that actually changed. The new dump is written to a
+    # temp file and renamed into place, keeping the old one readable for
+    # splicing.
+    prev_entries = _load_mtime_cache(cache_file)
+    try:
+        prev_dump = open(output_file, "rb") if prev_entries else None
+    except OSError:
+        prev_dump = None
+
+    new_entries = {}
+
+    # Binary mode end to end: file contents are copied verbatim without a
+    # decode/encode round-trip, and the 1 MiB output buffer keeps writes in
+    # large chunks.
+    with open(tmp_file, "wb", buffering=1024 * 1024) as outfile:
+        outfile.write(b"=" * 80 + b"\n")
+        outfile.write(b"TESTIZER EMAIL FUNNELS - FULL PROJECT CONTEXT\n")
+        outfile.write(b"=" * 80 + b"\n\n")
+
+        # Producer/consumer: the scan feeds a bounded window of in-flight
+        # reads on the pool, and this thread writes results back out in
+        # discovery order, so output stays byte-identical to a serial walk.
+        with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+            pending = deque()
+
+            def _write_next():
+                path, stat_key, item = pending.popleft()
+                outfile.write(f"\n{'='*80}\nFILE: {path}\n{'='*80}\n\n".encode())
+                start = outfile.tell()
+
+                if isinstance(item, bytes):
+                    outfile.write(item)
+                elif isinstance(item, list):
+                    _splice_previous(prev_dump, item[2], item[3], outfile)
+                elif item is _LARGE_FILE:
+                    _copy_large_file(path, outfile)
+                else:
+                    outfile.write(item.result())
+
+                if stat_key is not None:
+                    mtime_ns, size = stat_key
+                    new_entries[path] = [mtime_ns, size, start, outfile.tell() - start]
+
+            for path in _iter_context_files():
+                # One stat per file decides cache splice vs fresh read and
+                # routes large files past the worker buffers.
+                try:
+                    st = os.stat(path)
+                except OSError as e:
+                    stat_key = None
+                    item = f"Error reading file: {e}\n".encode()
+                else:
+                    stat_key = (st.st_mtime_ns, st.st_size)
+                    cached = prev_entries.get(path)
+                    if (
+                        prev_dump is not None
+                        and cached is not None
+                        and cached[0] == st.st_mtime_ns
+                        and cached[1] == st.st_size
+                    ):
+                        item = cached
+                    elif st.st_size > _LARGE_FILE_THRESHOLD:
+                        item = _LARGE_FILE
+                    else:
+                        item = pool.submit(_read_file, path)
+
+                pending.append((path, stat_key, item))
+                if len(pending) >= _MAX_PENDING_READS:
+                    _write_next()
+
+            while pending:
+                _write_next()
+
+    if prev_dump is not None:
+        prev_dump.close()
+
+    os.replace(tmp_file, output_file)
+
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump({"filters": _filter_fingerprint(), "files": new_entries}, f)
 
     print(f"Ready. File {output_file} created.")
 
@@ -1,20 +1,66 @@
 import logging
+import random
 import time
 from contextlib import contextmanager
 from typing import Generator, Optional
 
 import mysql.connector
-from mysql.connector import MySQLConnection
+from mysql.connector import MySQLConnection, errorcode, pooling
 
 from config.settings import DatabaseSettings
 
 
-# Module-level connection for lazy reuse
-_active_connection: Optional[MySQLConnection] = None
+# Process-wide connection pool, created lazily on first scope entry
+_connection_pool: Optional[pooling.MySQLConnectionPool] = None
+
+_POOL_NAME = "testizer"
+
+# Client-side error codes that indicate a lost or unreachable server and are
+# worth retrying. Matching on errno instead of message text keeps the check
+# cheap and independent of the server's error-message locale.
+_CONNECTION_ERROR_CODES = frozenset(
+    {
+        errorcode.CR_CONN_HOST_ERROR,  # 2003: can't connect
+        errorcode.CR_SERVER_GONE_ERROR,  # 2006: server has gone away
+        errorcode.CR_SERVER_LOST,  # 2013: lost connection during query
+    }
+)
+
+# Fallback for errors that carry no usable errno (e.g. failures wrapped by
+# the driver's interface layer); checked only after the errno test misses.
+_CONNECTION_ERROR_FRAGMENTS = (
+    "server has gone away",
+    "connection refused",
+    "can't connect",
+)
 
 logger = logging.getLogger("db.connection")
 
 
+def _retry_backoff_seconds(attempt_count: int) -> float:
+    """Computes the sleep before a connection retry.
+
+    Exponential growth spaces out repeated failures; the random jitter keeps
+    a fleet of workers reconnecting after a server restart from waking (and
+    hammering the server) at the same instant.
+    """
+    return min(30.0, 0.5 * (2**attempt_count)) + random.random() * 0.5
+
+
+def _is_connection_error(error: mysql.connector.Error) -> bool:
+    """Classifies a driver error as a lost/unreachable-server condition.
+
+    The errno check covers the common cases in a single set lookup; the
+    message-fragment scan is only reached when the errno is absent or
+    unrecognized.
+    """
+    if error.errno in _CONNECTION_ERROR_CODES:
+        return True
+
+    error_message = str(error).lower()
+    return any(fragment in error_message for fragment in _CONNECTION_ERROR_FRAGMENTS)
+
+
 def create_database_connection(
     database_settings: DatabaseSettings,
     connection_timeout: int = 10,
@@ -27,6 +73,12 @@ def create_database_connection(
     The connection includes explicit timeouts and automatic retry on connection failures.
     The connection must be explicitly closed by the caller to prevent resource leaks.
 
+    The connection requests the driver's C extension (use_pure=False) so result
+    rows are decoded by libmysqlclient instead of Python bytecode, which is the
+    dominant cost on high-row-count report queries. If the C extension is not
+    installed, the driver falls back to the pure-Python implementation with a
+    logged warning rather than failing.
+
     Args:
         database_settings: Configuration object containing database credentials.
         connection_timeout: Timeout in seconds for establishing the connection.
@@ -49,7 +101,7 @@ def create_database_connection(
             # Note: read_timeout and write_timeout are not supported in mysql-connector-python 9.1.0
             # They are accepted as function parameters for API compatibility but not passed to connect()
             # connection_timeout is supported and is used
-            connection = mysql.connector.connect(
+            connect_kwargs = dict(
                 host=database_settings.host,
                 port=database_settings.port,
                 user=database_settings.user,
@@ -59,25 +111,39 @@ def create_database_connection(
                 connection_timeout=connection_timeout,
             )
 
+            try:
+                connection = mysql.connector.connect(
+                    use_pure=False,
+                    **connect_kwargs,
+                )
+            except ImportError:
+                # C extension (_mysql_connector) not installed; pure-Python
+                # protocol still works, just with slower row decoding.
+                logger.warning(
+                    "mysql-connector C extension unavailable, "
+                    "falling back to pure-Python implementation",
+                )
+                connection = mysql.connector.connect(
+                    use_pure=True,
+                    **connect_kwargs,
+                )
+
             return connection  # type: ignore[return-value]
 
         except mysql.connector.Error as error:
-            error_message = str(error).lower()
-            is_connection_error = (
-                "server has gone away" in error_message
-                or "connection refused" in error_message
-                or "can't connect" in error_message
-            )
+            is_connection_error = _is_connection_error(error)
 
             if is_connection_error and attempt_count < max_attempts - 1:
                 attempt_count += 1
+                backoff = _retry_backoff_seconds(attempt_count)
                 logger.warning(
-                    "Database connection failed (attempt %d/%d): %s. Retrying in 2 seconds...",
+                    "Database connection failed (attempt %d/%d): %s. Retrying in %.1f seconds...",
                     attempt_count,
                     max_attempts,
                     error,
+                    backoff,
                 )
-                time.sleep(2)
+                time.sleep(backoff)
             else:
                 # Not a connection error or all attempts exhausted
                 raise
@@ -86,56 +152,137 @@ def create_database_connection(
     raise mysql.connector.Error("Failed to establish database connection")
 
 
-def _get_or_create_connection(
+def create_connection_pool(
     database_settings: DatabaseSettings,
-) -> MySQLConnection:
-    """Gets the active connection or creates a new one if none exists.
+    pool_size: Optional[int] = None,
+    connection_timeout: int = 10,
+) -> pooling.MySQLConnectionPool:
+    """Creates a MySQL connection pool for the whole process.
+
+    Pooled connections keep the TCP + authentication handshake out of the hot
+    path: every scope (funnel sync, purchase sync, Brevo worker, report CLI)
+    borrows an already-established connection instead of opening a fresh one.
+    Sessions are reset when a connection is returned, so state (temp tables,
+    session variables) never leaks between scopes. The same use_pure=False /
+    pure-Python fallback and connection-error retry behaviour as
+    create_database_connection applies to pool creation.
+
+    Args:
+        database_settings: Configuration object containing database credentials
+            and the configured pool size (DB_POOL_SIZE).
+        pool_size: Number of connections kept in the pool. Defaults to the
+            pool size from database_settings.
+        connection_timeout: Timeout in seconds for establishing each pooled
+            connection. Defaults to 10.
+
+    Returns:
+        Connection pool ready to hand out connections via get_connection().
+
+    Raises:
+        mysql.connector.Error: If pool creation fails after retry attempts due
+            to invalid credentials, network issues, or database unavailability.
+    """
+    if pool_size is None:
+        pool_size = database_settings.pool_size
+
+    attempt_count = 0
+    max_attempts = 2
+
+    while attempt_count < max_attempts:
+        try:
+            pool_kwargs = dict(
+                pool_name=_POOL_NAME,
+                pool_size=pool_size,
+                pool_reset_session=True,
+                host=database_settings.host,
+                port=database_settings.port,
+                user=database_settings.user,
+                password=database_settings.password,
+                database=database_settings.name,
+                charset=database_settings.charset,
+                connection_timeout=connection_timeout,
+            )
+
+            try:
+                return pooling.MySQLConnectionPool(use_pure=False, **pool_kwargs)
+            except ImportError:
+                # C extension (_mysql_connector) not installed; pure-Python
+                # protocol still works, just with slower row decoding.
+                logger.warning(
+                    "mysql-connector C extension unavailable, "
+                    "falling back to pure-Python implementation",
+                )
+                return pooling.MySQLConnectionPool(use_pure=True, **pool_kwargs)
+
+        except mysql.connector.Error as error:
+            is_connection_error = _is_connection_error(error)
+
+            if is_connection_error and attempt_count < max_attempts - 1:
+                attempt_count += 1
+                backoff = _retry_backoff_seconds(attempt_count)
+                logger.warning(
+                    "Connection pool creation failed (attempt %d/%d): %s. Retrying in %.1f seconds...",
+                    attempt_count,
+                    max_attempts,
+                    error,
+                    backoff,
+                )
+                time.sleep(backoff)
+            else:
+                # Not a connection error or all attempts exhausted
+                raise
+
+    # This should never be reached, but mypy needs it
+    raise mysql.connector.Error("Failed to create database connection pool")
+
+
+def _get_or_create_pool(
+    database_settings: DatabaseSettings,
+) -> pooling.MySQLConnectionPool:
+    """Gets the process-wide pool or creates it if none exists.
 
     Args:
         database_settings: Configuration object containing database credentials.
 
     Returns:
-        Active MySQL connection object.
+        Active MySQL connection pool.
     """
-    global _active_connection
+    global _connection_pool
 
-    if _active_connection is None:
-        _active_connection = create_database_connection(database_settings)
+    if _connection_pool is None:
+        _connection_pool = create_connection_pool(database_settings)
 
-    return _active_connection
+    return _connection_pool
 
 
-def _reset_connection() -> None:
-    """Closes and resets the active connection."""
-    global _active_connection
+def _reset_pool() -> None:
+    """Drops the process-wide pool so the next scope rebuilds it."""
+    global _connection_pool
 
-    if _active_connection is not None:
-        try:
-            _active_connection.close()
-        except Exception:
-            # Ignore errors when closing a broken connection
-            pass
-        _active_connection = None
+    _connection_pool = None
 
 
 @contextmanager
 def database_connection_scope(
     database_settings: DatabaseSettings,
 ) -> Generator[MySQLConnection, None, None]:
-    """Context manager for database connections with lazy reuse and automatic cleanup.
+    """Context manager that borrows a connection from the process-wide pool.
 
-    Reuses a single module-level connection across scopes. If the connection is lost
-    (e.g., "server has gone away"), it is automatically reset and a new connection
-    is created on the next scope entry.
+    The pool is created lazily on the first scope entry and shared by all
+    subsequent scopes, so repeated scopes (and worker threads, each borrowing
+    its own connection) skip the per-connection handshake. On scope exit the
+    connection is returned to the pool rather than closed. If a connection is
+    lost (e.g., "server has gone away"), it is reconnected in place so it goes
+    back to the pool healthy; only if the reconnect also fails is the whole
+    pool reset and rebuilt on the next scope entry.
 
-    The connection is not closed on scope exit - it remains available for reuse.
     Transaction boundaries (commit/rollback) are managed by the caller.
 
     Args:
         database_settings: Configuration object containing database credentials.
 
     Yields:
-        Active MySQL connection object.
+        Active MySQL connection object borrowed from the pool.
 
     Example:
         ```python
@@ -143,19 +290,51 @@ def database_connection_scope(
             cursor = conn.cursor()
             cursor.execute("SELECT 1")
             conn.commit()
-        # Connection remains open for reuse
+        # Connection is back in the pool, ready for the next scope
         ```
     """
-    connection = _get_or_create_connection(database_settings)
+    pool = _get_or_create_pool(database_settings)
+    connection = pool.get_connection()
+
+    # One lightweight round trip that revives a dead socket in place, so a
+    # pooled connection idle past wait_timeout never surfaces as a mid-query
+    # "server has gone away".
+    connection.ping(reconnect=True, attempts=2, delay=1)
 
     try:
         yield connection
     except mysql.connector.Error as error:
-        error_message = str(error).lower()
-        if "server has gone away" in error_message:
+        if _is_connection_error(error):
             logger.warning(
-                "Database connection lost during operation: %s. Resetting connection.",
+                "Database connection lost during operation: %s. Reconnecting.",
                 error,
             )
-            _reset_connection()
+            try:
+                connection.reconnect(attempts=2, delay=1)
+            except Exception:
+                # Reconnect failed too; drop the pool so the next scope
+                # rebuilds it from scratch.
+                logger.warning("Reconnect failed, resetting connection pool.")
+                _reset_pool()
         raise
+    finally:
+        # Prepared cursors cached by db.selectors and analytics.tracking must
+        # not outlive the scope: the pool's session reset deallocates their
+        # server-side statements, so a cursor surviving on the pooled
+        # connection object would execute against a dead statement handle in
+        # a later scope.
+        for cache_name in ("_funnel_statements", "_prepared_cursors"):
+            statements = connection.__dict__.pop(cache_name, None)
+            if statements:
+                for cached_cursor in statements.values():
+                    try:
+                        cached_cursor.close()
+                    except Exception:
+                        pass
+
+        try:
+            # For pooled connections close() returns the connection to the pool
+            connection.close()
+        except Exception:
+            # Ignore errors when returning a broken connection
+            pass
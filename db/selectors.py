@@ -1,38 +1,51 @@
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from mysql.connector import MySQLConnection
 
 
 DEFAULT_CANDIDATE_LOOKBACK_DAYS = 30
 
+# Rows pulled from the server per fetchmany() call in streaming selectors
+_STREAM_CHUNK_SIZE = 1000
 
-def get_language_test_candidates(
-    connection: MySQLConnection,
-    limit: int = 100,
-) -> List[Tuple[int, str]]:
-    """Fetches users who completed language tests and are eligible for funnel entry.
+# Emails per IN-list in batched lookups, keeping each statement comfortably
+# under max_allowed_packet even for oversized batches
+_IN_LIST_CHUNK_SIZE = 500
 
-    Selects users from simpletest tables who:
-    - Completed a language test within the lookback window
-    - Have a valid email address
-    - Are not already in the language funnel (idempotency check)
 
-    The LEFT JOIN with funnel_entries ensures we never process the same user twice,
-    preventing duplicate Brevo API calls and maintaining data integrity.
+# SQL is hoisted to module constants so the high-QPS selectors allocate no
+# query strings or param scaffolding per call.
 
-    Args:
-        connection: Active MySQL database connection.
-        limit: Maximum number of candidates to return. Used for batch processing
-            to manage memory footprint during high-load periods.
+_CANDIDATE_PARAMS_BASE = (DEFAULT_CANDIDATE_LOOKBACK_DAYS, "language")
 
-    Returns:
-        List of tuples containing (user_id, email) for eligible candidates.
-        Empty list if no candidates found or all users already processed.
+_QUERY_LANGUAGE_CANDIDATES = """
+    SELECT
+        u.Id AS user_id,
+        u.Email AS email
+    FROM simpletest_users AS u
+    INNER JOIN simpletest_test AS t
+        ON t.Id = u.TestId
+    INNER JOIN simpletest_lang AS l
+        ON l.Id = t.LangId
+    WHERE
+        u.Email IS NOT NULL
+        AND u.Email <> ''
+        AND u.Datep >= DATE_SUB(NOW(), INTERVAL %s DAY)
+        AND NOT EXISTS (
+            SELECT 1
+            FROM funnel_entries AS f
+            WHERE f.email = u.Email
+              AND f.funnel_type = %s
+        )
+    ORDER BY
+        u.Datep DESC
+    LIMIT %s
     """
-    cursor = connection.cursor()
 
-    query = """
+# Cache-then-verify variant: the anti-join is dropped and idempotency is
+# enforced in Python against the primed email cache instead
+_QUERY_LANGUAGE_CANDIDATES_UNFILTERED = """
     SELECT
         u.Id AS user_id,
         u.Email AS email
@@ -41,26 +54,322 @@ def get_language_test_candidates(
         ON t.Id = u.TestId
     INNER JOIN simpletest_lang AS l
         ON l.Id = t.LangId
-    LEFT JOIN funnel_entries AS f
-        ON f.email = u.Email
-       AND f.funnel_type = %s
     WHERE
         u.Email IS NOT NULL
         AND u.Email <> ''
         AND u.Datep >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        AND f.id IS NULL
     ORDER BY
         u.Datep DESC
     LIMIT %s
     """
 
-    params = ("language", DEFAULT_CANDIDATE_LOOKBACK_DAYS, limit)
+_QUERY_SEEN_LANGUAGE_EMAILS = """
+    SELECT email
+    FROM funnel_entries
+    WHERE funnel_type = 'language'
+    """
 
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    cursor.close()
+_QUERY_ALL_CANDIDATES = """
+    (
+        SELECT
+            'language' AS funnel_type,
+            u.Id AS user_id,
+            u.Email AS email
+        FROM simpletest_users AS u
+        INNER JOIN simpletest_test AS t
+            ON t.Id = u.TestId
+        INNER JOIN simpletest_lang AS l
+            ON l.Id = t.LangId
+        WHERE
+            u.Email IS NOT NULL
+            AND u.Email <> ''
+            AND u.Datep >= DATE_SUB(NOW(), INTERVAL %s DAY)
+            AND NOT EXISTS (
+                SELECT 1
+                FROM funnel_entries AS f
+                WHERE f.email = u.Email
+                  AND f.funnel_type = %s
+            )
+        ORDER BY
+            u.Datep DESC
+        LIMIT %s
+    )
+    """
 
-    return rows  # type: ignore[no-any-return,return-value]
+_QUERY_PENDING_ENTRIES = """
+    SELECT
+        email,
+        funnel_type,
+        user_id,
+        test_id
+    FROM funnel_entries
+    WHERE certificate_purchased = 0
+    ORDER BY entered_at ASC
+    LIMIT %s
+    """
+
+_QUERY_PENDING_ENTRIES_WITH_PURCHASES = """
+    SELECT
+        f.id,
+        f.email,
+        f.funnel_type,
+        f.user_id,
+        f.test_id,
+        m.payment_id,
+        m.first_payment
+    FROM funnel_entries AS f
+    LEFT JOIN (
+        SELECT
+            u.email AS email,
+            CASE t.type WHEN 1 THEN 'language' WHEN 2 THEN 'non_language' END
+                AS funnel_type,
+            MIN(p.id) AS payment_id,
+            MIN(p.datetime_payment) AS first_payment
+        FROM modx_cert_payment AS p
+        INNER JOIN modx_cert_result AS r ON r.id = p.id_result
+        INNER JOIN modx_cert_users AS u ON u.id = r.id_user
+        INNER JOIN modx_cert_test AS t ON t.id = r.id_test
+        WHERE
+            p.id_status = 2
+            AND p.datetime_payment IS NOT NULL
+            AND t.type IN (1, 2)
+        GROUP BY u.email, t.type
+    ) AS m
+        ON m.email = f.email
+       AND m.funnel_type = f.funnel_type
+    WHERE f.certificate_purchased = 0
+    ORDER BY f.entered_at ASC
+    LIMIT %s
+    """
+
+# Positional placeholders: prepared cursors do not accept named ones
+_QUERY_CERTIFICATE_PURCHASE = """
+    SELECT
+        p.id,
+        p.datetime_payment
+    FROM modx_cert_payment AS p
+    INNER JOIN modx_cert_result AS r ON r.id = p.id_result
+    INNER JOIN modx_cert_users AS u ON u.id = r.id_user
+    INNER JOIN modx_cert_test AS t ON t.id = r.id_test
+    WHERE
+        u.email = %s
+        AND p.id_status = 2
+        AND p.datetime_payment IS NOT NULL
+        AND (
+            (%s = 'language' AND t.type = 1)
+            OR (%s = 'non_language' AND t.type = 2)
+        )
+    ORDER BY p.datetime_payment ASC
+    LIMIT 1
+    """
+
+# The period filter must stay as bare half-open comparisons on the date
+# column (>= from, < to). Do not wrap the column in DATE() or similar
+# functions: that would make the filter non-sargable and disable index use.
+# The four (has_from, has_to) variants are precomputed at import time.
+_QUERY_CONVERSION_SUMMARY_BASE = """
+    SELECT
+        funnel_type,
+        COUNT(*) AS total_entries,
+        COALESCE(SUM(certificate_purchased = 1), 0) AS total_purchased
+    FROM funnel_entries
+    WHERE 1 = 1
+    """
+
+_QUERY_CONVERSION_SUMMARY_DAILY_BASE = """
+    SELECT
+        funnel_type,
+        COALESCE(SUM(entries), 0) AS total_entries,
+        COALESCE(SUM(purchases), 0) AS total_purchased
+    FROM funnel_daily_stats
+    WHERE 1 = 1
+    """
+
+_CONVERSION_SUMMARY_TAIL = " GROUP BY funnel_type ORDER BY funnel_type"
+
+
+def _build_period_variants(base: str, column: str) -> Dict[Tuple[bool, bool], str]:
+    return {
+        (has_from, has_to): (
+            base
+            + (f" AND {column} >= %s" if has_from else "")
+            + (f" AND {column} < %s" if has_to else "")
+            + _CONVERSION_SUMMARY_TAIL
+        )
+        for has_from in (False, True)
+        for has_to in (False, True)
+    }
+
+
+_QUERY_CONVERSION_SUMMARY = _build_period_variants(
+    _QUERY_CONVERSION_SUMMARY_BASE, "entered_at"
+)
+_QUERY_CONVERSION_SUMMARY_DAILY = _build_period_variants(
+    _QUERY_CONVERSION_SUMMARY_DAILY_BASE, "day"
+)
+
+
+def _get_prepared_cursor(connection: MySQLConnection, statement_key: str):
+    """Returns a prepared cursor cached on the connection for this statement.
+
+    The server parses and plans a prepared statement once; subsequent executes
+    ship only parameter values over the binary protocol. Cursors are cached in
+    a dict attached to the connection and deliberately not closed between
+    calls, so selector-heavy loops (e.g. one purchase lookup per pending
+    entry) pay the parse cost once per connection. database_connection_scope
+    closes the cached cursors when the connection goes back to the pool,
+    because the pool's session reset deallocates server-side statements.
+
+    Args:
+        connection: Active MySQL database connection.
+        statement_key: Stable key identifying the statement (one cursor each).
+
+    Returns:
+        Prepared cursor ready for execute().
+    """
+    statements = getattr(connection, "_funnel_statements", None)
+    if statements is None:
+        statements = {}
+        connection._funnel_statements = statements  # type: ignore[attr-defined]
+
+    cursor = statements.get(statement_key)
+    if cursor is None:
+        cursor = connection.cursor(prepared=True)
+        statements[statement_key] = cursor
+
+    return cursor
+
+
+# Process-local cache of emails already in the language funnel. None means
+# cold: the cached candidate path falls back to the SQL anti-join until
+# prime_language_email_cache has run once for this process.
+_seen_language_emails: Optional[Set[str]] = None
+
+
+def prime_language_email_cache(connection: MySQLConnection) -> int:
+    """Loads emails already in the language funnel into the process cache.
+
+    In steady state most recent users are already in funnel_entries, so the
+    candidate query's anti-join probes the table once per user on every
+    batch. Priming this cache once at process start lets
+    get_language_test_candidates(use_cache=True) drop the anti-join and
+    filter in Python instead.
+
+    Args:
+        connection: Active MySQL database connection.
+
+    Returns:
+        Number of emails loaded into the cache.
+    """
+    global _seen_language_emails
+
+    seen: Set[str] = set()
+    cursor = connection.cursor(buffered=False)
+
+    try:
+        cursor.execute(_QUERY_SEEN_LANGUAGE_EMAILS)
+
+        while True:
+            chunk = cursor.fetchmany(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            seen.update(email for (email,) in chunk)
+    finally:
+        cursor.close()
+
+    _seen_language_emails = seen
+    return len(seen)
+
+
+def note_language_email_seen(email: str) -> None:
+    """Records an email as entered into the language funnel.
+
+    Call after a successful funnel entry insert so the cached candidate path
+    does not re-emit the user within this process. No-op while the cache is
+    cold.
+
+    Args:
+        email: Email address that now has a language funnel entry.
+    """
+    if _seen_language_emails is not None:
+        _seen_language_emails.add(email)
+
+
+def reset_language_email_cache() -> None:
+    """Drops the process-local email cache, returning it to the cold state."""
+    global _seen_language_emails
+
+    _seen_language_emails = None
+
+
+def get_language_test_candidates(
+    connection: MySQLConnection,
+    limit: int = 100,
+    use_cache: bool = False,
+) -> Iterator[Tuple[int, str]]:
+    """Streams users who completed language tests and are eligible for funnel entry.
+
+    Selects users from simpletest tables who:
+    - Completed a language test within the lookback window
+    - Have a valid email address
+    - Are not already in the language funnel (idempotency check)
+
+    The NOT EXISTS anti-join against funnel_entries ensures we never process
+    the same user twice, preventing duplicate Brevo API calls and maintaining
+    data integrity; MySQL executes it as an index probe on idx_email_funnel.
+    The Datep range + ORDER BY ... LIMIT is served by idx_users_datep_email
+    (see docs/migrations/005) as a backward index range scan, avoiding a
+    filesort over the whole lookback window.
+
+    Rows are streamed from an unbuffered cursor in fetchmany chunks rather
+    than materialized with fetchall, so peak memory stays flat for large
+    limits. The connection must not run other statements until the iterator
+    is exhausted; callers that need random access can wrap it in list().
+
+    With use_cache=True and a primed email cache (prime_language_email_cache),
+    the anti-join is dropped from the SQL and already-seen emails are filtered
+    in Python instead, saving one funnel_entries probe per user. Filtered rows
+    count against the LIMIT, so a cached batch can yield fewer than limit
+    candidates even when more eligible users exist; the next run picks them
+    up. A cold cache silently falls back to the anti-join.
+
+    Args:
+        connection: Active MySQL database connection.
+        limit: Maximum number of candidates to return. Used for batch processing
+            to manage memory footprint during high-load periods.
+        use_cache: If True, enforce idempotency against the process-local
+            email cache instead of the SQL anti-join (when the cache is warm).
+
+    Yields:
+        (user_id, email) tuples for eligible candidates.
+    """
+    seen = _seen_language_emails if use_cache else None
+
+    cursor = connection.cursor(buffered=False)
+
+    try:
+        if seen is None:
+            cursor.execute(
+                _QUERY_LANGUAGE_CANDIDATES, (*_CANDIDATE_PARAMS_BASE, limit)
+            )
+        else:
+            cursor.execute(
+                _QUERY_LANGUAGE_CANDIDATES_UNFILTERED,
+                (DEFAULT_CANDIDATE_LOOKBACK_DAYS, limit),
+            )
+
+        while True:
+            chunk = cursor.fetchmany(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            if seen is None:
+                yield from chunk  # type: ignore[misc]
+            else:
+                for user_id, email in chunk:
+                    if email not in seen:
+                        yield user_id, email
+    finally:
+        cursor.close()
 
 
 def get_non_language_test_candidates(
@@ -82,42 +391,134 @@ def get_non_language_test_candidates(
     return []
 
 
+def get_all_test_candidates(
+    connection: MySQLConnection,
+    limit_per_type: int = 100,
+    funnel_types: Optional[Sequence[str]] = None,
+) -> Dict[str, List[Tuple[int, str]]]:
+    """Fetches candidates for all funnel types in a single round-trip.
+
+    Fuses the per-type candidate queries into one statement with a funnel_type
+    discriminator column, so the sync service pays one network round-trip for
+    both candidate sets instead of one per funnel type. The result is
+    partitioned by funnel type in Python.
+
+    Non-language candidate selection is not implemented yet (see
+    get_non_language_test_candidates); its SELECT arm will be appended with
+    UNION ALL once the source tables are defined, which is why the language
+    arm is already parenthesized with its own LIMIT.
+
+    Args:
+        connection: Active MySQL database connection.
+        limit_per_type: Maximum number of candidates to return per funnel
+            type. Used for batch processing to manage memory footprint.
+        funnel_types: Funnel types to fetch candidates for; None means all.
+            Callers with an unconfigured funnel pass only the active types so
+            the unused arm's scan is skipped entirely.
+
+    Returns:
+        Mapping of funnel type to list of (user_id, email) tuples. All known
+        funnel types are present as keys; types without candidates (or not
+        requested) map to empty lists.
+    """
+    if funnel_types is None:
+        funnel_types = ("language", "non_language")
+
+    # Only the language arm exists today, so the query is skipped outright
+    # unless language candidates were requested.
+    if "language" in funnel_types:
+        cursor = _get_prepared_cursor(connection, "all_candidates")
+        cursor.execute(
+            _QUERY_ALL_CANDIDATES, (*_CANDIDATE_PARAMS_BASE, limit_per_type)
+        )
+        rows = cursor.fetchall()
+    else:
+        rows = []
+
+    candidates: Dict[str, List[Tuple[int, str]]] = {
+        "language": [],
+        "non_language": [],
+    }
+
+    # Column values arrive as native Python types from the driver; no
+    # per-row constructor calls needed.
+    for funnel_type, user_id, email in rows:
+        candidates[funnel_type].append((user_id, email))  # type: ignore[arg-type, index]
+
+    return candidates
+
+
 def get_pending_funnel_entries(
     connection: MySQLConnection,
     max_rows: int = 100,
-) -> List[Tuple[str, str, Optional[int], Optional[int]]]:
-    """Retrieves funnel entries that haven't been marked as purchased.
+) -> Iterator[Tuple[str, str, Optional[int], Optional[int]]]:
+    """Streams funnel entries that haven't been marked as purchased.
 
-    Used by purchase synchronization to identify users who entered the funnel
-    but haven't yet purchased certificates. Entries are ordered by entry time
-    to process oldest first, ensuring fair processing order.
+    Identifies users who entered the funnel but haven't yet purchased
+    certificates. Entries are ordered by entry time to process oldest first,
+    ensuring fair processing order.
+
+    Rows are streamed from an unbuffered cursor in fetchmany chunks rather
+    than materialized with fetchall, so peak memory stays flat for large
+    batches. The connection must not run other statements until the iterator
+    is exhausted; callers that need random access can wrap it in list().
 
     Args:
         connection: Active MySQL database connection.
         max_rows: Maximum number of entries to process per batch. Prevents
             memory exhaustion when large backlogs exist.
 
-    Returns:
-        List of tuples: (email, funnel_type, user_id, test_id).
-        Empty list if all entries are already marked as purchased.
+    Yields:
+        (email, funnel_type, user_id, test_id) tuples.
     """
-    cursor = connection.cursor()
+    cursor = connection.cursor(buffered=False)
 
-    query = """
-    SELECT
-        email,
-        funnel_type,
-        user_id,
-        test_id
-    FROM funnel_entries
-    WHERE certificate_purchased = 0
-    ORDER BY entered_at ASC
-    LIMIT %s
+    try:
+        cursor.execute(_QUERY_PENDING_ENTRIES, (max_rows,))
+
+        while True:
+            chunk = cursor.fetchmany(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield from chunk  # type: ignore[misc]
+    finally:
+        cursor.close()
+
+
+def get_pending_funnel_entries_with_purchases(
+    connection: MySQLConnection,
+    max_rows: int = 100,
+) -> List[
+    Tuple[int, str, str, Optional[int], Optional[int], Optional[int], Optional[datetime]]
+]:
+    """Retrieves pending funnel entries with their purchase state in one query.
+
+    Folds the certificate lookup into the pending-entries query: a derived
+    table aggregates paid certificates per (email, test type) and is LEFT
+    JOINed onto funnel_entries, so purchase sync gets "still pending" vs "now
+    purchased" for the whole batch in a single round-trip. Entries without a
+    purchase come back with NULL payment columns.
+
+    The derived table reports the earliest payment datetime per key, matching
+    get_certificate_purchase_for_entry; the payment id alongside it is the
+    smallest matching id and is intended for logging, not row-level joins.
+
+    Args:
+        connection: Active MySQL database connection.
+        max_rows: Maximum number of entries to process per batch. Prevents
+            memory exhaustion when large backlogs exist.
+
+    Returns:
+        List of tuples: (funnel_entry_id, email, funnel_type, user_id,
+        test_id, payment_id, payment_datetime), where the last two are None
+        for entries without a completed purchase. The leading entry id lets
+        callers enqueue per-entry follow-up work (e.g. outbox jobs) without a
+        lookup round-trip. Ordered by entry time, oldest first.
     """
+    cursor = _get_prepared_cursor(connection, "pending_entries_with_purchases")
 
-    cursor.execute(query, (max_rows,))
+    cursor.execute(_QUERY_PENDING_ENTRIES_WITH_PURCHASES, (max_rows,))
     rows = cursor.fetchall()
-    cursor.close()
 
     return rows  # type: ignore[no-any-return,return-value]
 
@@ -149,41 +550,89 @@ def get_certificate_purchase_for_entry(
         Tuple of (payment_id, payment_datetime) if purchase found, None otherwise.
         Payment datetime is returned as datetime object for direct use in updates.
     """
-    query = """
-    SELECT
-        p.id,
-        p.datetime_payment
-    FROM modx_cert_payment AS p
-    INNER JOIN modx_cert_result AS r ON r.id = p.id_result
-    INNER JOIN modx_cert_users AS u ON u.id = r.id_user
-    INNER JOIN modx_cert_test AS t ON t.id = r.id_test
-    WHERE
-        u.email = %(email)s
-        AND p.id_status = 2
-        AND p.datetime_payment IS NOT NULL
-        AND (
-            (%(funnel_type)s = 'language' AND t.type = 1)
-            OR (%(funnel_type)s = 'non_language' AND t.type = 2)
-        )
-    ORDER BY p.datetime_payment ASC
-    LIMIT 1
-    """
-
-    params = {
-        "email": email,
-        "funnel_type": funnel_type,
-    }
-
-    with connection.cursor() as cursor:
-        cursor.execute(query, params)  # type: ignore[arg-type]
-        row = cursor.fetchone()
+    cursor = _get_prepared_cursor(connection, "certificate_purchase")
+    cursor.execute(_QUERY_CERTIFICATE_PURCHASE, (email, funnel_type, funnel_type))
+    row = cursor.fetchone()
 
     if row is None:
         return None
 
     payment_id, payment_datetime = row
 
-    return int(payment_id), payment_datetime  # type: ignore[return-value, arg-type]
+    return payment_id, payment_datetime  # type: ignore[return-value]
+
+
+def get_certificate_purchases_for_entries(
+    connection: MySQLConnection,
+    entries: Sequence[Tuple[str, str]],
+) -> Dict[Tuple[str, str], Tuple[int, datetime]]:
+    """Fetches certificate purchases for a whole batch of funnel entries at once.
+
+    Batched counterpart of get_certificate_purchase_for_entry: one IN-list
+    query over all batch emails replaces one join-heavy round-trip per pending
+    entry, so a 100-entry batch pays the protocol and parse cost once. Rows
+    are reduced client-side to the earliest paid purchase per
+    (email, funnel_type), matching the single-entry selector's
+    ORDER BY datetime_payment ASC LIMIT 1. Batches larger than
+    _IN_LIST_CHUNK_SIZE emails are split across statements so the query text
+    stays under max_allowed_packet.
+
+    Args:
+        connection: Active MySQL database connection.
+        entries: (email, funnel_type) pairs to look up. Pairs not present in
+            the result had no matching purchase. Empty input skips the query.
+
+    Returns:
+        Mapping of (email, funnel_type) to (payment_id, payment_datetime) for
+        entries with a completed purchase.
+    """
+    if not entries:
+        return {}
+
+    emails = sorted({email for email, _ in entries})
+
+    test_type_to_funnel = {1: "language", 2: "non_language"}
+    requested = set(entries)
+    purchases: Dict[Tuple[str, str], Tuple[int, datetime]] = {}
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(emails), _IN_LIST_CHUNK_SIZE):
+            chunk = emails[start : start + _IN_LIST_CHUNK_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+
+            query = f"""
+            SELECT
+                u.email,
+                t.type,
+                p.id,
+                p.datetime_payment
+            FROM modx_cert_payment AS p
+            INNER JOIN modx_cert_result AS r ON r.id = p.id_result
+            INNER JOIN modx_cert_users AS u ON u.id = r.id_user
+            INNER JOIN modx_cert_test AS t ON t.id = r.id_test
+            WHERE
+                u.email IN ({placeholders})
+                AND p.id_status = 2
+                AND p.datetime_payment IS NOT NULL
+                AND t.type IN (1, 2)
+            """
+
+            cursor.execute(query, tuple(chunk))
+
+            for email, test_type, payment_id, payment_datetime in cursor:
+                funnel_type = test_type_to_funnel.get(test_type)  # type: ignore[arg-type]
+                if funnel_type is None:
+                    continue
+
+                key = (email, funnel_type)
+                if key not in requested:
+                    continue
+
+                existing = purchases.get(key)
+                if existing is None or payment_datetime < existing[1]:  # type: ignore[operator]
+                    purchases[key] = (payment_id, payment_datetime)  # type: ignore[assignment]
+
+    return purchases
 
 
 def get_funnel_conversion_summary(
@@ -208,41 +657,59 @@ def get_funnel_conversion_summary(
         List of tuples: (funnel_type, total_entries, total_purchased).
         Results are ordered by funnel_type for consistent reporting output.
     """
-    query = """
-    SELECT
-        funnel_type,
-        COUNT(*) AS total_entries,
-        SUM(CASE WHEN certificate_purchased = 1 THEN 1 ELSE 0 END) AS total_purchased
-    FROM funnel_entries
-    WHERE 1 = 1
-    """
+    # All four date-bound variants are precomputed at import time; picking
+    # one by (has_from, has_to) keeps string building out of the call path.
+    query = _QUERY_CONVERSION_SUMMARY[(from_date is not None, to_date is not None)]
+
+    params = tuple(bound for bound in (from_date, to_date) if bound is not None)
+
+    # The default mysql-connector cursor is unbuffered; iterating it streams
+    # rows from the server instead of materializing an intermediate fetchall
+    # list. The rowset is bounded by the number of funnel types, so the
+    # converted result stays a list for callers.
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        # funnel_type and COUNT(*) already arrive as str/int; only the SUM
+        # aggregate needs a cast because MySQL returns it as Decimal.
+        return [
+            (funnel_type, total_entries, int(total_purchased))  # type: ignore[arg-type, misc]
+            for funnel_type, total_entries, total_purchased in cursor
+        ]
 
-    params: Dict[str, Any] = {}
 
-    if from_date is not None:
-        query += " AND entered_at >= %(from_date)s"
-        params["from_date"] = from_date
+def get_funnel_conversion_summary_daily(
+    connection: MySQLConnection,
+    from_day: Optional[date],
+    to_day: Optional[date],
+) -> List[Tuple[str, int, int]]:
+    """Aggregates funnel conversion statistics from the funnel_daily_stats rollup.
 
-    if to_date is not None:
-        query += " AND entered_at < %(to_date)s"
-        params["to_date"] = to_date
+    Serves the same result shape as get_funnel_conversion_summary but scans
+    one rollup row per (funnel_type, day) instead of every funnel entry, so
+    the cost is O(days) regardless of traffic volume. The rollup is maintained
+    incrementally by analytics.tracking at write time.
 
-    query += " GROUP BY funnel_type ORDER BY funnel_type"
+    Only usable for whole-day periods: the rollup has daily granularity, so
+    callers with intraday datetime bounds must fall back to
+    get_funnel_conversion_summary.
 
-    with connection.cursor() as cursor:
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+    Args:
+        connection: Active MySQL database connection.
+        from_day: Start of reporting period (inclusive). None means no lower bound.
+        to_day: End of reporting period (exclusive). None means no upper bound.
 
-    result = []
+    Returns:
+        List of tuples: (funnel_type, total_entries, total_purchased).
+        Results are ordered by funnel_type for consistent reporting output.
+    """
+    query = _QUERY_CONVERSION_SUMMARY_DAILY[(from_day is not None, to_day is not None)]
 
-    for row in rows:
-        funnel_type, total_entries, total_purchased = row
-        result.append(
-            (
-                str(funnel_type),
-                int(total_entries),  # type: ignore[arg-type]
-                int(total_purchased),  # type: ignore[arg-type]
-            )
-        )
+    params = tuple(bound for bound in (from_day, to_day) if bound is not None)
 
-    return result
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        # Both totals are SUM aggregates, which MySQL returns as Decimal
+        return [
+            (funnel_type, int(total_entries), int(total_purchased))  # type: ignore[arg-type, misc]
+            for funnel_type, total_entries, total_purchased in cursor
+        ]
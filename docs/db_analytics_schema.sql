@@ -10,7 +10,8 @@ CREATE TABLE IF NOT EXISTS funnel_entries (
   PRIMARY KEY (id),
   UNIQUE KEY uk_funnel_entry_email_type_test (email, funnel_type, test_id),
   KEY idx_email_funnel (email, funnel_type),
-  KEY idx_user_test (user_id, test_id)
+  KEY idx_user_test (user_id, test_id),
+  KEY idx_fe_type_entered_purchased (funnel_type, entered_at, certificate_purchased)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 CREATE TABLE IF NOT EXISTS brevo_sync_outbox (
@@ -29,3 +30,11 @@ CREATE TABLE IF NOT EXISTS brevo_sync_outbox (
   KEY idx_funnel_entry (funnel_entry_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+
+CREATE TABLE IF NOT EXISTS funnel_daily_stats (
+  funnel_type VARCHAR(50) NOT NULL,
+  day DATE NOT NULL,
+  entries INT UNSIGNED NOT NULL DEFAULT 0,
+  purchases INT UNSIGNED NOT NULL DEFAULT 0,
+  PRIMARY KEY (funnel_type, day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
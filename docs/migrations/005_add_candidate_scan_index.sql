@@ -0,0 +1,11 @@
+-- This migration adds a composite index for the candidate selection scan.
+-- The candidate queries range-filter on Datep, read Email and TestId, and
+-- ORDER BY Datep DESC LIMIT n. With all three columns in the index, MySQL
+-- walks the index backwards and stops after n qualifying rows instead of
+-- filesorting the whole lookback window.
+--
+-- The anti-join probe on funnel_entries (email, funnel_type) is already
+-- covered by the existing idx_email_funnel index; no new index is needed
+-- there.
+
+CREATE INDEX idx_users_datep_email ON simpletest_users (Datep, Email, TestId);
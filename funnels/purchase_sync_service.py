@@ -1,15 +1,22 @@
-import json
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import mysql.connector
 from mysql.connector import MySQLConnection
 
-from analytics.tracking import mark_certificate_purchased
+from analytics.tracking import mark_certificates_purchased_bulk
 from brevo.api_client import BrevoApiClient
-from brevo.outbox import enqueue_brevo_sync_job
-from db.selectors import get_pending_funnel_entries, get_certificate_purchase_for_entry
+from brevo.models import payload_to_json_bytes
+from brevo.outbox import enqueue_brevo_sync_jobs_bulk
+from db.selectors import get_pending_funnel_entries_with_purchases
+
+# Suggested polling window for schedulers that honour sync()'s return value.
+# Consecutive runs with no pending entries double the suggested delay from
+# the minimum up to the cap; any run with work resets it.
+MIN_POLL_INTERVAL_SECONDS = 60.0
+MAX_POLL_INTERVAL_SECONDS = 960.0
+_EMPTY_RUNS_BEFORE_BACKOFF = 2
 
 
 class PurchaseSyncService:
@@ -41,7 +48,25 @@ class PurchaseSyncService:
         self.dry_run = dry_run
         self.logger = logging.getLogger("funnels.purchase_sync_service")
 
-    def sync(self, max_rows: int = 100) -> None:
+        # Consecutive sync() runs that found no pending entries. Drives the
+        # adaptive poll delay suggested to the scheduler.
+        self._empty_streak = 0
+
+        # Outbox payload skeletons built once; the per-purchase loop fills
+        # copies instead of re-allocating the literal dicts each iteration.
+        self._payload_template = {
+            "email": None,
+            "funnel_type": None,
+            "purchased_at": None,
+            "attributes": None,
+        }
+        self._attributes_template = {
+            "FUNNEL_TYPE": None,
+            "CERTIFICATE_PURCHASED": 1,
+            "CERTIFICATE_PURCHASED_AT": None,
+        }
+
+    def sync(self, max_rows: int = 100) -> float:
         """Processes pending funnel entries to detect certificate purchases.
 
         Fetches entries where certificate_purchased=0, checks MODX payment tables,
@@ -54,13 +79,25 @@ class PurchaseSyncService:
         Args:
             max_rows: Maximum entries to process per run. Prevents long-running
                 transactions and allows incremental processing of large backlogs.
+
+        Returns:
+            Suggested delay in seconds before the next sync() call. Stays at
+            MIN_POLL_INTERVAL_SECONDS while entries keep arriving and backs
+            off exponentially (capped at MAX_POLL_INTERVAL_SECONDS) once
+            consecutive runs come back empty, so an idle installation stops
+            paying a full SELECT every minute. Schedulers on a fixed cadence
+            may ignore the value.
         """
         self.logger.info(
             "Starting purchase synchronization for funnel entries (limit=%s)",
             max_rows,
         )
 
-        pending_entries = get_pending_funnel_entries(
+        # Purchase state rides along with the pending entries in one query,
+        # so the batch needs no follow-up certificate lookups at all. The
+        # entry id in each row spares a per-purchase funnel_entries lookup
+        # when building outbox jobs.
+        pending_entries = get_pending_funnel_entries_with_purchases(
             connection=self.connection,
             max_rows=max_rows,
         )
@@ -70,181 +107,127 @@ class PurchaseSyncService:
             len(pending_entries),
         )
 
-        for entry in pending_entries:
-            email, funnel_type, user_id, test_id = entry
-
-            purchase_row = get_certificate_purchase_for_entry(
-                connection=self.connection,
-                email=email,
-                funnel_type=funnel_type,
-                user_id=user_id,
-                test_id=test_id,
-            )
-
-            if purchase_row is None:
-                continue
+        if pending_entries:
+            self._empty_streak = 0
+        else:
+            self._empty_streak += 1
 
-            order_id, purchased_at = purchase_row
+        # The client-side loop only collects rows; all database writes happen
+        # afterwards in three statements (grouped purchase UPDATEs, one outbox
+        # executemany, one commit) instead of two round-trips per purchase.
+        purchases: List[Tuple[str, str, Optional[int], datetime]] = []
+        outbox_rows: List[Tuple[int, str, bytes]] = []
 
-            purchased_at_datetime = self._ensure_datetime(purchased_at)
+        # Per-entry logging cost is hoisted out of the loop: the level check
+        # runs once, and the bound method avoids a self.logger attribute
+        # lookup per iteration. The handlers themselves run on the logging
+        # queue listener's thread.
+        info_enabled = self.logger.isEnabledFor(logging.INFO)
+        log_info = self.logger.info
 
-            self.logger.info(
-                "Detected certificate purchase (email=%s, funnel_type=%s, order_id=%s)",
+        for entry in pending_entries:
+            (
+                funnel_entry_id,
                 email,
                 funnel_type,
+                user_id,
+                test_id,
                 order_id,
-            )
+                purchased_at,
+            ) = entry
+
+            if order_id is None or purchased_at is None:
+                continue
+
+            # mysql.connector returns DATETIME columns as datetime objects,
+            # so this check always passes in practice; it is debug-only so
+            # production runs (python -O) skip one call and isinstance per
+            # purchase. A schema change returning strings here is a bug to
+            # surface loudly, not data to coerce.
+            assert isinstance(
+                purchased_at, datetime
+            ), "Unexpected purchased_at value type"
 
             if self.dry_run:
-                self.logger.info(
-                    "Dry run: would update database and Brevo contact for purchase (email=%s, funnel_type=%s, test_id=%s, order_id=%s)",
+                if info_enabled:
+                    log_info(
+                        "Dry run: would update database and Brevo contact for purchase (email=%s, funnel_type=%s, test_id=%s, order_id=%s)",
+                        email,
+                        funnel_type,
+                        test_id,
+                        order_id,
+                    )
+                continue
+
+            # One record per detected purchase instead of separate
+            # detected/updated messages
+            if info_enabled:
+                log_info(
+                    "Detected certificate purchase (email=%s, funnel_type=%s, test_id=%s, order_id=%s)",
                     email,
                     funnel_type,
                     test_id,
                     order_id,
                 )
-            else:
-                try:
-                    self.connection.start_transaction()
-
-                    # Get funnel_entry_id(s) that match this purchase
-                    funnel_entry_ids = self._get_funnel_entry_ids(
-                        email=email,
-                        funnel_type=funnel_type,
-                        test_id=test_id,
-                    )
 
-                    if not funnel_entry_ids:
-                        self.logger.warning(
-                            "No funnel entry found for purchase (email=%s, funnel_type=%s, test_id=%s)",
-                            email,
-                            funnel_type,
-                            test_id,
-                        )
-                        self.connection.rollback()
-                        continue
-
-                    # Update funnel_entries to mark as purchased
-                    mark_certificate_purchased(
-                        connection=self.connection,
-                        email=email,
-                        funnel_type=funnel_type,
-                        test_id=test_id,
-                        purchased_at=purchased_at_datetime,
-                    )
+            purchases.append((email, funnel_type, test_id, purchased_at))
 
-                    # Enqueue Brevo sync job for each affected funnel entry
-                    payload_data = {
-                        "email": email,
-                        "funnel_type": funnel_type,
-                        "purchased_at": purchased_at_datetime.isoformat(),
-                        "attributes": {
-                            "FUNNEL_TYPE": funnel_type,
-                            "CERTIFICATE_PURCHASED": 1,
-                            "CERTIFICATE_PURCHASED_AT": purchased_at_datetime.isoformat(),
-                        },
-                    }
-                    payload_json = json.dumps(payload_data)
-
-                    for funnel_entry_id in funnel_entry_ids:
-                        self.logger.info(
-                            "Enqueuing Brevo sync job for purchase (funnel_entry_id=%s, operation_type=update_after_purchase)",
-                            funnel_entry_id,
-                        )
-                        enqueue_brevo_sync_job(
-                            connection=self.connection,
-                            funnel_entry_id=funnel_entry_id,
-                            operation_type="update_after_purchase",
-                            payload=payload_json,
-                        )
-
-                    self.connection.commit()
-
-                    self.logger.info(
-                        "Successfully processed purchase (email=%s, funnel_type=%s, order_id=%s)",
-                        email,
-                        funnel_type,
-                        order_id,
-                    )
+            purchased_at_iso = purchased_at.isoformat()
 
-                except mysql.connector.Error as e:
-                    self.connection.rollback()
-                    self.logger.error(
-                        "Failed to process purchase (email=%s, funnel_type=%s, order_id=%s): %s",
-                        email,
-                        funnel_type,
-                        order_id,
-                        str(e),
-                    )
-                    raise
+            attributes = self._attributes_template.copy()
+            attributes["FUNNEL_TYPE"] = funnel_type
+            attributes["CERTIFICATE_PURCHASED_AT"] = purchased_at_iso
 
-        self.logger.info("Purchase synchronization finished")
+            payload_data = self._payload_template.copy()
+            payload_data["email"] = email
+            payload_data["funnel_type"] = funnel_type
+            payload_data["purchased_at"] = purchased_at_iso
+            payload_data["attributes"] = attributes
 
-    def _ensure_datetime(self, value: object) -> datetime:
-        """Validates that payment timestamp is a datetime object.
+            payload_json = payload_to_json_bytes(payload_data)
 
-        MySQL connector typically returns datetime objects, but this validation
-        prevents runtime crashes if database schema changes or unexpected data
-        types are returned.
+            outbox_rows.append(
+                (funnel_entry_id, "update_after_purchase", payload_json)
+            )
 
-        Args:
-            value: Payment timestamp from database query.
+        if purchases:
+            try:
+                self.connection.start_transaction()
 
-        Returns:
-            datetime object if validation passes.
+                mark_certificates_purchased_bulk(self.connection, purchases)
 
-        Raises:
-            ValueError: If value is not a datetime object, indicating data
-                integrity issue that requires investigation.
-        """
-        if isinstance(value, datetime):
-            return value
+                self.logger.info(
+                    "Enqueuing %s Brevo sync jobs for purchases",
+                    len(outbox_rows),
+                )
+                enqueue_brevo_sync_jobs_bulk(self.connection, outbox_rows)
 
-        raise ValueError("Unexpected purchased_at value type")
+                self.connection.commit()
 
-    def _get_funnel_entry_ids(
-        self,
-        email: str,
-        funnel_type: str,
-        test_id: Optional[int],
-    ) -> List[int]:
-        """Gets funnel entry IDs that match the given criteria.
+            except mysql.connector.Error as e:
+                self.connection.rollback()
+                self.logger.error(
+                    "Failed to process purchase batch, rolled back: %s",
+                    str(e),
+                )
+                raise
 
-        Args:
-            email: User email address.
-            funnel_type: Funnel type ('language' or 'non_language').
-            test_id: Optional test ID for more specific matching.
+        self.logger.info("Purchase synchronization finished")
 
-        Returns:
-            List of funnel entry IDs that match the criteria.
+        return self._suggest_next_delay()
+
+    def _suggest_next_delay(self) -> float:
+        """Computes the poll delay to suggest after the current run.
+
+        The first _EMPTY_RUNS_BEFORE_BACKOFF empty runs keep the minimum
+        interval (a briefly quiet backlog should not slow detection); each
+        further empty run doubles the delay until the cap.
         """
-        cursor = self.connection.cursor()
-
-        try:
-            if test_id is None:
-                query = """
-                SELECT id
-                FROM funnel_entries
-                WHERE email = %s
-                  AND funnel_type = %s
-                  AND certificate_purchased = 0
-                """
-                params = (email, funnel_type)
-            else:
-                query = """
-                SELECT id
-                FROM funnel_entries
-                WHERE email = %s
-                  AND funnel_type = %s
-                  AND test_id = %s
-                  AND certificate_purchased = 0
-                """
-                params = (email, funnel_type, test_id)  # type: ignore[assignment]
-
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-
-            return [int(row[0]) for row in rows]  # type: ignore[arg-type]
-
-        finally:
-            cursor.close()
+        if self._empty_streak <= _EMPTY_RUNS_BEFORE_BACKOFF:
+            return MIN_POLL_INTERVAL_SECONDS
+
+        doublings = self._empty_streak - _EMPTY_RUNS_BEFORE_BACKOFF
+        return min(
+            MAX_POLL_INTERVAL_SECONDS,
+            MIN_POLL_INTERVAL_SECONDS * (2.0 ** doublings),
+        )
@@ -1,18 +1,15 @@
-import json
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Set, Tuple
 
 import mysql.connector
 from mysql.connector import MySQLConnection
 
 from analytics.tracking import create_funnel_entry
 from brevo.api_client import BrevoApiClient
-from brevo.outbox import enqueue_brevo_sync_job
+from brevo.models import payload_to_json_bytes
+from brevo.outbox import enqueue_brevo_sync_jobs_bulk
 from funnels.models import FunnelCandidate, FunnelType
-from db.selectors import (
-    get_language_test_candidates,
-    get_non_language_test_candidates,
-)
+from db.selectors import get_all_test_candidates
 
 
 class FunnelSyncService:
@@ -53,6 +50,14 @@ class FunnelSyncService:
         self.dry_run = dry_run
         self.logger = logging.getLogger("funnels.sync_service")
 
+        # Candidate keys already processed by this service instance. The
+        # candidate query's anti-join filters out entries recorded in
+        # funnel_entries, so this set mainly absorbs repeats within and
+        # across runs that the database cannot: two simpletest user rows
+        # sharing an email, and NULL test_id keys that the unique index
+        # treats as distinct. Memoizing them skips the insert round-trip.
+        self._seen_candidates: Set[Tuple[str, str, Optional[int]]] = set()
+
     def sync(self, max_rows_per_type: int = 100) -> None:
         """Synchronizes both language and non-language funnels in a single batch.
 
@@ -75,14 +80,24 @@ class FunnelSyncService:
         """
         self.logger.info("Starting funnel synchronization")
 
-        language_rows = get_language_test_candidates(
-            self.connection,
-            limit=max_rows_per_type,
-        )
-        non_language_rows = get_non_language_test_candidates(
+        # Funnels without a configured list id are skipped anyway, so their
+        # candidate arm is excluded from the fused query up front.
+        active_funnel_types = [
+            funnel_type
+            for funnel_type, list_id in (
+                (FunnelType.LANGUAGE, self.language_list_id),
+                (FunnelType.NON_LANGUAGE, self.non_language_list_id),
+            )
+            if list_id > 0
+        ]
+
+        candidate_rows = get_all_test_candidates(
             self.connection,
-            limit=max_rows_per_type,
+            limit_per_type=max_rows_per_type,
+            funnel_types=active_funnel_types,
         )
+        language_rows = candidate_rows[FunnelType.LANGUAGE]
+        non_language_rows = candidate_rows[FunnelType.NON_LANGUAGE]
 
         self.logger.info(
             "Fetched %s language rows and %s non language rows",
@@ -90,38 +105,91 @@ class FunnelSyncService:
             len(non_language_rows),
         )
 
-        self._sync_language_funnel(language_rows)
-        self._sync_non_language_funnel(non_language_rows)
+        # All candidates in a run are written under one transaction with a
+        # single commit at the end, instead of one commit (fsync) per
+        # candidate. On any database error the whole batch is rolled back and
+        # re-processed on the next run; idempotency makes the retry safe.
+        has_writes = not self.dry_run and (
+            (self.language_list_id > 0 and bool(language_rows))
+            or (self.non_language_list_id > 0 and bool(non_language_rows))
+        )
+
+        if not has_writes:
+            self._sync_language_funnel(language_rows)
+            self._sync_non_language_funnel(non_language_rows)
+            self.logger.info("Funnel synchronization finished")
+            return
+
+        try:
+            self.connection.start_transaction()
+
+            outbox_rows = self._sync_language_funnel(language_rows)
+            outbox_rows += self._sync_non_language_funnel(non_language_rows)
+
+            # One executemany INSERT for the whole batch instead of one
+            # round-trip per fresh entry
+            if outbox_rows:
+                self.logger.info(
+                    "Enqueuing %s Brevo sync jobs",
+                    len(outbox_rows),
+                )
+                enqueue_brevo_sync_jobs_bulk(self.connection, outbox_rows)
+
+            self.connection.commit()
+
+        except mysql.connector.Error as e:
+            self.connection.rollback()
+            self.logger.error(
+                "Failed to process candidate batch, rolled back: %s",
+                str(e),
+            )
+            raise
 
         self.logger.info("Funnel synchronization finished")
 
-    def _sync_language_funnel(self, rows: List[Tuple[int, str]]) -> None:
+    def _sync_language_funnel(
+        self,
+        rows: List[Tuple[int, str]],
+    ) -> List[Tuple[int, str, bytes]]:
         if self.language_list_id <= 0:
             self.logger.info(
                 "Language list id is not configured, skipping language funnel",
             )
-            return
+            return []
 
+        outbox_rows = []
         for row in rows:
             candidate = self._map_placeholder_row_to_candidate(
                 row=row,
                 funnel_type=FunnelType.LANGUAGE,
             )
-            self._process_candidate(candidate, self.language_list_id)
+            outbox_row = self._process_candidate(candidate, self.language_list_id)
+            if outbox_row is not None:
+                outbox_rows.append(outbox_row)
+
+        return outbox_rows
 
-    def _sync_non_language_funnel(self, rows: List[Tuple[int, str]]) -> None:
+    def _sync_non_language_funnel(
+        self,
+        rows: List[Tuple[int, str]],
+    ) -> List[Tuple[int, str, bytes]]:
         if self.non_language_list_id <= 0:
             self.logger.info(
                 "Non language list id is not configured, skipping non language funnel",
             )
-            return
+            return []
 
+        outbox_rows = []
         for row in rows:
             candidate = self._map_placeholder_row_to_candidate(
                 row=row,
                 funnel_type=FunnelType.NON_LANGUAGE,
             )
-            self._process_candidate(candidate, self.non_language_list_id)
+            outbox_row = self._process_candidate(candidate, self.non_language_list_id)
+            if outbox_row is not None:
+                outbox_rows.append(outbox_row)
+
+        return outbox_rows
 
     def _map_placeholder_row_to_candidate(
         self,
@@ -157,22 +225,33 @@ class FunnelSyncService:
         self,
         candidate: FunnelCandidate,
         list_id: int,
-    ) -> None:
+    ) -> Optional[Tuple[int, str, bytes]]:
         """Processes a single candidate through the funnel pipeline.
 
         Idempotency is enforced at the database level by create_funnel_entry, which
         handles duplicate entries gracefully via the unique constraint on
         (email, funnel_type, test_id). If a duplicate entry already exists,
-        create_funnel_entry returns None and no outbox job is enqueued.
+        create_funnel_entry returns None and no outbox job is produced.
+        Candidate keys this instance has already processed are additionally
+        memoized in memory and skipped before the insert is even issued.
+
+        Transaction control lives in sync(), which wraps the whole candidate
+        batch in a single transaction; this method only issues the funnel
+        entry write. Outbox jobs are returned as rows so sync() can insert
+        the whole batch with one statement.
 
         Side Effects:
             - In dry-run mode: only logs what would be done without making changes.
-            - In production mode: creates funnel entry and enqueues Brevo sync job
-              in a single atomic transaction.
+            - In production mode: creates funnel entry within the batch
+              transaction opened by sync().
 
         Args:
             candidate: User candidate extracted from test results.
             list_id: Brevo list ID where contact should be added.
+
+        Returns:
+            (funnel_entry_id, operation_type, payload) outbox row for a fresh
+            entry, or None for dry runs and duplicates.
         """
         if self.dry_run:
             self.logger.info(
@@ -187,75 +266,69 @@ class FunnelSyncService:
                 candidate.funnel_type,
                 candidate.test_id,
             )
-            return
-
-        try:
-            self.connection.start_transaction()
+            return None
 
-            self.logger.info(
-                "Creating funnel entry (email=%s, funnel_type=%s)",
-                candidate.email,
-                candidate.funnel_type,
-            )
-
-            funnel_entry_id = create_funnel_entry(
-                connection=self.connection,
-                email=candidate.email,
-                funnel_type=candidate.funnel_type,
-                user_id=candidate.user_id,
-                test_id=candidate.test_id,
-            )
-
-            if funnel_entry_id is None:
-                # Duplicate entry - commit and return without enqueuing outbox job
-                self.connection.commit()
+        candidate_key = (candidate.email, candidate.funnel_type, candidate.test_id)
+        if candidate_key in self._seen_candidates:
+            if self.logger.isEnabledFor(logging.INFO):
                 self.logger.info(
-                    "Duplicate funnel entry detected, skipping (email=%s, funnel_type=%s, test_id=%s)",
+                    "Candidate already processed, skipping (email=%s, funnel_type=%s, test_id=%s)",
                     candidate.email,
                     candidate.funnel_type,
                     candidate.test_id,
                 )
-                return
-
-            # Build JSON payload for Brevo sync job
-            payload_data = {
-                "email": candidate.email,
-                "funnel_type": candidate.funnel_type,
-                "user_id": candidate.user_id,
-                "test_id": candidate.test_id,
-                "list_ids": [list_id],
-                "attributes": {
-                    "FUNNEL_TYPE": candidate.funnel_type,
-                },
-            }
-            payload_json = json.dumps(payload_data)
+            return None
 
+        # Per-candidate detail is guarded so argument tuples are not built
+        # when INFO is disabled; the handlers themselves run on the logging
+        # queue listener's thread.
+        if self.logger.isEnabledFor(logging.INFO):
             self.logger.info(
-                "Enqueuing Brevo sync job (funnel_entry_id=%s, operation_type=upsert_contact)",
-                funnel_entry_id,
+                "Creating funnel entry (email=%s, funnel_type=%s)",
+                candidate.email,
+                candidate.funnel_type,
             )
 
-            enqueue_brevo_sync_job(
-                connection=self.connection,
-                funnel_entry_id=funnel_entry_id,
-                operation_type="upsert_contact",
-                payload=payload_json,
-            )
+        funnel_entry_id = create_funnel_entry(
+            connection=self.connection,
+            email=candidate.email,
+            funnel_type=candidate.funnel_type,
+            user_id=candidate.user_id,
+            test_id=candidate.test_id,
+        )
 
-            self.connection.commit()
+        # Both fresh inserts and database-detected duplicates are memoized:
+        # either way the key is in funnel_entries now.
+        self._seen_candidates.add(candidate_key)
 
+        if funnel_entry_id is None:
+            # Duplicate entry - skip without producing an outbox job
+            self.logger.info(
+                "Duplicate funnel entry detected, skipping (email=%s, funnel_type=%s, test_id=%s)",
+                candidate.email,
+                candidate.funnel_type,
+                candidate.test_id,
+            )
+            return None
+
+        # Build JSON payload for Brevo sync job
+        payload_data = {
+            "email": candidate.email,
+            "funnel_type": candidate.funnel_type,
+            "user_id": candidate.user_id,
+            "test_id": candidate.test_id,
+            "list_ids": [list_id],
+            "attributes": {
+                "FUNNEL_TYPE": candidate.funnel_type,
+            },
+        }
+        payload_json = payload_to_json_bytes(payload_data)
+
+        if self.logger.isEnabledFor(logging.INFO):
             self.logger.info(
                 "Successfully processed candidate (email=%s, funnel_entry_id=%s)",
                 candidate.email,
                 funnel_entry_id,
             )
 
-        except mysql.connector.Error as e:
-            self.connection.rollback()
-            self.logger.error(
-                "Failed to process candidate (email=%s, funnel_type=%s): %s",
-                candidate.email,
-                candidate.funnel_type,
-                str(e),
-            )
-            raise
+        return (funnel_entry_id, "upsert_contact", payload_json)
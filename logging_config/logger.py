@@ -1,10 +1,42 @@
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from typing import Optional
 
+# Listener thread that owns the real handlers. Module-level so a repeated
+# configure_logging call replaces it instead of leaking threads, and so the
+# atexit hook can flush it on shutdown.
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_queue_listener() -> None:
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
 
 def configure_logging(log_level: str, logs_directory: Optional[str] = None) -> None:
+    """Configures root logging with handlers running on a background thread.
+
+    The root logger gets only a QueueHandler, so a log call on the hot path
+    costs one queue put; formatting, console writes, and rotating-file I/O
+    all happen on the QueueListener's thread. The listener is flushed and
+    stopped at interpreter exit.
+
+    Args:
+        log_level: Root log level name (e.g. "INFO").
+        logs_directory: Directory for the rotating app.log file. Defaults to
+            ./logs under the current working directory.
+    """
+    global _queue_listener
+
     if logs_directory is None:
         logs_directory = os.path.join(os.getcwd(), "logs")
 
@@ -23,7 +55,6 @@ def configure_logging(log_level: str, logs_directory: Optional[str] = None) -> N
 
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(log_formatter)
-    root_logger.addHandler(console_handler)
 
     file_handler = logging.handlers.RotatingFileHandler(
         filename=log_file_path,
@@ -32,4 +63,15 @@ def configure_logging(log_level: str, logs_directory: Optional[str] = None) -> N
         encoding="utf-8",
     )
     file_handler.setFormatter(log_formatter)
-    root_logger.addHandler(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _stop_queue_listener()
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        respect_handler_level=True,
+    )
+    _queue_listener.start()
@@ -18,6 +18,29 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 
+def _server_version_tuple(version: str) -> tuple[int, ...]:
+    """Parses a MySQL VERSION() string into a comparable tuple.
+
+    Suffixes like "-log" or "-MariaDB" are ignored; only the leading numeric
+    dotted part matters for feature detection.
+
+    Args:
+        version: Raw value returned by SELECT VERSION().
+
+    Returns:
+        Tuple of integer version components, e.g. (8, 0, 36).
+    """
+    numeric_part = version.split("-", 1)[0]
+
+    components = []
+    for piece in numeric_part.split("."):
+        if not piece.isdigit():
+            break
+        components.append(int(piece))
+
+    return tuple(components)
+
+
 def init_test_database() -> None:
     """Initialize test database and user for integration tests.
 
@@ -91,35 +114,35 @@ def init_test_database() -> None:
         cursor.execute(create_db_query)
         print(f"Database '{test_db_name}' created or already exists")
 
-        # Create test user if it does not exist
-        # MySQL 8.0+ supports CREATE USER IF NOT EXISTS, but we handle errors for compatibility
-        create_user_query = (
-            f"CREATE USER IF NOT EXISTS '{test_db_user}'@'%' "
-            f"IDENTIFIED BY '{test_db_password}'"
-        )
-        try:
-            cursor.execute(create_user_query)
+        # Create test user if it does not exist. The DDL path is picked once
+        # from the server version instead of probing with exceptions and
+        # string-matching the error messages: CREATE USER IF NOT EXISTS
+        # exists since MySQL 5.7.6, older servers get an existence check
+        # against mysql.user first.
+        cursor.execute("SELECT VERSION()")
+        server_version = _server_version_tuple(cursor.fetchone()[0])
+
+        if server_version >= (5, 7, 6):
+            cursor.execute(
+                f"CREATE USER IF NOT EXISTS '{test_db_user}'@'%' "
+                f"IDENTIFIED BY '{test_db_password}'"
+            )
             print(f"User '{test_db_user}' created or already exists")
-        except mysql.connector.Error as e:
-            # If CREATE USER IF NOT EXISTS is not supported, try without IF NOT EXISTS
-            # and ignore "user already exists" errors
-            error_msg = str(e).lower()
-            if "if not exists" in error_msg or "syntax" in error_msg:
-                # Try without IF NOT EXISTS
-                create_user_query_alt = (
+        else:
+            # The literal % in the host pattern is doubled because the driver
+            # runs printf-style substitution over parametrized queries.
+            cursor.execute(
+                "SELECT 1 FROM mysql.user WHERE user = %s AND host = '%%'",
+                (test_db_user,),
+            )
+            if cursor.fetchone() is None:
+                cursor.execute(
                     f"CREATE USER '{test_db_user}'@'%' "
                     f"IDENTIFIED BY '{test_db_password}'"
                 )
-                try:
-                    cursor.execute(create_user_query_alt)
-                    print(f"User '{test_db_user}' created")
-                except mysql.connector.Error as e2:
-                    error_msg2 = str(e2).lower()
-                    if "already exists" not in error_msg2:
-                        raise
-                    print(f"User '{test_db_user}' already exists")
-            elif "already exists" not in error_msg:
-                raise
+                print(f"User '{test_db_user}' created")
+            else:
+                print(f"User '{test_db_user}' already exists")
 
         # Grant ALL PRIVILEGES on the test database to the test user
         grant_query = f"GRANT ALL PRIVILEGES ON {test_db_name}.* TO '{test_db_user}'@'%'"
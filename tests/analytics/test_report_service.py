@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from contextlib import contextmanager
 from unittest.mock import MagicMock
 
@@ -11,6 +11,8 @@ class DummyConnection:
 
 
 def test_generate_conversion_report_builds_funnel_conversions(monkeypatch):
+    report_service._report_cache.clear()
+
     dummy_rows = [
         ("language", 10, 3),
         ("non_language", 5, 0),
@@ -18,10 +20,10 @@ def test_generate_conversion_report_builds_funnel_conversions(monkeypatch):
 
     dummy_conn = DummyConnection()
 
-    def fake_get_funnel_conversion_summary(connection, from_date, to_date):
+    def fake_get_funnel_conversion_summary_daily(connection, from_day, to_day):
         assert isinstance(connection, DummyConnection)
-        assert from_date == datetime(2024, 1, 1)
-        assert to_date == datetime(2024, 12, 31)
+        assert from_day == date(2024, 1, 1)
+        assert to_day == date(2024, 12, 31)
         return dummy_rows
 
     @contextmanager
@@ -35,8 +37,8 @@ def test_generate_conversion_report_builds_funnel_conversions(monkeypatch):
 
     monkeypatch.setattr(
         report_service,
-        "get_funnel_conversion_summary",
-        fake_get_funnel_conversion_summary,
+        "get_funnel_conversion_summary_daily",
+        fake_get_funnel_conversion_summary_daily,
     )
     monkeypatch.setattr(
         report_service,
@@ -70,3 +72,103 @@ def test_generate_conversion_report_builds_funnel_conversions(monkeypatch):
     assert non_language_item.total_entries == 5
     assert non_language_item.total_purchased == 0
     assert non_language_item.conversion_rate == 0.0
+
+
+def test_generate_conversion_report_falls_back_when_rollup_is_empty(monkeypatch):
+    report_service._report_cache.clear()
+
+    fallback_calls = []
+
+    def fake_get_funnel_conversion_summary_daily(connection, from_day, to_day):
+        # Simulates a deployment whose funnel_daily_stats was never backfilled
+        return []
+
+    def fake_get_funnel_conversion_summary(connection, from_date, to_date):
+        fallback_calls.append((from_date, to_date))
+        return [("language", 10, 3)]
+
+    @contextmanager
+    def fake_database_connection_scope(database_settings):
+        yield DummyConnection()
+
+    monkeypatch.setattr(
+        report_service,
+        "get_funnel_conversion_summary_daily",
+        fake_get_funnel_conversion_summary_daily,
+    )
+    monkeypatch.setattr(
+        report_service,
+        "get_funnel_conversion_summary",
+        fake_get_funnel_conversion_summary,
+    )
+    monkeypatch.setattr(
+        report_service,
+        "database_connection_scope",
+        fake_database_connection_scope,
+    )
+    monkeypatch.setattr(report_service, "load_settings", lambda: MagicMock())
+
+    report = generate_conversion_report(
+        from_date=datetime(2024, 1, 1),
+        to_date=datetime(2024, 12, 31),
+    )
+
+    # The empty rollup falls back to aggregating funnel_entries directly
+    assert len(fallback_calls) == 1
+    assert len(report) == 1
+    assert report[0].funnel_type == "language"
+    assert report[0].total_entries == 10
+
+
+def test_generate_conversion_report_caches_results_until_write(monkeypatch):
+    report_service._report_cache.clear()
+
+    query_calls = []
+    write_generation_value = 7
+
+    def fake_get_funnel_conversion_summary_daily(connection, from_day, to_day):
+        query_calls.append((from_day, to_day))
+        return [("language", 10, 3)]
+
+    @contextmanager
+    def fake_database_connection_scope(database_settings):
+        yield DummyConnection()
+
+    monkeypatch.setattr(
+        report_service,
+        "get_funnel_conversion_summary_daily",
+        fake_get_funnel_conversion_summary_daily,
+    )
+    monkeypatch.setattr(
+        report_service,
+        "database_connection_scope",
+        fake_database_connection_scope,
+    )
+    monkeypatch.setattr(report_service, "load_settings", lambda: MagicMock())
+    monkeypatch.setattr(
+        report_service, "write_generation", lambda: write_generation_value
+    )
+
+    first = report_service.generate_conversion_report(
+        from_date=datetime(2024, 1, 1),
+        to_date=datetime(2024, 12, 31),
+    )
+    second = report_service.generate_conversion_report(
+        from_date=datetime(2024, 1, 1),
+        to_date=datetime(2024, 12, 31),
+    )
+
+    # Second call with identical bounds is served from the cache
+    assert second is first
+    assert len(query_calls) == 1
+
+    # A funnel_entries write bumps the generation and invalidates the cache
+    write_generation_value = 8
+
+    third = report_service.generate_conversion_report(
+        from_date=datetime(2024, 1, 1),
+        to_date=datetime(2024, 12, 31),
+    )
+
+    assert third is not first
+    assert len(query_calls) == 2
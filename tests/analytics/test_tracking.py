@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import MagicMock
 
 import mysql.connector
 import pytest
@@ -6,84 +7,101 @@ import pytest
 from analytics import tracking
 
 
-class DummyCursor:
-    def __init__(self):
-        self.executed_queries = []
-        self.fetchone_result: tuple | None = None
-        self.close_calls = 0
-        self.lastrowid = 42
+# MagicMock fixtures replace the hand-rolled DummyCursor/DummyConnection
+# classes: call recording (call_args_list, call_count) comes for free instead
+# of being re-implemented per method. The mocks are unspecced because
+# conftest.py swaps mysql.connector for a mock module, so the real driver
+# classes are not importable here to spec against.
 
-    def execute(self, query, params=None):
-        self.executed_queries.append((query, params))
 
-    def fetchone(self):
-        return self.fetchone_result
+# Expected SQL shapes are precomputed token sets checked in one pass per
+# query instead of a chain of separate substring asserts.
 
-    def close(self):
-        self.close_calls += 1
+# datetime is immutable, so one shared timestamp serves every purchase test.
+_PURCHASED_AT = datetime(2025, 1, 1, 12, 0, 0)
 
+_ENTRY_UPSERT_TOKENS = frozenset(
+    {"INSERT INTO funnel_entries", "ON DUPLICATE KEY UPDATE"}
+)
+_STATS_ENTRY_BUMP_TOKENS = frozenset(
+    {"INSERT INTO funnel_daily_stats", "entries = entries + 1"}
+)
+_STATS_TODAY_REFRESH_TOKENS = frozenset(
+    {"INSERT INTO funnel_daily_stats", "entered_at >= CURRENT_DATE()"}
+)
+_PURCHASE_UPDATE_TOKENS = frozenset(
+    {"UPDATE funnel_entries", "WHERE email = %s", "AND funnel_type = %s"}
+)
+_PURCHASE_UPDATE_BULK_TOKENS = frozenset(
+    {"UPDATE funnel_entries", "email IN (%s, %s)", "test_id <=> %s"}
+)
 
-class DummyConnection:
-    def __init__(self, cursor):
-        self._cursor = cursor
-        self.commits = 0
-        self.rollbacks = 0
 
-    def cursor(self):
-        return self._cursor
+def _assert_contains(query: str, tokens: frozenset) -> None:
+    missing = [token for token in tokens if token not in query]
+    assert not missing, f"Query is missing expected fragments: {missing}"
 
-    def commit(self):
-        self.commits += 1
 
-    def rollback(self):
-        self.rollbacks += 1
+@pytest.fixture
+def cursor() -> MagicMock:
+    cursor = MagicMock()
+    cursor.lastrowid = 42
+    cursor.rowcount = 1
+    cursor.fetchone.return_value = None
+    return cursor
 
 
-def test_funnel_entry_exists_returns_false_when_no_row():
-    cursor = DummyCursor()
-    cursor.fetchone_result = None
-    connection = DummyConnection(cursor)
+@pytest.fixture
+def connection(cursor: MagicMock) -> MagicMock:
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    # Pre-seeded so the prepared-cursor cache helper finds a real dict here
+    # instead of an auto-created mock attribute
+    connection._prepared_cursors = {}
+    return connection
+
+
+def test_funnel_entry_exists_returns_false_when_no_row(cursor, connection):
+    cursor.fetchone.return_value = None
 
     result = tracking.funnel_entry_exists(
-        connection=connection,  # type: ignore[arg-type]
+        connection=connection,
         email="user@example.com",
         funnel_type="language",
         test_id=None,
     )
 
     assert result is False
-    assert len(cursor.executed_queries) == 1
-    query, params = cursor.executed_queries[0]
+    assert cursor.execute.call_count == 1
+    query, params = cursor.execute.call_args.args
     assert "FROM funnel_entries" in query
     assert params == ("user@example.com", "language")
 
 
-def test_funnel_entry_exists_returns_true_when_row_found_with_test_id():
-    cursor = DummyCursor()
-    cursor.fetchone_result = (1,)
-    connection = DummyConnection(cursor)
+def test_funnel_entry_exists_returns_true_when_row_found_with_test_id(
+    cursor, connection
+):
+    cursor.fetchone.return_value = (1,)
 
     result = tracking.funnel_entry_exists(
-        connection=connection,  # type: ignore[arg-type]
+        connection=connection,
         email="user@example.com",
         funnel_type="language",
         test_id=42,
     )
 
     assert result is True
-    assert len(cursor.executed_queries) == 1
-    query, params = cursor.executed_queries[0]
+    assert cursor.execute.call_count == 1
+    query, params = cursor.execute.call_args.args
     assert "AND test_id = %s" in query
     assert params == ("user@example.com", "language", 42)
 
 
-def test_create_funnel_entry_inserts_and_returns_id():
-    cursor = DummyCursor()
+def test_create_funnel_entry_inserts_and_returns_id(cursor, connection):
     cursor.lastrowid = 123
-    connection = DummyConnection(cursor)
 
     result = tracking.create_funnel_entry(
-        connection=connection,  # type: ignore[arg-type]
+        connection=connection,
         email="user@example.com",
         funnel_type="language",
         user_id=10,
@@ -93,31 +111,50 @@ def test_create_funnel_entry_inserts_and_returns_id():
     # Should return the new row ID
     assert result == 123
     # Should not call commit or rollback (transaction control is caller's responsibility)
-    assert connection.commits == 0
-    assert connection.rollbacks == 0
-    assert cursor.close_calls == 1
-    assert len(cursor.executed_queries) == 1
-    query, params = cursor.executed_queries[0]
-    assert "INSERT INTO funnel_entries" in query
+    assert connection.commit.call_count == 0
+    assert connection.rollback.call_count == 0
+    # Prepared cursors are cached on the connection and not closed per call
+    assert cursor.close.call_count == 0
+    # Entry insert plus the funnel_daily_stats rollup bump
+    assert cursor.execute.call_count == 2
+    query, params = cursor.execute.call_args_list[0].args
+    _assert_contains(query, _ENTRY_UPSERT_TOKENS)
     assert params[0] == "user@example.com"
     assert params[1] == "language"
     assert params[2] == 10
     assert params[3] == 42
+    stats_query, stats_params = cursor.execute.call_args_list[1].args
+    _assert_contains(stats_query, _STATS_ENTRY_BUMP_TOKENS)
+    assert stats_params == ("language",)
 
 
-def test_create_funnel_entry_handles_duplicate_gracefully():
-    """Test that create_funnel_entry handles IntegrityError for duplicate entries."""
-    cursor = DummyCursor()
+def test_create_funnel_entry_returns_none_for_duplicate_rowcount(cursor, connection):
+    """Test that a duplicate hitting the unique key (rowcount != 1) returns None."""
+    cursor.rowcount = 0
 
-    def execute_raises_integrity_error(query, params=None):
-        raise mysql.connector.IntegrityError("Duplicate entry")
+    result = tracking.create_funnel_entry(
+        connection=connection,
+        email="user@example.com",
+        funnel_type="language",
+        user_id=10,
+        test_id=42,
+    )
+
+    # Should return None to indicate no new row was created
+    assert result is None
+    # Should not call commit or rollback (transaction control is caller's responsibility)
+    assert connection.commit.call_count == 0
+    assert connection.rollback.call_count == 0
+    assert cursor.close.call_count == 0
 
-    cursor.execute = execute_raises_integrity_error
-    connection = DummyConnection(cursor)
+
+def test_create_funnel_entry_handles_duplicate_gracefully(cursor, connection):
+    """Test that create_funnel_entry handles IntegrityError for duplicate entries."""
+    cursor.execute.side_effect = mysql.connector.IntegrityError("Duplicate entry")
 
     # Should not raise an exception, should return None
     result = tracking.create_funnel_entry(
-        connection=connection,  # type: ignore[arg-type]
+        connection=connection,
         email="user@example.com",
         funnel_type="language",
         user_id=10,
@@ -127,25 +164,19 @@ def test_create_funnel_entry_handles_duplicate_gracefully():
     # Should return None to indicate no new row was created
     assert result is None
     # Should not call commit or rollback (transaction control is caller's responsibility)
-    assert connection.rollbacks == 0
-    assert connection.commits == 0
-    assert cursor.close_calls == 1
+    assert connection.rollback.call_count == 0
+    assert connection.commit.call_count == 0
+    assert cursor.close.call_count == 0
 
 
-def test_create_funnel_entry_propagates_other_errors():
+def test_create_funnel_entry_propagates_other_errors(cursor, connection):
     """Test that create_funnel_entry propagates non-IntegrityError exceptions."""
-    cursor = DummyCursor()
-
-    def execute_raises_other_error(query, params=None):
-        raise mysql.connector.Error("Connection lost")
+    cursor.execute.side_effect = mysql.connector.Error("Connection lost")
 
-    cursor.execute = execute_raises_other_error
-    connection = DummyConnection(cursor)
-
-    # Should raise the exception
-    with pytest.raises(mysql.connector.Error):
+    # Should raise the exception; match verifies the message in the same step
+    with pytest.raises(mysql.connector.Error, match="Connection lost"):
         tracking.create_funnel_entry(
-            connection=connection,  # type: ignore[arg-type]
+            connection=connection,
             email="user@example.com",
             funnel_type="language",
             user_id=10,
@@ -153,19 +184,55 @@ def test_create_funnel_entry_propagates_other_errors():
         )
 
     # Should not commit or rollback (transaction control is caller's responsibility)
-    # Cursor should still be closed in finally block
-    assert connection.commits == 0
-    assert connection.rollbacks == 0
-    assert cursor.close_calls == 1
+    assert connection.commit.call_count == 0
+    assert connection.rollback.call_count == 0
+    assert cursor.close.call_count == 0
+
+
+def test_create_funnel_entries_bulk_inserts_all_rows_in_one_statement(
+    cursor, connection
+):
+    rows = [
+        ("first@example.com", "language", 10, 42),
+        ("second@example.com", "language", 11, 43),
+    ]
+
+    result = tracking.create_funnel_entries_bulk(
+        connection=connection,
+        rows=rows,
+    )
+
+    assert result == 2
+    # Should not call commit or rollback (transaction control is caller's responsibility)
+    assert connection.commit.call_count == 0
+    assert connection.rollback.call_count == 0
+    assert cursor.close.call_count == 1
+    # Batch insert plus the funnel_daily_stats refresh for today
+    assert cursor.executemany.call_count == 1
+    assert cursor.execute.call_count == 1
+    query, seq_params = cursor.executemany.call_args.args
+    _assert_contains(query, _ENTRY_UPSERT_TOKENS)
+    assert seq_params == rows
+    stats_query = cursor.execute.call_args.args[0]
+    _assert_contains(stats_query, _STATS_TODAY_REFRESH_TOKENS)
+
+
+def test_create_funnel_entries_bulk_skips_query_for_empty_batch(cursor, connection):
+    result = tracking.create_funnel_entries_bulk(
+        connection=connection,
+        rows=[],
+    )
 
+    assert result == 0
+    assert cursor.execute.call_count == 0
+    assert cursor.executemany.call_count == 0
 
-def test_mark_certificate_purchased_without_test_id_updates():
-    cursor = DummyCursor()
-    connection = DummyConnection(cursor)
-    purchased_at = datetime(2025, 1, 1, 12, 0, 0)
+
+def test_mark_certificate_purchased_without_test_id_updates(cursor, connection):
+    purchased_at = _PURCHASED_AT
 
     tracking.mark_certificate_purchased(
-        connection=connection,  # type: ignore[arg-type]
+        connection=connection,
         email="user@example.com",
         funnel_type="language",
         test_id=None,
@@ -173,24 +240,26 @@ def test_mark_certificate_purchased_without_test_id_updates():
     )
 
     # Should not call commit (transaction control is caller's responsibility)
-    assert connection.commits == 0
-    assert cursor.close_calls == 1
-    assert len(cursor.executed_queries) == 1
-    query, params = cursor.executed_queries[0]
-    assert "UPDATE funnel_entries" in query
-    assert "WHERE email = %s" in query
-    assert "AND funnel_type = %s" in query
+    assert connection.commit.call_count == 0
+    # Prepared cursors are cached on the connection and not closed per call
+    assert cursor.close.call_count == 0
+    # Rollup purchase bump runs before the flag flip
+    assert cursor.execute.call_count == 2
+    stats_query, stats_params = cursor.execute.call_args_list[0].args
+    assert "INSERT INTO funnel_daily_stats" in stats_query
+    assert "purchases = purchases + VALUES(purchases)" in stats_query
+    assert stats_params == ("user@example.com", "language")
+    query, params = cursor.execute.call_args_list[1].args
+    _assert_contains(query, _PURCHASE_UPDATE_TOKENS)
     assert "AND test_id = %s" not in query
     assert params == (purchased_at, "user@example.com", "language")
 
 
-def test_mark_certificate_purchased_with_test_id_updates():
-    cursor = DummyCursor()
-    connection = DummyConnection(cursor)
-    purchased_at = datetime(2025, 1, 1, 12, 0, 0)
+def test_mark_certificate_purchased_with_test_id_updates(cursor, connection):
+    purchased_at = _PURCHASED_AT
 
     tracking.mark_certificate_purchased(
-        connection=connection,  # type: ignore[arg-type]
+        connection=connection,
         email="user@example.com",
         funnel_type="language",
         test_id=42,
@@ -198,10 +267,90 @@ def test_mark_certificate_purchased_with_test_id_updates():
     )
 
     # Should not call commit (transaction control is caller's responsibility)
-    assert connection.commits == 0
-    assert cursor.close_calls == 1
-    assert len(cursor.executed_queries) == 1
-    query, params = cursor.executed_queries[0]
-    assert "UPDATE funnel_entries" in query
-    assert "AND test_id = %s" in query
+    assert connection.commit.call_count == 0
+    assert cursor.close.call_count == 0
+    # Rollup purchase bump runs before the flag flip
+    assert cursor.execute.call_count == 2
+    stats_query, stats_params = cursor.execute.call_args_list[0].args
+    assert "INSERT INTO funnel_daily_stats" in stats_query
+    assert stats_params == ("user@example.com", "language", 42)
+    query, params = cursor.execute.call_args_list[1].args
+    _assert_contains(query, _PURCHASE_UPDATE_TOKENS | {"AND test_id = %s"})
     assert params == (purchased_at, "user@example.com", "language", 42)
+
+
+def test_mark_certificates_purchased_bulk_updates_one_query_per_group(
+    cursor, connection
+):
+    purchased_at = _PURCHASED_AT
+
+    purchases = [
+        ("first@example.com", "language", 42, purchased_at),
+        ("second@example.com", "language", 42, purchased_at),
+        ("third@example.com", "non_language", None, purchased_at),
+    ]
+
+    tracking.mark_certificates_purchased_bulk(
+        connection=connection,
+        purchases=purchases,
+    )
+
+    # Should not call commit (transaction control is caller's responsibility)
+    assert connection.commit.call_count == 0
+    assert cursor.close.call_count == 1
+    # One rollup bump plus one UPDATE per (funnel_type, test_id) group
+    assert cursor.execute.call_count == 4
+
+    language_stats_query, language_stats_params = cursor.execute.call_args_list[0].args
+    assert "INSERT INTO funnel_daily_stats" in language_stats_query
+    assert "email IN (%s, %s)" in language_stats_query
+    assert language_stats_params == (
+        "first@example.com",
+        "second@example.com",
+        "language",
+        42,
+    )
+
+    language_query, language_params = cursor.execute.call_args_list[1].args
+    _assert_contains(language_query, _PURCHASE_UPDATE_BULK_TOKENS)
+    assert language_params == (
+        "first@example.com",
+        purchased_at,
+        "second@example.com",
+        purchased_at,
+        "first@example.com",
+        "second@example.com",
+        "language",
+        42,
+    )
+
+    non_language_stats_query, non_language_stats_params = cursor.execute.call_args_list[
+        2
+    ].args
+    assert "INSERT INTO funnel_daily_stats" in non_language_stats_query
+    assert non_language_stats_params == (
+        "third@example.com",
+        "non_language",
+        None,
+    )
+
+    non_language_query, non_language_params = cursor.execute.call_args_list[3].args
+    assert "email IN (%s)" in non_language_query
+    assert non_language_params == (
+        "third@example.com",
+        purchased_at,
+        "third@example.com",
+        "non_language",
+        None,
+    )
+
+
+def test_mark_certificates_purchased_bulk_skips_query_for_empty_batch(
+    cursor, connection
+):
+    tracking.mark_certificates_purchased_bulk(
+        connection=connection,
+        purchases=[],
+    )
+
+    assert cursor.execute.call_count == 0
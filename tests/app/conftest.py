@@ -0,0 +1,52 @@
+"""Shared settings fakes for the app.main tests.
+
+The dummy settings are frozen slotted dataclasses built once per session:
+main() only reads them, so every test can share one instance, and tests
+needing a variant derive one with dataclasses.replace instead of mutating
+the shared object.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+
+
+@dataclass(frozen=True, slots=True)
+class DummyApplicationSettings:
+    environment: str = "test"
+    dry_run: bool = True
+    log_level: str = "INFO"
+
+
+@dataclass(frozen=True, slots=True)
+class DummyDatabaseSettings:
+    host: str = "localhost"
+
+
+@dataclass(frozen=True, slots=True)
+class DummyBrevoSettings:
+    api_key: str = "test-key"
+    base_url: str = "https://api.brevo.com/v3"
+    language_tests_list_id: int = 4
+    non_language_tests_list_id: int = 5
+
+
+@dataclass(frozen=True, slots=True)
+class DummySentrySettings:
+    dsn: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DummySettings:
+    application: DummyApplicationSettings = field(
+        default_factory=DummyApplicationSettings
+    )
+    database: DummyDatabaseSettings = field(default_factory=DummyDatabaseSettings)
+    brevo: DummyBrevoSettings = field(default_factory=DummyBrevoSettings)
+    sentry: DummySentrySettings = field(default_factory=DummySentrySettings)
+
+
+@pytest.fixture(scope="session")
+def default_settings() -> DummySettings:
+    return DummySettings()
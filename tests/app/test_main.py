@@ -1,4 +1,5 @@
 from contextlib import contextmanager
+from dataclasses import replace
 from typing import Optional
 from unittest.mock import MagicMock
 
@@ -9,51 +10,32 @@ import sentry_sdk
 from app import main as app_main
 
 
-class DummyApplicationSettings:
-    def __init__(self) -> None:
-        self.environment = "test"
-        self.dry_run = True
-        self.log_level = "INFO"
-
-
-class DummyDatabaseSettings:
-    def __init__(self) -> None:
-        self.host = "localhost"
-
-
-class DummyBrevoSettings:
-    def __init__(self) -> None:
-        self.api_key = "test-key"
-        self.base_url = "https://api.brevo.com/v3"
-        self.language_tests_list_id = 4
-        self.non_language_tests_list_id = 5
-
-
-class DummySentrySettings:
-    def __init__(self) -> None:
-        self.dsn = None
-
-
-class DummySettings:
-    def __init__(self) -> None:
-        self.application = DummyApplicationSettings()
-        self.database = DummyDatabaseSettings()
-        self.brevo = DummyBrevoSettings()
-        self.sentry = DummySentrySettings()
-
-
 class DummyConnection:
-    pass
+    __slots__ = ()
 
 
 class FakeBrevoApiClient:
+    __slots__ = ("api_key", "base_url", "dry_run", "close_calls")
+
     def __init__(self, api_key: str, base_url: str, dry_run: bool) -> None:
         self.api_key = api_key
         self.base_url = base_url
         self.dry_run = dry_run
+        self.close_calls = 0
+
+    def close(self) -> None:
+        self.close_calls += 1
 
 
 class FakeFunnelSyncService:
+    __slots__ = (
+        "connection",
+        "brevo_client",
+        "language_list_id",
+        "non_language_list_id",
+        "sync_called_with",
+    )
+
     def __init__(
         self,
         connection: DummyConnection,
@@ -72,6 +54,8 @@ class FakeFunnelSyncService:
 
 
 class FakePurchaseSyncService:
+    __slots__ = ("connection", "brevo_client", "sync_called_with")
+
     def __init__(
         self, connection: DummyConnection, brevo_client: FakeBrevoApiClient, dry_run=False
     ) -> None:
@@ -88,16 +72,28 @@ def fake_database_connection_scope(database_settings):
     yield DummyConnection()
 
 
-def test_main_runs_full_cycle_with_configured_lists(monkeypatch) -> None:
-    settings = DummySettings()
-    funnel_service_instances = []
-    purchase_service_instances = []
+class AppMainFakes:
+    """Recorded state for one patched run of app_main.main.
+
+    The settings attribute is what the patched load_settings returns; tests
+    needing a variant reassign it before calling main().
+    """
+
+    def __init__(self, settings) -> None:
+        self.settings = settings
+        self.funnel_instances: list = []
+        self.purchase_instances: list = []
 
-    def fake_load_settings():
-        return settings
 
-    def fake_configure_logging(log_level: str) -> None:
-        return None
+@pytest.fixture
+def app_main_fakes(monkeypatch, default_settings) -> AppMainFakes:
+    """Installs all app_main collaborator fakes in one place.
+
+    Bundles the six monkeypatch targets every test was repeating into a
+    single fixture and hands back the recording lists, so tests only state
+    their assertions.
+    """
+    fakes = AppMainFakes(default_settings)
 
     def fake_funnel_service_factory(
         connection, brevo_client, language_list_id, non_language_list_id, dry_run=False
@@ -105,30 +101,36 @@ def test_main_runs_full_cycle_with_configured_lists(monkeypatch) -> None:
         instance = FakeFunnelSyncService(
             connection, brevo_client, language_list_id, non_language_list_id
         )
-        funnel_service_instances.append(instance)
+        fakes.funnel_instances.append(instance)
         return instance
 
     def fake_purchase_service_factory(connection, brevo_client, dry_run=False):
         instance = FakePurchaseSyncService(connection, brevo_client, dry_run)
-        purchase_service_instances.append(instance)
+        fakes.purchase_instances.append(instance)
         return instance
 
-    monkeypatch.setattr(app_main, "load_settings", fake_load_settings)
-    monkeypatch.setattr(app_main, "configure_logging", fake_configure_logging)
-    monkeypatch.setattr(
-        app_main, "database_connection_scope", fake_database_connection_scope
-    )
-    monkeypatch.setattr(app_main, "BrevoApiClient", FakeBrevoApiClient)
-    monkeypatch.setattr(app_main, "FunnelSyncService", fake_funnel_service_factory)
-    monkeypatch.setattr(app_main, "PurchaseSyncService", fake_purchase_service_factory)
+    patches = {
+        "load_settings": lambda: fakes.settings,
+        "configure_logging": lambda log_level: None,
+        "database_connection_scope": fake_database_connection_scope,
+        "BrevoApiClient": FakeBrevoApiClient,
+        "FunnelSyncService": fake_funnel_service_factory,
+        "PurchaseSyncService": fake_purchase_service_factory,
+    }
+    for name, obj in patches.items():
+        monkeypatch.setattr(app_main, name, obj)
+
+    return fakes
+
 
+def test_main_runs_full_cycle_with_configured_lists(app_main_fakes) -> None:
     app_main.main()
 
-    assert len(funnel_service_instances) == 1
-    assert len(purchase_service_instances) == 1
+    assert len(app_main_fakes.funnel_instances) == 1
+    assert len(app_main_fakes.purchase_instances) == 1
 
-    funnel_service = funnel_service_instances[0]
-    purchase_service = purchase_service_instances[0]
+    funnel_service = app_main_fakes.funnel_instances[0]
+    purchase_service = app_main_fakes.purchase_instances[0]
 
     assert funnel_service.language_list_id == 4
     assert funnel_service.non_language_list_id == 5
@@ -136,58 +138,41 @@ def test_main_runs_full_cycle_with_configured_lists(monkeypatch) -> None:
     assert purchase_service.sync_called_with == 100
 
 
-def test_main_exits_early_when_lists_not_configured(monkeypatch) -> None:
-    settings = DummySettings()
-    settings.brevo.language_tests_list_id = 0
-    settings.brevo.non_language_tests_list_id = 0
-
-    funnel_service_instances = []
-    purchase_service_instances = []
-
-    def fake_load_settings():
-        return settings
-
-    def fake_configure_logging(log_level: str) -> None:
-        return None
-
-    monkeypatch.setattr(app_main, "load_settings", fake_load_settings)
-    monkeypatch.setattr(app_main, "configure_logging", fake_configure_logging)
-    monkeypatch.setattr(
-        app_main, "database_connection_scope", fake_database_connection_scope
-    )
-    monkeypatch.setattr(app_main, "BrevoApiClient", FakeBrevoApiClient)
-    monkeypatch.setattr(
-        app_main,
-        "FunnelSyncService",
-        lambda *args, **kwargs: funnel_service_instances.append(args),
-    )
-    monkeypatch.setattr(
-        app_main,
-        "PurchaseSyncService",
-        lambda *args, **kwargs: purchase_service_instances.append(args),
+# Early exit requires both list ids to be unset: a single configured funnel
+# must still run, so only both-non-positive combinations are parametrized.
+@pytest.mark.parametrize(
+    "language_list_id,non_language_list_id",
+    [(0, 0), (0, -1), (-1, 0)],
+)
+def test_main_exits_early_when_lists_not_configured(
+    app_main_fakes, language_list_id, non_language_list_id
+) -> None:
+    # Variants are derived with replace() so the shared session-scoped
+    # settings instance is never mutated
+    app_main_fakes.settings = replace(
+        app_main_fakes.settings,
+        brevo=replace(
+            app_main_fakes.settings.brevo,
+            language_tests_list_id=language_list_id,
+            non_language_tests_list_id=non_language_list_id,
+        ),
     )
 
     app_main.main()
 
-    assert funnel_service_instances == []
-    assert purchase_service_instances == []
+    assert app_main_fakes.funnel_instances == []
+    assert app_main_fakes.purchase_instances == []
 
 
-def test_main_handles_exception_and_exits_with_code_1(monkeypatch) -> None:
+def test_main_handles_exception_and_exits_with_code_1(
+    monkeypatch, app_main_fakes
+) -> None:
     sentry_calls = []
     logger_calls = []
 
     mock_logger = MagicMock()
     mock_logger.critical = lambda *args, **kwargs: logger_calls.append((args, kwargs))
 
-    settings = DummySettings()
-
-    def fake_load_settings():
-        return settings
-
-    def fake_configure_logging(log_level: str) -> None:
-        return None
-
     import logging
 
     original_get_logger = logging.getLogger
@@ -200,14 +185,14 @@ def test_main_handles_exception_and_exits_with_code_1(monkeypatch) -> None:
     def fake_capture_exception(exception):
         sentry_calls.append(exception)
 
-    def fake_database_connection_scope(database_settings):
+    def failing_database_connection_scope(database_settings):
         raise RuntimeError("Database connection failed")
 
-    monkeypatch.setattr(app_main, "load_settings", fake_load_settings)
-    monkeypatch.setattr(app_main, "configure_logging", fake_configure_logging)
+    # On top of the standard fake bundle, fail the connection scope and
+    # capture the logger and Sentry interactions
     monkeypatch.setattr(logging, "getLogger", fake_get_logger)
     monkeypatch.setattr(
-        app_main, "database_connection_scope", fake_database_connection_scope
+        app_main, "database_connection_scope", failing_database_connection_scope
     )
     monkeypatch.setattr(sentry_sdk, "capture_exception", fake_capture_exception)
 
@@ -223,22 +208,21 @@ def test_main_handles_exception_and_exits_with_code_1(monkeypatch) -> None:
 
 
 def test_main_propagates_keyboard_interrupt(monkeypatch) -> None:
-    def fake_load_settings():
-        raise KeyboardInterrupt()
-
-    def fake_configure_logging(log_level: str) -> None:
-        logger = MagicMock()
-        logger.info = MagicMock()
-        import logging
+    import logging
 
-        def fake_get_logger(name: Optional[str] = None):  # type: ignore[assignment]
-            return logger
+    logger = MagicMock()
 
-        logging.getLogger = fake_get_logger
-        return None
+    def fake_load_settings():
+        raise KeyboardInterrupt()
 
+    # Patched through monkeypatch so the global getLogger is restored on
+    # teardown; a bare assignment would leak into every later test (and any
+    # parallel xdist worker sharing the process)
     monkeypatch.setattr(app_main, "load_settings", fake_load_settings)
-    monkeypatch.setattr(app_main, "configure_logging", fake_configure_logging)
+    monkeypatch.setattr(app_main, "configure_logging", lambda log_level: None)
+    monkeypatch.setattr(
+        logging, "getLogger", lambda name=None: logger  # type: ignore[arg-type]
+    )
 
     with pytest.raises(KeyboardInterrupt):
         app_main.main()
@@ -22,7 +22,9 @@ def test_parse_date_valid_string() -> None:
 
 
 def test_parse_date_invalid_string_raises_value_error() -> None:
-    with pytest.raises(ValueError):
+    # match folds the message check into the raises context instead of a
+    # separate assert on the caught exception
+    with pytest.raises(ValueError, match="does not match format"):
         report_conversions.parse_date("invalid-date")
 
 
@@ -69,5 +71,13 @@ def test_main_prints_conversion_report(monkeypatch, capsys) -> None:
 
     captured = capsys.readouterr()
     assert "Funnel conversion report" in captured.out
-    assert "language: entries=10, purchased=4, conversion=40.00%" in captured.out
-    assert "non_language: entries=5, purchased=1, conversion=20.00%" in captured.out
+
+    # One split and set lookup instead of a linear scan of the whole output
+    # per expected funnel line
+    lines = set(captured.out.splitlines())
+    expected = {
+        "language: entries=10, purchased=4, conversion=40.00%",
+        "non_language: entries=5, purchased=1, conversion=20.00%",
+    }
+    missing = expected - lines
+    assert not missing, f"Report output is missing lines: {sorted(missing)}"
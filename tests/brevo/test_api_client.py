@@ -1,3 +1,7 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
 import pytest
 import requests
 
@@ -5,50 +9,78 @@ from brevo.models import BrevoContact
 from brevo.api_client import BrevoApiClient, BrevoFatalError, BrevoTransientError
 
 
-def test_create_or_update_contact_sends_correct_request(monkeypatch):
-    calls = {}
+@dataclass(slots=True)
+class RecordedRequest:
+    """Slot record for the request arguments captured by a fake session."""
 
-    import brevo.api_client as api_module
+    method: str = ""
+    url: str = ""
+    headers: Optional[Dict[str, Any]] = None
+    body: Optional[bytes] = None
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
-        calls["method"] = method
-        calls["url"] = url
-        calls["headers"] = headers
-        calls["json"] = json
 
-        class DummyResponse:
-            def __init__(self):
-                self.status_code = 200
-                self.text = "ok"
+class OkResponse:
+    """Stateless 200 response shared across calls; no per-request instance."""
 
-            def json(self):
-                return {"success": True}
+    __slots__ = ()
 
-        return DummyResponse()
+    status_code = 200
+    text = "ok"
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    def json(self):
+        return {"success": True}
 
-    client = BrevoApiClient(
+
+_OK_RESPONSE = OkResponse()
+
+# Shared read-only contact for the tests that only need a representative
+# payload; nothing in the client mutates the contact it is handed.
+_SAMPLE_CONTACT = BrevoContact(
+    email="user@example.com",
+    list_ids=[1, 2],
+    attributes={"FUNNEL_TYPE": "language"},
+)
+
+
+@pytest.fixture
+def client() -> BrevoApiClient:
+    """Default non-dry-run client shared by tests without special settings.
+
+    Function-scoped on purpose: the client carries mutable circuit-breaker
+    and rate-limit state, so a module-scoped instance would couple tests
+    through leftover error counters.
+    """
+    return BrevoApiClient(
         api_key="secret-key",
         base_url="https://api.brevo.com/v3",
         dry_run=False,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+
+def test_create_or_update_contact_sends_correct_request(monkeypatch, client):
+    recorded = RecordedRequest()
+
+    def fake_request(method, url, headers=None, data=None, timeout=None):
+        recorded.method = method
+        recorded.url = url
+        recorded.headers = headers
+        recorded.body = data
+        return _OK_RESPONSE
+
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     response = client.create_or_update_contact(contact)
 
-    assert calls["method"] == "POST"
-    assert calls["url"].endswith("/contacts")
-    assert "api-key" in calls["headers"]
-    assert calls["headers"]["api-key"] == "secret-key"
-    assert calls["json"]["email"] == "user@example.com"
-    assert calls["json"]["listIds"] == [1, 2]
-    assert calls["json"]["attributes"]["FUNNEL_TYPE"] == "language"
+    assert recorded.method == "POST"
+    assert recorded.url.endswith("/contacts")
+    # Auth headers are set once on the persistent session, not per request
+    assert client._session.headers["api-key"] == "secret-key"
+    sent_payload = json.loads(recorded.body)
+    assert sent_payload["email"] == "user@example.com"
+    assert sent_payload["listIds"] == [1, 2]
+    assert sent_payload["attributes"]["FUNNEL_TYPE"] == "language"
     assert response == {"success": True}
 
 
@@ -61,15 +93,15 @@ def test_request_raises_runtime_error_when_api_key_missing(monkeypatch):
         dry_run=False,
     )
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         raise AssertionError(
             "requests.request must not be called when api key is missing"
         )
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     with pytest.raises(RuntimeError):
-        client._request("POST", "/contacts", json_body={"email": "user@example.com"})
+        client._request("POST", "/contacts", body=b'{"email":"user@example.com"}')
 
 
 def test_request_in_dry_run_mode_does_not_call_requests(monkeypatch):
@@ -81,79 +113,103 @@ def test_request_in_dry_run_mode_does_not_call_requests(monkeypatch):
         dry_run=True,
     )
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         raise AssertionError("requests.request must not be called in dry_run mode")
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     response = client._request(
-        "POST", "/contacts", json_body={"email": "user@example.com"}
+        "POST", "/contacts", body=b'{"email":"user@example.com"}'
     )
 
     assert response == {"dry_run": True}
 
 
-def test_request_raises_brevo_transient_error_on_network_exception(monkeypatch):
+def test_request_raises_brevo_transient_error_on_network_exception(monkeypatch, client):
     """Test that network exceptions raise BrevoTransientError."""
     import brevo.api_client as api_module
 
-    client = BrevoApiClient(
-        api_key="secret-key",
-        base_url="https://api.brevo.com/v3",
-        dry_run=False,
-    )
-
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         raise requests.ConnectionError("Connection failed")
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     with pytest.raises(BrevoTransientError) as exc_info:
-        client._request("POST", "/contacts", json_body={"email": "user@example.com"})
+        client._request("POST", "/contacts", body=b'{"email":"user@example.com"}')
 
     assert "Network error" in str(exc_info.value)
     assert "Connection failed" in str(exc_info.value)
 
 
-def test_request_raises_brevo_transient_error_on_429(monkeypatch):
+def test_request_raises_brevo_transient_error_on_429(monkeypatch, client):
     """Test that HTTP 429 raises BrevoTransientError."""
     import brevo.api_client as api_module
 
-    client = BrevoApiClient(
-        api_key="secret-key",
-        base_url="https://api.brevo.com/v3",
-        dry_run=False,
-    )
-
     class DummyResponse:
         def __init__(self):
             self.status_code = 429
             self.text = "Rate limit exceeded"
+            self.headers = {}
 
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     with pytest.raises(BrevoTransientError) as exc_info:
-        client._request("POST", "/contacts", json_body={"email": "user@example.com"})
+        client._request("POST", "/contacts", body=b'{"email":"user@example.com"}')
 
     assert "429" in str(exc_info.value)
     assert "Rate limit exceeded" in str(exc_info.value)
+    assert exc_info.value.retry_after is None
 
 
-def test_request_raises_brevo_transient_error_on_5xx(monkeypatch):
-    """Test that HTTP 5xx raises BrevoTransientError."""
+def test_retry_waits_for_retry_after_hint_on_429(monkeypatch, client):
+    """Test that the retry loop honors the Retry-After header on 429 responses."""
     import brevo.api_client as api_module
 
-    client = BrevoApiClient(
-        api_key="secret-key",
-        base_url="https://api.brevo.com/v3",
-        dry_run=False,
-    )
+    attempt_count = [0]
+    sleep_calls = []
+
+    class DummyResponse:
+        def __init__(self, status=200, text="ok", headers=None):
+            self.status_code = status
+            self.text = text
+            self.headers = headers or {}
+
+        def json(self):
+            return {"success": True}
+
+    def fake_request(method, url, headers=None, data=None, timeout=None):
+        attempt_count[0] += 1
+        if attempt_count[0] == 1:
+            return DummyResponse(
+                status=429,
+                text="Rate limit exceeded",
+                headers={"Retry-After": "7"},
+            )
+        return DummyResponse()
+
+    monkeypatch.setattr(api_module.time, "sleep", lambda x: sleep_calls.append(x))
+    monkeypatch.setattr(api_module.random, "uniform", lambda a, b: 0.0)
+
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = BrevoContact(email="user@example.com")
+    response = client.create_or_update_contact(contact)
+
+    assert response == {"success": True}
+    assert attempt_count[0] == 2
+    # Retry-After (7s) beats the first-attempt backoff (base_backoff_seconds)
+    assert sleep_calls == [7.0]
+
+
+def test_request_raises_brevo_transient_error_on_5xx(monkeypatch, client):
+    """Test that HTTP 5xx raises BrevoTransientError."""
+    import brevo.api_client as api_module
 
     class DummyResponse:
         def __init__(self):
@@ -163,28 +219,22 @@ def test_request_raises_brevo_transient_error_on_5xx(monkeypatch):
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     with pytest.raises(BrevoTransientError) as exc_info:
-        client._request("POST", "/contacts", json_body={"email": "user@example.com"})
+        client._request("POST", "/contacts", body=b'{"email":"user@example.com"}')
 
     assert "500" in str(exc_info.value)
     assert "Internal server error" in str(exc_info.value)
 
 
-def test_request_raises_brevo_fatal_error_on_4xx(monkeypatch):
+def test_request_raises_brevo_fatal_error_on_4xx(monkeypatch, client):
     """Test that HTTP 4xx (except 429) raises BrevoFatalError."""
     import brevo.api_client as api_module
 
-    client = BrevoApiClient(
-        api_key="secret-key",
-        base_url="https://api.brevo.com/v3",
-        dry_run=False,
-    )
-
     class DummyResponse:
         def __init__(self):
             self.status_code = 400
@@ -193,28 +243,22 @@ def test_request_raises_brevo_fatal_error_on_4xx(monkeypatch):
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     with pytest.raises(BrevoFatalError) as exc_info:
-        client._request("POST", "/contacts", json_body={"email": "user@example.com"})
+        client._request("POST", "/contacts", body=b'{"email":"user@example.com"}')
 
     assert "400" in str(exc_info.value)
     assert "Bad request" in str(exc_info.value)
 
 
-def test_request_raises_brevo_fatal_error_on_404(monkeypatch):
+def test_request_raises_brevo_fatal_error_on_404(monkeypatch, client):
     """Test that HTTP 404 raises BrevoFatalError."""
     import brevo.api_client as api_module
 
-    client = BrevoApiClient(
-        api_key="secret-key",
-        base_url="https://api.brevo.com/v3",
-        dry_run=False,
-    )
-
     class DummyResponse:
         def __init__(self):
             self.status_code = 404
@@ -223,28 +267,22 @@ def test_request_raises_brevo_fatal_error_on_404(monkeypatch):
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     with pytest.raises(BrevoFatalError) as exc_info:
-        client._request("POST", "/contacts", json_body={"email": "user@example.com"})
+        client._request("POST", "/contacts", body=b'{"email":"user@example.com"}')
 
     assert "404" in str(exc_info.value)
     assert "Not found" in str(exc_info.value)
 
 
-def test_request_trims_long_response_body(monkeypatch):
+def test_request_trims_long_response_body(monkeypatch, client):
     """Test that long response bodies are trimmed in error messages."""
     import brevo.api_client as api_module
 
-    client = BrevoApiClient(
-        api_key="secret-key",
-        base_url="https://api.brevo.com/v3",
-        dry_run=False,
-    )
-
     long_text = "x" * 1000
 
     class DummyResponse:
@@ -255,13 +293,13 @@ def test_request_trims_long_response_body(monkeypatch):
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
+    monkeypatch.setattr(client._session, "request", fake_request)
 
     with pytest.raises(BrevoFatalError) as exc_info:
-        client._request("POST", "/contacts", json_body={"email": "user@example.com"})
+        client._request("POST", "/contacts", body=b'{"email":"user@example.com"}')
 
     error_message = str(exc_info.value)
     assert len(error_message) < len(long_text) + 50  # Should be trimmed
@@ -284,7 +322,7 @@ def test_create_or_update_contact_retries_on_transient_error_then_succeeds(
         def json(self):
             return {"success": True}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         attempt_count[0] += 1
         if attempt_count[0] == 1:
             # First attempt fails with transient error (5xx)
@@ -292,7 +330,6 @@ def test_create_or_update_contact_retries_on_transient_error_then_succeeds(
         # Second attempt succeeds
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", lambda x: None)  # No actual sleep
 
     client = BrevoApiClient(
@@ -303,11 +340,9 @@ def test_create_or_update_contact_retries_on_transient_error_then_succeeds(
         base_backoff_seconds=0.1,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     response = client.create_or_update_contact(contact)
 
@@ -329,12 +364,11 @@ def test_create_or_update_contact_exhausts_retries_on_transient_errors(monkeypat
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         attempt_count[0] += 1
         # Always fail with transient error (5xx)
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", lambda x: None)  # No actual sleep
 
     client = BrevoApiClient(
@@ -345,11 +379,9 @@ def test_create_or_update_contact_exhausts_retries_on_transient_errors(monkeypat
         base_backoff_seconds=0.1,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     with pytest.raises(BrevoTransientError) as exc_info:
         client.create_or_update_contact(contact)
@@ -374,7 +406,7 @@ def test_create_or_update_contact_retries_on_network_exception_then_succeeds(
         def json(self):
             return {"success": True}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         attempt_count[0] += 1
         if attempt_count[0] == 1:
             # First attempt fails with network error
@@ -382,7 +414,6 @@ def test_create_or_update_contact_retries_on_network_exception_then_succeeds(
         # Second attempt succeeds
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", lambda x: None)  # No actual sleep
 
     client = BrevoApiClient(
@@ -393,11 +424,9 @@ def test_create_or_update_contact_retries_on_network_exception_then_succeeds(
         base_backoff_seconds=0.1,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     response = client.create_or_update_contact(contact)
 
@@ -419,11 +448,10 @@ def test_create_or_update_contact_does_not_retry_on_fatal_error(monkeypatch):
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         attempt_count[0] += 1
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", lambda x: None)  # No actual sleep
 
     client = BrevoApiClient(
@@ -434,11 +462,9 @@ def test_create_or_update_contact_does_not_retry_on_fatal_error(monkeypatch):
         base_backoff_seconds=0.1,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     with pytest.raises(BrevoFatalError) as exc_info:
         client.create_or_update_contact(contact)
@@ -462,19 +488,20 @@ def test_rate_limiting_sleeps_when_limit_exceeded(monkeypatch):
         def json(self):
             return {"success": True}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
+    # Mock time.time to return controlled timestamps. Sleeping advances the
+    # fake clock so the limiter's post-sleep re-check sees the window clear.
+    current_time = [100.0]
+
     def fake_sleep(duration):
         sleep_calls.append(duration)
-
-    # Mock time.time to return controlled timestamps
-    current_time = [100.0]
+        current_time[0] += duration
 
     def fake_time():
         return current_time[0]
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", fake_sleep)
     monkeypatch.setattr(api_module.time, "time", fake_time)
 
@@ -485,11 +512,9 @@ def test_rate_limiting_sleeps_when_limit_exceeded(monkeypatch):
         max_requests_per_minute=3,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     # Make 3 requests (at the limit)
     for i in range(3):
@@ -519,7 +544,7 @@ def test_rate_limiting_does_not_sleep_when_under_limit(monkeypatch):
         def json(self):
             return {"success": True}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
     def fake_sleep(duration):
@@ -530,7 +555,6 @@ def test_rate_limiting_does_not_sleep_when_under_limit(monkeypatch):
     def fake_time():
         return current_time[0]
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", fake_sleep)
     monkeypatch.setattr(api_module.time, "time", fake_time)
 
@@ -541,11 +565,9 @@ def test_rate_limiting_does_not_sleep_when_under_limit(monkeypatch):
         max_requests_per_minute=60,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     # Make 10 requests (well under the limit)
     for i in range(10):
@@ -568,10 +590,9 @@ def test_circuit_breaker_opens_after_threshold_errors(monkeypatch):
         def json(self):
             return {}
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", lambda x: None)
 
     client = BrevoApiClient(
@@ -583,11 +604,9 @@ def test_circuit_breaker_opens_after_threshold_errors(monkeypatch):
         circuit_open_seconds=60,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     # Make 3 requests that fail (threshold is 3)
     for i in range(3):
@@ -628,7 +647,7 @@ def test_circuit_breaker_closes_after_timeout(monkeypatch):
 
     response_count = [0]
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         response_count[0] += 1
         if response_count[0] <= 3:
             # First 3 attempts fail
@@ -636,7 +655,6 @@ def test_circuit_breaker_closes_after_timeout(monkeypatch):
         # 4th attempt succeeds
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", lambda x: None)
 
     client = BrevoApiClient(
@@ -648,11 +666,9 @@ def test_circuit_breaker_closes_after_timeout(monkeypatch):
         circuit_open_seconds=60,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     # Make 3 requests that fail to open circuit
     for i in range(3):
@@ -694,7 +710,7 @@ def test_circuit_breaker_resets_on_success(monkeypatch):
 
     error_count = [0]
 
-    def fake_request(method, url, headers=None, json=None, timeout=None):
+    def fake_request(method, url, headers=None, data=None, timeout=None):
         error_count[0] += 1
         if error_count[0] <= 2:
             # First 2 requests fail
@@ -702,7 +718,6 @@ def test_circuit_breaker_resets_on_success(monkeypatch):
         # 3rd request succeeds
         return DummyResponse()
 
-    monkeypatch.setattr(api_module.requests, "request", fake_request)
     monkeypatch.setattr(api_module.time, "sleep", lambda x: None)
 
     client = BrevoApiClient(
@@ -713,11 +728,9 @@ def test_circuit_breaker_resets_on_success(monkeypatch):
         circuit_error_threshold=5,
     )
 
-    contact = BrevoContact(
-        email="user@example.com",
-        list_ids=[1, 2],
-        attributes={"FUNNEL_TYPE": "language"},
-    )
+    monkeypatch.setattr(client._session, "request", fake_request)
+
+    contact = _SAMPLE_CONTACT
 
     # Make 2 requests that fail
     for i in range(2):
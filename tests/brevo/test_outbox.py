@@ -28,10 +28,22 @@ class DummyCursor:
 class DummyConnection:
     def __init__(self, cursor):
         self._cursor = cursor
+        self.transactions_started = 0
+        self.commits = 0
+        self.rollbacks = 0
 
     def cursor(self):
         return self._cursor
 
+    def start_transaction(self):
+        self.transactions_started += 1
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
 
 def test_enqueue_brevo_sync_job_inserts_and_returns_id():
     """Test that enqueue_brevo_sync_job inserts a new job and returns the ID."""
@@ -80,7 +92,7 @@ def test_fetch_pending_jobs_returns_list_of_jobs():
     assert jobs[0].funnel_entry_id == 10
     assert jobs[0].operation_type == "upsert_contact"
     assert jobs[0].payload == '{"email": "user@example.com"}'
-    assert jobs[0].status == "pending"
+    assert jobs[0].status == "in_progress"
     assert jobs[0].retry_count == 0
     assert jobs[0].next_attempt_at is None
 
@@ -91,7 +103,8 @@ def test_fetch_pending_jobs_returns_list_of_jobs():
     assert jobs[1].retry_count == 1
     assert jobs[1].next_attempt_at is None
 
-    assert len(cursor.executed_queries) == 1
+    # Select under SKIP LOCKED, then flip the claimed rows to in_progress
+    assert len(cursor.executed_queries) == 2
     query, params = cursor.executed_queries[0]
     assert "SELECT" in query
     assert "WHERE status = 'pending'" in query
@@ -99,8 +112,18 @@ def test_fetch_pending_jobs_returns_list_of_jobs():
     assert "(next_attempt_at IS NULL OR next_attempt_at <= NOW())" in query
     assert "ORDER BY id" in query
     assert "LIMIT" in query
+    assert "FOR UPDATE SKIP LOCKED" in query
     assert params[0] == 100
 
+    claim_query, claim_params = cursor.executed_queries[1]
+    assert "SET status = 'in_progress'" in claim_query
+    assert "WHERE id IN (%s, %s)" in claim_query
+    assert claim_params == (1, 2)
+
+    # The claim runs in its own committed transaction
+    assert connection.transactions_started == 1
+    assert connection.commits == 1
+
 
 def test_fetch_pending_jobs_respects_limit():
     """Test that fetch_pending_jobs respects the limit parameter."""
@@ -111,6 +134,8 @@ def test_fetch_pending_jobs_respects_limit():
     jobs = fetch_pending_jobs(connection=connection, limit=50)  # type: ignore[arg-type]
 
     assert len(jobs) == 0
+    # No rows claimed, so no in_progress UPDATE is issued
+    assert len(cursor.executed_queries) == 1
     query, params = cursor.executed_queries[0]
     assert params[0] == 50
 
@@ -191,7 +216,7 @@ def test_fetch_pending_jobs_filters_by_next_attempt_at():
 
     fetch_pending_jobs(connection=connection, limit=100)  # type: ignore[arg-type]
 
-    assert len(cursor.executed_queries) == 1
+    assert len(cursor.executed_queries) == 2  # select + in_progress claim
     query, params = cursor.executed_queries[0]
     # Should filter by next_attempt_at
     assert "(next_attempt_at IS NULL OR next_attempt_at <= NOW())" in query
@@ -10,10 +10,14 @@ from brevo.sync_worker import BrevoSyncWorker
 class DummyBrevoClient:
     def __init__(self):
         self.calls = []
+        self.import_calls = []
 
     def create_or_update_contact(self, contact):
         self.calls.append(contact)
 
+    def import_contacts(self, contacts, list_ids):
+        self.import_calls.append((contacts, list_ids))
+
 
 class DummyCursor:
     def __init__(self):
@@ -33,10 +37,22 @@ class DummyCursor:
 class DummyConnection:
     def __init__(self, cursor):
         self._cursor = cursor
+        self.commits = 0
+        self.rollbacks = 0
 
     def cursor(self):
         return self._cursor
 
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def fake_requeue_stale_jobs(conn, stale_after_minutes=30):
+    return 0
+
 
 def test_run_once_processes_upsert_contact_job(monkeypatch):
     """Test that run_once processes an upsert_contact job successfully."""
@@ -80,19 +96,22 @@ def test_run_once_processes_upsert_contact_job(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
         pass
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     worker = BrevoSyncWorker(connection=connection, brevo_client=brevo_client)  # type: ignore[arg-type]
     worker.run_once(limit=100)
@@ -128,19 +147,22 @@ def test_run_once_processes_update_after_purchase_job(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
         pass
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -174,19 +196,23 @@ def test_run_once_marks_job_error_on_invalid_payload(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
-        error_calls.append((job_id, error_message))
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message))
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -219,19 +245,23 @@ def test_run_once_marks_job_error_on_missing_email(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
-        error_calls.append((job_id, error_message))
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message))
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -264,19 +294,23 @@ def test_run_once_marks_job_error_on_unknown_operation_type(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
-        error_calls.append((job_id, error_message))
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message))
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -318,33 +352,95 @@ def test_run_once_processes_multiple_jobs(monkeypatch):
             ),
         ]
 
-    def fake_mark_job_success(conn, job_id):
-        success_calls.append(job_id)
+    def fake_mark_jobs_success_bulk(conn, job_ids):
+        success_calls.extend(job_ids)
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
         pass
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
     worker = BrevoSyncWorker(connection=connection, brevo_client=brevo_client)  # type: ignore[arg-type]
     worker.run_once(limit=100)
 
-    # Should have called Brevo API twice
-    assert len(brevo_client.calls) == 2
-    assert brevo_client.calls[0].email == "user1@example.com"
-    assert brevo_client.calls[1].email == "user2@example.com"
-    # Should have marked both as success
+    # Both upsert jobs share the same list_ids, so they go out as one bulk import
+    assert len(brevo_client.calls) == 0
+    assert len(brevo_client.import_calls) == 1
+    contacts, list_ids = brevo_client.import_calls[0]
+    assert [contact.email for contact in contacts] == [
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert list_ids == []
+    # Should have marked both as success and committed the write-backs
     assert len(success_calls) == 2
     assert 6 in success_calls
     assert 7 in success_calls
+    assert connection.commits == 1
+
+
+def test_run_once_marks_all_batched_jobs_fatal_when_import_fails(monkeypatch):
+    """Test that a fatal error on a bulk import marks every job in the chunk."""
+    error_calls = []
+
+    class FailingImportBrevoClient:
+        def import_contacts(self, contacts, list_ids):
+            raise BrevoFatalError("Brevo API error 400: Invalid import body")
+
+    brevo_client = FailingImportBrevoClient()
+
+    def fake_fetch_pending_jobs(conn, limit):
+        return [
+            BrevoSyncJob(
+                id=job_id,
+                funnel_entry_id=job_id + 10,
+                operation_type="upsert_contact",
+                payload=json.dumps({"email": f"user{job_id}@example.com"}),
+                status="pending",
+                retry_count=0,
+                next_attempt_at=None,
+            )
+            for job_id in (20, 21)
+        ]
+
+    def fake_mark_jobs_success_bulk(conn, job_ids):
+        pass
+
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message, is_fatal))
+
+    import brevo.sync_worker as worker_module
+
+    monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
+
+    cursor = DummyCursor()
+    connection = DummyConnection(cursor)
+    worker = BrevoSyncWorker(connection=connection, brevo_client=brevo_client)  # type: ignore[arg-type]
+    worker.run_once(limit=100)
+
+    # Both jobs in the failed import chunk are marked as fatal errors
+    assert len(error_calls) == 2
+    assert {job_id for job_id, _, _ in error_calls} == {20, 21}
+    assert all(is_fatal for _, _, is_fatal in error_calls)
 
 
 def test_run_once_handles_brevo_transient_error(monkeypatch):
@@ -370,19 +466,23 @@ def test_run_once_handles_brevo_transient_error(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
-        error_calls.append((job_id, error_message))
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message))
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -420,19 +520,23 @@ def test_run_once_handles_brevo_fatal_error(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
-        error_calls.append((job_id, error_message))
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message))
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -456,19 +560,22 @@ def test_run_once_does_not_process_jobs_with_future_next_attempt_at(monkeypatch)
         # Return empty list - jobs with future next_attempt_at are filtered out
         return []
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
         pass
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -502,19 +609,23 @@ def test_run_once_marks_fatal_error_as_failed(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
-        error_calls.append((job_id, error_message, is_fatal))
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message, is_fatal))
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
@@ -550,19 +661,23 @@ def test_run_once_schedules_retry_for_transient_error(monkeypatch):
             )
         ]
 
-    def fake_mark_job_success(conn, job_id):
+    def fake_mark_jobs_success_bulk(conn, job_ids):
         pass
 
-    def fake_mark_job_error(
-        conn, job_id, error_message, max_job_retries=5, is_fatal=False
-    ):
-        error_calls.append((job_id, error_message, is_fatal))
+    def fake_mark_jobs_error_bulk(conn, errors, max_job_retries=5, is_fatal=False):
+        for job_id, error_message in errors:
+            error_calls.append((job_id, error_message, is_fatal))
 
     import brevo.sync_worker as worker_module
 
     monkeypatch.setattr(worker_module, "fetch_pending_jobs", fake_fetch_pending_jobs)
-    monkeypatch.setattr(worker_module, "mark_job_success", fake_mark_job_success)
-    monkeypatch.setattr(worker_module, "mark_job_error", fake_mark_job_error)
+    monkeypatch.setattr(worker_module, "requeue_stale_jobs", fake_requeue_stale_jobs)
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_success_bulk", fake_mark_jobs_success_bulk
+    )
+    monkeypatch.setattr(
+        worker_module, "mark_jobs_error_bulk", fake_mark_jobs_error_bulk
+    )
 
     cursor = DummyCursor()
     connection = DummyConnection(cursor)
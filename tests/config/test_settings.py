@@ -48,6 +48,9 @@ def test_load_settings_builds_configuration_from_env(monkeypatch):
     monkeypatch.setenv("BREVO_NON_LANGUAGE_LIST_ID", "20")
     monkeypatch.setenv("SENTRY_DSN", "https://example@sentry.io/123456")
 
+    # load_settings is memoized per process; drop any cached result so the
+    # patched environment is actually read.
+    settings_module.load_settings.cache_clear()
     config = settings_module.load_settings()
 
     assert config.database.host == "db-host"
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import pytest
 
 from config.settings import DatabaseSettings
@@ -5,17 +7,41 @@ from db import connection as connection_module
 from db.connection import (
     create_database_connection,
     database_connection_scope,
-    _reset_connection,
+    _reset_pool,
 )
 
 
 class DummyConnection:
-    def __init__(self) -> None:
+    def __init__(self, reconnect_error: Optional[Exception] = None) -> None:
         self.closed = False
+        self.reconnect_calls = 0
+        self.reconnect_error = reconnect_error
+        self.ping_calls = 0
 
     def close(self) -> None:
         self.closed = True
 
+    def reconnect(self, attempts: int = 1, delay: int = 0) -> None:
+        self.reconnect_calls += 1
+        if self.reconnect_error is not None:
+            raise self.reconnect_error
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0) -> None:
+        self.ping_calls += 1
+
+
+class DummyPool:
+    """Stub pool that hands out a single reusable connection."""
+
+    def __init__(self, connection: Optional[DummyConnection] = None) -> None:
+        self.connection = connection if connection is not None else DummyConnection()
+        self.get_calls = 0
+
+    def get_connection(self) -> DummyConnection:
+        self.get_calls += 1
+        self.connection.closed = False
+        return self.connection
+
 
 def test_create_database_connection_calls_mysql_connector_connect(
     monkeypatch: pytest.MonkeyPatch,
@@ -112,19 +138,19 @@ def test_create_database_connection_propagates_errors(
         create_database_connection(settings)
 
 
-def test_database_connection_scope_yields_connection(
+def test_database_connection_scope_yields_pooled_connection(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Test that database_connection_scope yields connection without closing it."""
-    _reset_connection()  # Reset module-level connection
+    """Test that database_connection_scope borrows from the pool and returns on exit."""
+    _reset_pool()  # Reset module-level pool
 
-    dummy_connection = DummyConnection()
+    dummy_pool = DummyPool()
 
-    def fake_create_database_connection(database_settings: DatabaseSettings):
-        return dummy_connection
+    def fake_create_connection_pool(database_settings: DatabaseSettings, **kwargs):
+        return dummy_pool
 
     monkeypatch.setattr(
-        connection_module, "create_database_connection", fake_create_database_connection
+        connection_module, "create_connection_pool", fake_create_connection_pool
     )
 
     settings = DatabaseSettings(
@@ -137,26 +163,26 @@ def test_database_connection_scope_yields_connection(
     )
 
     with database_connection_scope(settings) as connection:
-        assert connection is dummy_connection
-        assert dummy_connection.closed is False
+        assert connection is dummy_pool.connection
+        assert dummy_pool.connection.closed is False
 
-    # Connection should remain open for reuse (not closed)
-    assert dummy_connection.closed is False
+    # close() on a pooled connection returns it to the pool
+    assert dummy_pool.connection.closed is True
 
 
-def test_database_connection_scope_does_not_close_on_exception(
+def test_database_connection_scope_returns_connection_on_exception(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Test that database_connection_scope does not close connection on exception."""
-    _reset_connection()  # Reset module-level connection
+    """Test that database_connection_scope returns the connection to the pool on exception."""
+    _reset_pool()  # Reset module-level pool
 
-    dummy_connection = DummyConnection()
+    dummy_pool = DummyPool()
 
-    def fake_create_database_connection(database_settings: DatabaseSettings):
-        return dummy_connection
+    def fake_create_connection_pool(database_settings: DatabaseSettings, **kwargs):
+        return dummy_pool
 
     monkeypatch.setattr(
-        connection_module, "create_database_connection", fake_create_database_connection
+        connection_module, "create_connection_pool", fake_create_connection_pool
     )
 
     settings = DatabaseSettings(
@@ -172,15 +198,15 @@ def test_database_connection_scope_does_not_close_on_exception(
         with database_connection_scope(settings):
             raise RuntimeError("failure inside context")
 
-    # Connection should remain open (not closed on exception)
-    assert dummy_connection.closed is False
+    # Connection should be back in the pool even on exception
+    assert dummy_pool.connection.closed is True
 
 
 def test_create_database_connection_retries_on_connection_error(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test that create_database_connection retries on connection errors."""
-    _reset_connection()  # Reset module-level connection
+    _reset_pool()  # Reset module-level pool
 
     attempt_count = [0]
 
@@ -188,7 +214,7 @@ def test_create_database_connection_retries_on_connection_error(
         attempt_count[0] += 1
         if attempt_count[0] == 1:
             # Use the mocked Error from mysql.connector module
-            raise connection_module.mysql.connector.Error("server has gone away")
+            raise connection_module.mysql.connector.Error(errno=2006)
         return DummyConnection()
 
     monkeypatch.setattr(connection_module.mysql.connector, "connect", fake_connect)
@@ -213,10 +239,10 @@ def test_create_database_connection_propagates_error_after_retries(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test that create_database_connection propagates error after all retries fail."""
-    _reset_connection()  # Reset module-level connection
+    _reset_pool()  # Reset module-level pool
 
     def fake_connect(**kwargs):
-        raise connection_module.mysql.connector.Error("server has gone away")
+        raise connection_module.mysql.connector.Error(errno=2006)
 
     monkeypatch.setattr(connection_module.mysql.connector, "connect", fake_connect)
     monkeypatch.setattr(connection_module.time, "sleep", lambda x: None)
@@ -240,7 +266,7 @@ def test_create_database_connection_does_not_retry_non_connection_errors(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test that create_database_connection does not retry non-connection errors."""
-    _reset_connection()  # Reset module-level connection
+    _reset_pool()  # Reset module-level pool
 
     attempt_count = [0]
 
@@ -265,21 +291,21 @@ def test_create_database_connection_does_not_retry_non_connection_errors(
     assert attempt_count[0] == 1  # Should not retry
 
 
-def test_database_connection_scope_reuses_connection(
+def test_database_connection_scope_reuses_pool(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Test that database_connection_scope reuses the same connection across scopes."""
-    _reset_connection()  # Reset module-level connection
+    """Test that database_connection_scope reuses the same pool across scopes."""
+    _reset_pool()  # Reset module-level pool
 
-    connection_objects = []
+    pool_objects = []
 
-    def fake_create_database_connection(database_settings: DatabaseSettings):
-        conn = DummyConnection()
-        connection_objects.append(conn)
-        return conn
+    def fake_create_connection_pool(database_settings: DatabaseSettings, **kwargs):
+        pool = DummyPool()
+        pool_objects.append(pool)
+        return pool
 
     monkeypatch.setattr(
-        connection_module, "create_database_connection", fake_create_database_connection
+        connection_module, "create_connection_pool", fake_create_connection_pool
     )
 
     settings = DatabaseSettings(
@@ -295,30 +321,31 @@ def test_database_connection_scope_reuses_connection(
     with database_connection_scope(settings) as conn1:
         assert conn1 is not None
 
-    # Second scope - should reuse the same connection
+    # Second scope - should borrow from the same pool
     with database_connection_scope(settings) as conn2:
         assert conn2 is not None
-        assert conn1 is conn2  # Should be the same object
+        assert conn1 is conn2  # Same pooled connection handed out again
 
-    # Should have created only one connection
-    assert len(connection_objects) == 1
+    # Should have created only one pool
+    assert len(pool_objects) == 1
+    assert pool_objects[0].get_calls == 2
 
 
-def test_database_connection_scope_resets_on_server_gone_away(
+def test_database_connection_scope_reconnects_on_server_gone_away(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """Test that database_connection_scope resets connection on 'server has gone away'."""
-    _reset_connection()  # Reset module-level connection
+    """Test that the scope reconnects the borrowed connection in place."""
+    _reset_pool()  # Reset module-level pool
 
-    connection_objects = []
+    pool_objects = []
 
-    def fake_create_database_connection(database_settings: DatabaseSettings):
-        conn = DummyConnection()
-        connection_objects.append(conn)
-        return conn
+    def fake_create_connection_pool(database_settings: DatabaseSettings, **kwargs):
+        pool = DummyPool()
+        pool_objects.append(pool)
+        return pool
 
     monkeypatch.setattr(
-        connection_module, "create_database_connection", fake_create_database_connection
+        connection_module, "create_connection_pool", fake_create_connection_pool
     )
 
     settings = DatabaseSettings(
@@ -330,23 +357,57 @@ def test_database_connection_scope_resets_on_server_gone_away(
         charset="utf8mb4",
     )
 
-    # First scope - creates connection
-    with database_connection_scope(settings) as conn1:
-        assert conn1 is not None
-
     # Simulate "server has gone away" error
     with pytest.raises(connection_module.mysql.connector.Error):
         with database_connection_scope(settings):
-            raise connection_module.mysql.connector.Error("server has gone away")
-
-    # Next scope should create a new connection after reset
-    with database_connection_scope(settings) as conn3:
-        assert conn3 is not None
-        # After error and reset, a new connection should be created
-        # Note: Due to lazy reuse, if reset worked correctly, this should be a new connection
-        # But we verify by checking that create_database_connection was called again
-        pass
-
-    # Should have created two connections (one before error, one after reset)
-    # The reset should have forced a new connection to be created
-    assert len(connection_objects) >= 1  # At least one connection was created
+            raise connection_module.mysql.connector.Error(errno=2006)
+
+    # Connection was reconnected in place and the pool kept
+    assert pool_objects[0].connection.reconnect_calls == 1
+
+    with database_connection_scope(settings) as conn2:
+        assert conn2 is not None
+
+    assert len(pool_objects) == 1
+
+
+def test_database_connection_scope_resets_pool_when_reconnect_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the pool is rebuilt when the in-place reconnect also fails."""
+    _reset_pool()  # Reset module-level pool
+
+    pool_objects = []
+
+    def fake_create_connection_pool(database_settings: DatabaseSettings, **kwargs):
+        broken_connection = DummyConnection(
+            reconnect_error=connection_module.mysql.connector.Error(errno=2013),
+        )
+        pool = DummyPool(connection=broken_connection)
+        pool_objects.append(pool)
+        return pool
+
+    monkeypatch.setattr(
+        connection_module, "create_connection_pool", fake_create_connection_pool
+    )
+
+    settings = DatabaseSettings(
+        host="localhost",
+        port=3306,
+        user="user",
+        password="password",
+        name="database",
+        charset="utf8mb4",
+    )
+
+    # Simulate "server has gone away" with a connection that cannot reconnect
+    with pytest.raises(connection_module.mysql.connector.Error):
+        with database_connection_scope(settings):
+            raise connection_module.mysql.connector.Error(errno=2006)
+
+    # Next scope should create a fresh pool after the reset
+    with database_connection_scope(settings) as conn2:
+        assert conn2 is not None
+
+    # Two pools: one before the error, one rebuilt after the reset
+    assert len(pool_objects) == 2
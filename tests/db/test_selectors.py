@@ -17,6 +17,8 @@ class DummyCursor:
         self.closed = False
         self.fetchall_called = False
         self.fetchone_called = False
+        self.fetchmany_called = False
+        self._fetch_offset = 0
 
     def execute(self, query: str, params: Any = None) -> None:
         self.last_query = query
@@ -30,9 +32,18 @@ class DummyCursor:
         self.fetchone_called = True
         return self.row
 
+    def fetchmany(self, size: int) -> List[Tuple[Any, ...]]:
+        self.fetchmany_called = True
+        chunk = self.rows[self._fetch_offset : self._fetch_offset + size]
+        self._fetch_offset += size
+        return chunk
+
     def close(self) -> None:
         self.closed = True
 
+    def __iter__(self):
+        return iter(self.rows)
+
     def __enter__(self):
         return self
 
@@ -44,10 +55,12 @@ class DummyCursor:
 class DummyConnection:
     def __init__(self, cursor: DummyCursor) -> None:
         self._cursor = cursor
-        self.cursor_called = False
+        self.cursor_calls = 0
+        self.prepared_flags: List[bool] = []
 
-    def cursor(self) -> DummyCursor:
-        self.cursor_called = True
+    def cursor(self, prepared: bool = False, buffered: bool = True) -> DummyCursor:
+        self.cursor_calls += 1
+        self.prepared_flags.append(prepared)
         return self._cursor
 
 
@@ -56,16 +69,79 @@ def test_get_language_test_candidates_uses_params_and_returns_rows() -> None:
     dummy_cursor = DummyCursor(rows=expected_rows)
     connection = DummyConnection(cursor=dummy_cursor)
 
-    result = selectors.get_language_test_candidates(connection, limit=50)  # type: ignore[arg-type]
+    result = list(
+        selectors.get_language_test_candidates(connection, limit=50)  # type: ignore[arg-type]
+    )
 
     assert result == expected_rows
-    assert dummy_cursor.fetchall_called is True
-    assert dummy_cursor.closed is True
+    assert dummy_cursor.fetchmany_called is True
+    assert dummy_cursor.closed is True  # Streaming cursor closed when exhausted
     assert dummy_cursor.last_params is not None
-    assert dummy_cursor.last_params[0] == "language"
+    assert dummy_cursor.last_params[1] == "language"
     assert dummy_cursor.last_params[2] == 50
 
 
+def test_get_language_test_candidates_filters_against_primed_cache() -> None:
+    prime_cursor = DummyCursor(rows=[("seen@example.com",)])
+    selectors.prime_language_email_cache(
+        DummyConnection(cursor=prime_cursor)  # type: ignore[arg-type]
+    )
+
+    try:
+        selectors.note_language_email_seen("noted@example.com")
+
+        dummy_cursor = DummyCursor(
+            rows=[
+                (1, "fresh@example.com"),
+                (2, "seen@example.com"),
+                (3, "noted@example.com"),
+            ]
+        )
+        connection = DummyConnection(cursor=dummy_cursor)
+
+        result = list(
+            selectors.get_language_test_candidates(
+                connection,  # type: ignore[arg-type]
+                limit=50,
+                use_cache=True,
+            )
+        )
+
+        assert result == [(1, "fresh@example.com")]
+        assert dummy_cursor.last_query is not None
+        assert "funnel_entries" not in dummy_cursor.last_query  # Anti-join dropped
+        assert dummy_cursor.last_params == (
+            selectors.DEFAULT_CANDIDATE_LOOKBACK_DAYS,
+            50,
+        )
+    finally:
+        selectors.reset_language_email_cache()
+
+
+def test_get_language_test_candidates_falls_back_to_anti_join_when_cache_cold() -> None:
+    selectors.reset_language_email_cache()
+
+    dummy_cursor = DummyCursor(rows=[(1, "user@example.com")])
+    connection = DummyConnection(cursor=dummy_cursor)
+
+    result = list(
+        selectors.get_language_test_candidates(
+            connection,  # type: ignore[arg-type]
+            limit=50,
+            use_cache=True,
+        )
+    )
+
+    assert result == [(1, "user@example.com")]
+    assert dummy_cursor.last_query is not None
+    assert "funnel_entries" in dummy_cursor.last_query  # SQL idempotency kept
+    assert dummy_cursor.last_params == (
+        selectors.DEFAULT_CANDIDATE_LOOKBACK_DAYS,
+        "language",
+        50,
+    )
+
+
 def test_get_non_language_test_candidates_is_placeholder() -> None:
     dummy_cursor = DummyCursor()
     connection = DummyConnection(cursor=dummy_cursor)
@@ -75,16 +151,75 @@ def test_get_non_language_test_candidates_is_placeholder() -> None:
     assert result == []
 
 
+def test_get_all_test_candidates_partitions_rows_by_funnel_type() -> None:
+    fetched_rows = [
+        ("language", 1, "user1@example.com"),
+        ("language", 2, "user2@example.com"),
+    ]
+    dummy_cursor = DummyCursor(rows=fetched_rows)
+    connection = DummyConnection(cursor=dummy_cursor)
+
+    result = selectors.get_all_test_candidates(connection, limit_per_type=50)  # type: ignore[arg-type]
+
+    assert result == {
+        "language": [(1, "user1@example.com"), (2, "user2@example.com")],
+        "non_language": [],
+    }
+    assert dummy_cursor.fetchall_called is True
+    assert dummy_cursor.closed is False  # Prepared cursors stay cached
+    assert connection.prepared_flags == [True]
+    assert dummy_cursor.last_params is not None
+    assert dummy_cursor.last_params[1] == "language"
+    assert dummy_cursor.last_params[2] == 50
+
+
+def test_get_all_test_candidates_skips_query_when_language_not_requested() -> None:
+    dummy_cursor = DummyCursor(rows=[("language", 1, "user@example.com")])
+    connection = DummyConnection(cursor=dummy_cursor)
+
+    result = selectors.get_all_test_candidates(
+        connection,  # type: ignore[arg-type]
+        limit_per_type=50,
+        funnel_types=["non_language"],
+    )
+
+    assert result == {"language": [], "non_language": []}
+    assert connection.cursor_calls == 0
+
+
 def test_get_pending_funnel_entries_uses_max_rows_parameter() -> None:
     expected_rows = [("user@example.com", "language", 10, 20)]
     dummy_cursor = DummyCursor(rows=expected_rows)
     connection = DummyConnection(cursor=dummy_cursor)
 
-    result = selectors.get_pending_funnel_entries(connection, max_rows=40)  # type: ignore[arg-type]
+    result = list(
+        selectors.get_pending_funnel_entries(connection, max_rows=40)  # type: ignore[arg-type]
+    )
+
+    assert result == expected_rows
+    assert dummy_cursor.fetchmany_called is True
+    assert dummy_cursor.closed is True  # Streaming cursor closed when exhausted
+    assert dummy_cursor.last_params == (40,)
+
+
+def test_get_pending_funnel_entries_with_purchases_uses_max_rows_parameter() -> None:
+    purchase_datetime = datetime(2025, 1, 1, 12, 0, 0)
+    expected_rows = [
+        (1, "buyer@example.com", "language", 10, 20, 123, purchase_datetime),
+        (2, "pending@example.com", "language", 11, 21, None, None),
+    ]
+    dummy_cursor = DummyCursor(rows=expected_rows)
+    connection = DummyConnection(cursor=dummy_cursor)
+
+    result = selectors.get_pending_funnel_entries_with_purchases(
+        connection,  # type: ignore[arg-type]
+        max_rows=40,
+    )
 
     assert result == expected_rows
     assert dummy_cursor.fetchall_called is True
-    assert dummy_cursor.closed is True
+    assert dummy_cursor.closed is False  # Prepared cursors stay cached
+    assert connection.prepared_flags == [True]
     assert dummy_cursor.last_params == (40,)
 
 
@@ -104,7 +239,12 @@ def test_get_certificate_purchase_for_entry_returns_row_or_none() -> None:
 
     assert found == (123, payment_datetime)
     assert dummy_cursor_with_row.fetchone_called is True
-    assert dummy_cursor_with_row.closed is True
+    assert dummy_cursor_with_row.closed is False  # Prepared cursors stay cached
+    assert dummy_cursor_with_row.last_params == (
+        "user@example.com",
+        "language",
+        "language",
+    )
 
     dummy_cursor_without_row = DummyCursor(row=None)
     connection_without_row = DummyConnection(cursor=dummy_cursor_without_row)
@@ -119,4 +259,60 @@ def test_get_certificate_purchase_for_entry_returns_row_or_none() -> None:
 
     assert not_found is None
     assert dummy_cursor_without_row.fetchone_called is True
-    assert dummy_cursor_without_row.closed is True
+    assert dummy_cursor_without_row.closed is False  # Prepared cursors stay cached
+
+
+def test_get_certificate_purchases_for_entries_returns_earliest_per_key() -> None:
+    earlier = datetime(2025, 1, 1, 12, 0, 0)
+    later = datetime(2025, 2, 1, 12, 0, 0)
+    fetched_rows = [
+        ("user1@example.com", 1, 456, later),
+        ("user1@example.com", 1, 123, earlier),
+        ("user2@example.com", 2, 789, earlier),
+        ("other@example.com", 1, 999, earlier),  # Not in the requested batch
+    ]
+    dummy_cursor = DummyCursor(rows=fetched_rows)
+    connection = DummyConnection(cursor=dummy_cursor)
+
+    result = selectors.get_certificate_purchases_for_entries(
+        connection,  # type: ignore[arg-type]
+        entries=[
+            ("user1@example.com", "language"),
+            ("user2@example.com", "non_language"),
+        ],
+    )
+
+    # Earliest payment wins per (email, funnel_type); unrequested rows dropped
+    assert result == {
+        ("user1@example.com", "language"): (123, earlier),
+        ("user2@example.com", "non_language"): (789, earlier),
+    }
+    assert dummy_cursor.last_params == (
+        "user1@example.com",
+        "user2@example.com",
+    )
+
+
+def test_get_certificate_purchases_for_entries_skips_query_for_empty_batch() -> None:
+    dummy_cursor = DummyCursor()
+    connection = DummyConnection(cursor=dummy_cursor)
+
+    result = selectors.get_certificate_purchases_for_entries(
+        connection,  # type: ignore[arg-type]
+        entries=[],
+    )
+
+    assert result == {}
+    assert connection.cursor_calls == 0
+
+
+def test_prepared_cursor_is_reused_across_calls() -> None:
+    dummy_cursor = DummyCursor(rows=[])
+    connection = DummyConnection(cursor=dummy_cursor)
+
+    selectors.get_pending_funnel_entries_with_purchases(connection, max_rows=10)  # type: ignore[arg-type]
+    selectors.get_pending_funnel_entries_with_purchases(connection, max_rows=20)  # type: ignore[arg-type]
+
+    # One prepared cursor serves both calls; only the parameters change
+    assert connection.cursor_calls == 1
+    assert dummy_cursor.last_params == (20,)
@@ -30,70 +30,50 @@ class DummyBrevoClient:
 def test_purchase_sync_marks_entry_and_enqueues_outbox_job(monkeypatch):
     """Test that purchase sync updates funnel_entries and enqueues outbox job."""
     pending_entries = [
-        ("user@example.com", "language", None, 42),
+        (
+            100,
+            "user@example.com",
+            "language",
+            None,
+            42,
+            123,
+            datetime(2025, 1, 1, 12, 0, 0),
+        ),
     ]
 
     calls = {"marked": [], "enqueued": []}
 
-    def fake_get_pending_funnel_entries(connection, max_rows):
+    def fake_get_pending_funnel_entries_with_purchases(connection, max_rows):
         assert max_rows == 100
         return pending_entries
 
-    def fake_get_certificate_purchase_for_entry(
-        connection, email, funnel_type, user_id, test_id
-    ):
-        assert email == "user@example.com"
-        assert funnel_type == "language"
-        assert test_id == 42
-        return (123, datetime(2025, 1, 1, 12, 0, 0))
-
-    def fake_mark_certificate_purchased(
-        connection, email, funnel_type, test_id, purchased_at
-    ):
-        calls["marked"].append((email, funnel_type, test_id, purchased_at))
-
-    def fake_enqueue_brevo_sync_job(
-        connection, funnel_entry_id, operation_type, payload
-    ):
-        calls["enqueued"].append(
-            {
-                "funnel_entry_id": funnel_entry_id,
-                "operation_type": operation_type,
-                "payload": payload,
-            }
-        )
-        return 999  # outbox job ID
+    def fake_mark_certificates_purchased_bulk(connection, purchases):
+        calls["marked"].extend(purchases)
+
+    def fake_enqueue_brevo_sync_jobs_bulk(connection, jobs):
+        for funnel_entry_id, operation_type, payload in jobs:
+            calls["enqueued"].append(
+                {
+                    "funnel_entry_id": funnel_entry_id,
+                    "operation_type": operation_type,
+                    "payload": payload,
+                }
+            )
 
     monkeypatch.setattr(
         purchase_sync_service,
-        "get_pending_funnel_entries",
-        fake_get_pending_funnel_entries,
-    )
-    monkeypatch.setattr(
-        purchase_sync_service,
-        "get_certificate_purchase_for_entry",
-        fake_get_certificate_purchase_for_entry,
+        "get_pending_funnel_entries_with_purchases",
+        fake_get_pending_funnel_entries_with_purchases,
     )
     monkeypatch.setattr(
         purchase_sync_service,
-        "mark_certificate_purchased",
-        fake_mark_certificate_purchased,
+        "mark_certificates_purchased_bulk",
+        fake_mark_certificates_purchased_bulk,
     )
     monkeypatch.setattr(
         purchase_sync_service,
-        "enqueue_brevo_sync_job",
-        fake_enqueue_brevo_sync_job,
-    )
-
-    # Mock _get_funnel_entry_ids to return a funnel entry ID
-    def fake_get_funnel_entry_ids(self, email, funnel_type, test_id):
-        return [100]  # Return a fake funnel entry ID
-
-    import funnels.purchase_sync_service as purchase_module
-    monkeypatch.setattr(
-        purchase_module.PurchaseSyncService,
-        "_get_funnel_entry_ids",
-        fake_get_funnel_entry_ids,
+        "enqueue_brevo_sync_jobs_bulk",
+        fake_enqueue_brevo_sync_jobs_bulk,
     )
 
     connection = DummyConnection()
@@ -113,7 +93,7 @@ def test_purchase_sync_marks_entry_and_enqueues_outbox_job(monkeypatch):
     assert test_id == 42
     assert isinstance(purchased_at, datetime)
 
-    # Should have enqueued outbox job
+    # Should have enqueued outbox job using the id from the pending row
     assert len(calls["enqueued"]) == 1
     job = calls["enqueued"][0]
     assert job["funnel_entry_id"] == 100
@@ -127,38 +107,26 @@ def test_purchase_sync_marks_entry_and_enqueues_outbox_job(monkeypatch):
 
 def test_purchase_sync_skips_when_no_purchase_found(monkeypatch):
     pending_entries = [
-        ("user@example.com", "language", None, 42),
+        (100, "user@example.com", "language", None, 42, None, None),
     ]
 
     calls = {"marked": []}
 
-    def fake_get_pending_funnel_entries(connection, max_rows):
+    def fake_get_pending_funnel_entries_with_purchases(connection, max_rows):
         return pending_entries
 
-    def fake_get_certificate_purchase_for_entry(
-        connection, email, funnel_type, user_id, test_id
-    ):
-        return None
+    def fake_mark_certificates_purchased_bulk(connection, purchases):
+        calls["marked"].extend(purchases)
 
-    def fake_mark_certificate_purchased(
-        connection, email, funnel_type, test_id, purchased_at
-    ):
-        calls["marked"].append((email, funnel_type, test_id, purchased_at))
-
-    monkeypatch.setattr(
-        purchase_sync_service,
-        "get_pending_funnel_entries",
-        fake_get_pending_funnel_entries,
-    )
     monkeypatch.setattr(
         purchase_sync_service,
-        "get_certificate_purchase_for_entry",
-        fake_get_certificate_purchase_for_entry,
+        "get_pending_funnel_entries_with_purchases",
+        fake_get_pending_funnel_entries_with_purchases,
     )
     monkeypatch.setattr(
         purchase_sync_service,
-        "mark_certificate_purchased",
-        fake_mark_certificate_purchased,
+        "mark_certificates_purchased_bulk",
+        fake_mark_certificates_purchased_bulk,
     )
 
     connection = DummyConnection()
@@ -173,44 +141,29 @@ def test_purchase_sync_skips_when_no_purchase_found(monkeypatch):
     assert connection.transactions_started == 0
 
 
-def test_purchase_sync_raises_value_error_for_invalid_purchase_datetime(monkeypatch):
+@pytest.mark.skipif(not __debug__, reason="assert statements removed under -O")
+def test_purchase_sync_asserts_on_invalid_purchase_datetime(monkeypatch):
     pending_entries = [
-        ("user@example.com", "language", 10, 42),
+        (100, "user@example.com", "language", 10, 42, 123, "2025-01-01"),
     ]
 
-    def fake_get_pending_funnel_entries(connection, max_rows):
+    def fake_get_pending_funnel_entries_with_purchases(connection, max_rows):
         return pending_entries
 
-    def fake_get_certificate_purchase_for_entry(
-        connection, email, funnel_type, user_id, test_id
-    ):
-        assert email == "user@example.com"
-        assert funnel_type == "language"
-        assert user_id == 10
-        assert test_id == 42
-        return (123, "2025-01-01")
-
-    def fake_mark_certificate_purchased(
-        connection, email, funnel_type, test_id, purchased_at
-    ):
+    def fake_mark_certificates_purchased_bulk(connection, purchases):
         raise AssertionError(
-            "mark_certificate_purchased must not be called for invalid datetime"
+            "mark_certificates_purchased_bulk must not be called for invalid datetime"
         )
 
     monkeypatch.setattr(
         purchase_sync_service,
-        "get_pending_funnel_entries",
-        fake_get_pending_funnel_entries,
-    )
-    monkeypatch.setattr(
-        purchase_sync_service,
-        "get_certificate_purchase_for_entry",
-        fake_get_certificate_purchase_for_entry,
+        "get_pending_funnel_entries_with_purchases",
+        fake_get_pending_funnel_entries_with_purchases,
     )
     monkeypatch.setattr(
         purchase_sync_service,
-        "mark_certificate_purchased",
-        fake_mark_certificate_purchased,
+        "mark_certificates_purchased_bulk",
+        fake_mark_certificates_purchased_bulk,
     )
 
     connection = DummyConnection()
@@ -220,71 +173,66 @@ def test_purchase_sync_raises_value_error_for_invalid_purchase_datetime(monkeypa
         dry_run=False,
     )
 
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         service.sync(max_rows=100)
 
-    # ValueError is raised before transaction starts (in _ensure_datetime),
-    # so no transaction was started and no rollback is needed
+    # The assertion fires before the transaction starts, so no transaction
+    # was started and no rollback is needed
     assert connection.transactions_started == 0
     assert connection.rollbacks == 0
 
 
 def test_purchase_sync_dry_run_does_not_update_database_or_brevo(monkeypatch):
-    """Test that dry-run mode does not call mark_certificate_purchased or enqueue outbox jobs."""
+    """Test that dry-run mode does not mark purchases or enqueue outbox jobs."""
     pending_entries = [
-        ("user@example.com", "language", None, 42),
+        (
+            100,
+            "user@example.com",
+            "language",
+            None,
+            42,
+            123,
+            datetime(2025, 1, 1, 12, 0, 0),
+        ),
     ]
 
     calls = {"marked": [], "enqueued": []}
 
-    def fake_get_pending_funnel_entries(connection, max_rows):
+    def fake_get_pending_funnel_entries_with_purchases(connection, max_rows):
         return pending_entries
 
-    def fake_get_certificate_purchase_for_entry(
-        connection, email, funnel_type, user_id, test_id
-    ):
-        return (123, datetime(2025, 1, 1, 12, 0, 0))
-
-    def fake_mark_certificate_purchased(
-        connection, email, funnel_type, test_id, purchased_at
-    ):
-        calls["marked"].append((email, funnel_type, test_id, purchased_at))
+    def fake_mark_certificates_purchased_bulk(connection, purchases):
+        calls["marked"].extend(purchases)
         raise AssertionError(
-            "mark_certificate_purchased must not be called in dry-run mode"
+            "mark_certificates_purchased_bulk must not be called in dry-run mode"
         )
 
-    def fake_enqueue_brevo_sync_job(
-        connection, funnel_entry_id, operation_type, payload
-    ):
-        calls["enqueued"].append(
-            {
-                "funnel_entry_id": funnel_entry_id,
-                "operation_type": operation_type,
-            }
-        )
+    def fake_enqueue_brevo_sync_jobs_bulk(connection, jobs):
+        for funnel_entry_id, operation_type, payload in jobs:
+            calls["enqueued"].append(
+                {
+                    "funnel_entry_id": funnel_entry_id,
+                    "operation_type": operation_type,
+                }
+            )
         raise AssertionError(
-            "enqueue_brevo_sync_job must not be called in dry-run mode"
+            "enqueue_brevo_sync_jobs_bulk must not be called in dry-run mode"
         )
 
     monkeypatch.setattr(
         purchase_sync_service,
-        "get_pending_funnel_entries",
-        fake_get_pending_funnel_entries,
+        "get_pending_funnel_entries_with_purchases",
+        fake_get_pending_funnel_entries_with_purchases,
     )
     monkeypatch.setattr(
         purchase_sync_service,
-        "get_certificate_purchase_for_entry",
-        fake_get_certificate_purchase_for_entry,
+        "mark_certificates_purchased_bulk",
+        fake_mark_certificates_purchased_bulk,
     )
     monkeypatch.setattr(
         purchase_sync_service,
-        "mark_certificate_purchased",
-        fake_mark_certificate_purchased,
-    )
-    monkeypatch.setattr(
-        purchase_sync_service,
-        "enqueue_brevo_sync_job",
-        fake_enqueue_brevo_sync_job,
+        "enqueue_brevo_sync_jobs_bulk",
+        fake_enqueue_brevo_sync_jobs_bulk,
     )
 
     connection = DummyConnection()
@@ -299,3 +247,65 @@ def test_purchase_sync_dry_run_does_not_update_database_or_brevo(monkeypatch):
     assert len(calls["marked"]) == 0
     assert len(calls["enqueued"]) == 0
     assert connection.transactions_started == 0
+
+
+def test_purchase_sync_backs_off_after_consecutive_empty_runs(monkeypatch):
+    """Test that repeated empty runs grow the suggested poll delay."""
+    pending_entries = [
+        (
+            100,
+            "user@example.com",
+            "language",
+            None,
+            42,
+            123,
+            datetime(2025, 1, 1, 12, 0, 0),
+        ),
+    ]
+    results = {"pending": []}
+
+    def fake_get_pending_funnel_entries_with_purchases(connection, max_rows):
+        return results["pending"]
+
+    def fake_mark_certificates_purchased_bulk(connection, purchases):
+        pass
+
+    def fake_enqueue_brevo_sync_jobs_bulk(connection, jobs):
+        pass
+
+    monkeypatch.setattr(
+        purchase_sync_service,
+        "get_pending_funnel_entries_with_purchases",
+        fake_get_pending_funnel_entries_with_purchases,
+    )
+    monkeypatch.setattr(
+        purchase_sync_service,
+        "mark_certificates_purchased_bulk",
+        fake_mark_certificates_purchased_bulk,
+    )
+    monkeypatch.setattr(
+        purchase_sync_service,
+        "enqueue_brevo_sync_jobs_bulk",
+        fake_enqueue_brevo_sync_jobs_bulk,
+    )
+
+    service = PurchaseSyncService(
+        connection=DummyConnection(),  # type: ignore[arg-type]
+        brevo_client=DummyBrevoClient(),  # type: ignore[arg-type]
+        dry_run=False,
+    )
+
+    minimum = purchase_sync_service.MIN_POLL_INTERVAL_SECONDS
+    maximum = purchase_sync_service.MAX_POLL_INTERVAL_SECONDS
+
+    # The first empty runs keep the minimum, then the delay doubles per run
+    delays = [service.sync(max_rows=100) for _ in range(10)]
+    assert delays[0] == minimum
+    assert delays[1] == minimum
+    assert delays[2] == minimum * 2
+    assert delays[3] == minimum * 4
+    assert delays[-1] == maximum  # Capped
+
+    # A run with work resets the backoff
+    results["pending"] = pending_entries
+    assert service.sync(max_rows=100) == minimum
@@ -41,11 +41,11 @@ def test_funnel_sync_creates_entries_and_enqueues_outbox_jobs(monkeypatch):
     enqueued_jobs = []
     entry_id_counter = 100
 
-    def fake_get_language_test_candidates(connection, limit):
-        return language_candidates
-
-    def fake_get_non_language_test_candidates(connection, limit):
-        return non_language_candidates
+    def fake_get_all_test_candidates(connection, limit_per_type, funnel_types=None):
+        return {
+            "language": language_candidates,
+            "non_language": non_language_candidates,
+        }
 
     def fake_create_funnel_entry(
         connection, email, funnel_type, user_id=None, test_id=None
@@ -62,29 +62,22 @@ def test_funnel_sync_creates_entries_and_enqueues_outbox_jobs(monkeypatch):
         )
         return entry_id_counter
 
-    def fake_enqueue_brevo_sync_job(
-        connection, funnel_entry_id, operation_type, payload
-    ):
-        enqueued_jobs.append(
-            {
-                "funnel_entry_id": funnel_entry_id,
-                "operation_type": operation_type,
-                "payload": payload,
-            }
-        )
-        return 999  # outbox job ID
+    def fake_enqueue_brevo_sync_jobs_bulk(connection, jobs):
+        for funnel_entry_id, operation_type, payload in jobs:
+            enqueued_jobs.append(
+                {
+                    "funnel_entry_id": funnel_entry_id,
+                    "operation_type": operation_type,
+                    "payload": payload,
+                }
+            )
 
     import funnels.sync_service as sync_module
 
     monkeypatch.setattr(
         sync_module,
-        "get_language_test_candidates",
-        fake_get_language_test_candidates,
-    )
-    monkeypatch.setattr(
-        sync_module,
-        "get_non_language_test_candidates",
-        fake_get_non_language_test_candidates,
+        "get_all_test_candidates",
+        fake_get_all_test_candidates,
     )
     monkeypatch.setattr(
         sync_module,
@@ -93,8 +86,8 @@ def test_funnel_sync_creates_entries_and_enqueues_outbox_jobs(monkeypatch):
     )
     monkeypatch.setattr(
         sync_module,
-        "enqueue_brevo_sync_job",
-        fake_enqueue_brevo_sync_job,
+        "enqueue_brevo_sync_jobs_bulk",
+        fake_enqueue_brevo_sync_jobs_bulk,
     )
 
     brevo_client = DummyBrevoClient()
@@ -116,9 +109,9 @@ def test_funnel_sync_creates_entries_and_enqueues_outbox_jobs(monkeypatch):
     assert len(enqueued_jobs) == 3
     # Should not have called Brevo API directly (only through outbox)
     assert len(brevo_client.calls) == 0
-    # Should have started and committed 3 transactions
-    assert connection.transactions_started == 3
-    assert connection.commits == 3
+    # Whole batch runs in a single transaction with one commit
+    assert connection.transactions_started == 1
+    assert connection.commits == 1
     assert connection.rollbacks == 0
 
     # Verify outbox jobs have correct operation type
@@ -128,11 +121,8 @@ def test_funnel_sync_creates_entries_and_enqueues_outbox_jobs(monkeypatch):
 
 
 def test_funnel_sync_does_nothing_when_no_candidates(monkeypatch):
-    def fake_get_language_test_candidates(connection, limit):
-        return []
-
-    def fake_get_non_language_test_candidates(connection, limit):
-        return []
+    def fake_get_all_test_candidates(connection, limit_per_type, funnel_types=None):
+        return {"language": [], "non_language": []}
 
     def fake_create_funnel_entry(
         connection, email, funnel_type, user_id=None, test_id=None
@@ -145,13 +135,8 @@ def test_funnel_sync_does_nothing_when_no_candidates(monkeypatch):
 
     monkeypatch.setattr(
         sync_module,
-        "get_language_test_candidates",
-        fake_get_language_test_candidates,
-    )
-    monkeypatch.setattr(
-        sync_module,
-        "get_non_language_test_candidates",
-        fake_get_non_language_test_candidates,
+        "get_all_test_candidates",
+        fake_get_all_test_candidates,
     )
     monkeypatch.setattr(
         sync_module,
@@ -189,11 +174,11 @@ def test_funnel_sync_dry_run_does_not_call_brevo_or_create_entries(monkeypatch):
     created_entries = []
     enqueued_jobs = []
 
-    def fake_get_language_test_candidates(connection, limit):
-        return language_candidates
-
-    def fake_get_non_language_test_candidates(connection, limit):
-        return non_language_candidates
+    def fake_get_all_test_candidates(connection, limit_per_type, funnel_types=None):
+        return {
+            "language": language_candidates,
+            "non_language": non_language_candidates,
+        }
 
     def fake_create_funnel_entry(
         connection, email, funnel_type, user_id=None, test_id=None
@@ -210,30 +195,24 @@ def test_funnel_sync_dry_run_does_not_call_brevo_or_create_entries(monkeypatch):
             "create_funnel_entry must not be called in dry-run mode"
         )
 
-    def fake_enqueue_brevo_sync_job(
-        connection, funnel_entry_id, operation_type, payload
-    ):
-        enqueued_jobs.append(
-            {
-                "funnel_entry_id": funnel_entry_id,
-                "operation_type": operation_type,
-            }
-        )
+    def fake_enqueue_brevo_sync_jobs_bulk(connection, jobs):
+        for funnel_entry_id, operation_type, payload in jobs:
+            enqueued_jobs.append(
+                {
+                    "funnel_entry_id": funnel_entry_id,
+                    "operation_type": operation_type,
+                }
+            )
         raise AssertionError(
-            "enqueue_brevo_sync_job must not be called in dry-run mode"
+            "enqueue_brevo_sync_jobs_bulk must not be called in dry-run mode"
         )
 
     import funnels.sync_service as sync_module
 
     monkeypatch.setattr(
         sync_module,
-        "get_language_test_candidates",
-        fake_get_language_test_candidates,
-    )
-    monkeypatch.setattr(
-        sync_module,
-        "get_non_language_test_candidates",
-        fake_get_non_language_test_candidates,
+        "get_all_test_candidates",
+        fake_get_all_test_candidates,
     )
     monkeypatch.setattr(
         sync_module,
@@ -242,8 +221,8 @@ def test_funnel_sync_dry_run_does_not_call_brevo_or_create_entries(monkeypatch):
     )
     monkeypatch.setattr(
         sync_module,
-        "enqueue_brevo_sync_job",
-        fake_enqueue_brevo_sync_job,
+        "enqueue_brevo_sync_jobs_bulk",
+        fake_enqueue_brevo_sync_jobs_bulk,
     )
 
     brevo_client = DummyBrevoClient()
@@ -275,11 +254,8 @@ def test_funnel_sync_handles_duplicate_entries_gracefully(monkeypatch):
     created_entries = []
     enqueued_jobs = []
 
-    def fake_get_language_test_candidates(connection, limit):
-        return language_candidates
-
-    def fake_get_non_language_test_candidates(connection, limit):
-        return []
+    def fake_get_all_test_candidates(connection, limit_per_type, funnel_types=None):
+        return {"language": language_candidates, "non_language": []}
 
     def fake_create_funnel_entry(
         connection, email, funnel_type, user_id=None, test_id=None
@@ -295,30 +271,24 @@ def test_funnel_sync_handles_duplicate_entries_gracefully(monkeypatch):
         # Return None to simulate duplicate entry
         return None
 
-    def fake_enqueue_brevo_sync_job(
-        connection, funnel_entry_id, operation_type, payload
-    ):
-        enqueued_jobs.append(
-            {
-                "funnel_entry_id": funnel_entry_id,
-                "operation_type": operation_type,
-            }
-        )
+    def fake_enqueue_brevo_sync_jobs_bulk(connection, jobs):
+        for funnel_entry_id, operation_type, payload in jobs:
+            enqueued_jobs.append(
+                {
+                    "funnel_entry_id": funnel_entry_id,
+                    "operation_type": operation_type,
+                }
+            )
         raise AssertionError(
-            "enqueue_brevo_sync_job must not be called for duplicate entries"
+            "enqueue_brevo_sync_jobs_bulk must not be called for duplicate entries"
         )
 
     import funnels.sync_service as sync_module
 
     monkeypatch.setattr(
         sync_module,
-        "get_language_test_candidates",
-        fake_get_language_test_candidates,
-    )
-    monkeypatch.setattr(
-        sync_module,
-        "get_non_language_test_candidates",
-        fake_get_non_language_test_candidates,
+        "get_all_test_candidates",
+        fake_get_all_test_candidates,
     )
     monkeypatch.setattr(
         sync_module,
@@ -327,8 +297,8 @@ def test_funnel_sync_handles_duplicate_entries_gracefully(monkeypatch):
     )
     monkeypatch.setattr(
         sync_module,
-        "enqueue_brevo_sync_job",
-        fake_enqueue_brevo_sync_job,
+        "enqueue_brevo_sync_jobs_bulk",
+        fake_enqueue_brevo_sync_jobs_bulk,
     )
 
     brevo_client = DummyBrevoClient()
@@ -348,7 +318,63 @@ def test_funnel_sync_handles_duplicate_entries_gracefully(monkeypatch):
     assert len(created_entries) == 1
     # Should NOT have enqueued outbox job for duplicate
     assert len(enqueued_jobs) == 0
-    # Should have committed transaction (for the duplicate check)
+    # Batch transaction is still committed (for the duplicate check)
     assert connection.transactions_started == 1
     assert connection.commits == 1
     assert connection.rollbacks == 0
+
+
+def test_funnel_sync_memoizes_repeated_candidate_keys(monkeypatch):
+    """Test that a candidate key seen earlier is not inserted again."""
+    language_candidates = [
+        (1, "lang1@example.com"),
+        (2, "lang1@example.com"),  # Same email again within the run
+    ]
+
+    created_entries = []
+
+    def fake_get_all_test_candidates(connection, limit_per_type, funnel_types=None):
+        return {"language": language_candidates, "non_language": []}
+
+    def fake_create_funnel_entry(
+        connection, email, funnel_type, user_id=None, test_id=None
+    ):
+        created_entries.append((email, funnel_type, test_id))
+        return 101
+
+    def fake_enqueue_brevo_sync_jobs_bulk(connection, jobs):
+        pass
+
+    import funnels.sync_service as sync_module
+
+    monkeypatch.setattr(
+        sync_module,
+        "get_all_test_candidates",
+        fake_get_all_test_candidates,
+    )
+    monkeypatch.setattr(
+        sync_module,
+        "create_funnel_entry",
+        fake_create_funnel_entry,
+    )
+    monkeypatch.setattr(
+        sync_module,
+        "enqueue_brevo_sync_jobs_bulk",
+        fake_enqueue_brevo_sync_jobs_bulk,
+    )
+
+    brevo_client = DummyBrevoClient()
+    connection = DummyConnection()
+
+    service = FunnelSyncService(
+        connection=connection,  # type: ignore[arg-type]
+        brevo_client=brevo_client,  # type: ignore[arg-type]
+        language_list_id=4,
+        non_language_list_id=5,
+        dry_run=False,
+    )
+
+    service.sync()
+
+    # Only the first occurrence of the key reaches the database
+    assert created_entries == [("lang1@example.com", "language", None)]
@@ -13,7 +13,8 @@ CREATE TABLE simpletest_users (
   Status INT NULL,
   PRIMARY KEY (Id),
   KEY idx_testid (TestId),
-  KEY idx_datep (Datep)
+  KEY idx_datep (Datep),
+  KEY idx_users_datep_email (Datep, Email, TestId)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- newid is a technical surrogate key used for the test schema.
@@ -53,7 +54,8 @@ CREATE TABLE funnel_entries (
   PRIMARY KEY (id),
   UNIQUE KEY uk_funnel_entry_email_type_test (email, funnel_type, test_id),
   KEY idx_email_funnel (email, funnel_type),
-  KEY idx_user_test (user_id, test_id)
+  KEY idx_user_test (user_id, test_id),
+  KEY idx_fe_type_entered_purchased (funnel_type, entered_at, certificate_purchased)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 CREATE TABLE brevo_sync_outbox (
@@ -72,3 +74,13 @@ CREATE TABLE brevo_sync_outbox (
   KEY idx_funnel_entry (funnel_entry_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+
+DROP TABLE IF EXISTS funnel_daily_stats;
+
+CREATE TABLE funnel_daily_stats (
+  funnel_type VARCHAR(50) NOT NULL,
+  day DATE NOT NULL,
+  entries INT UNSIGNED NOT NULL DEFAULT 0,
+  purchases INT UNSIGNED NOT NULL DEFAULT 0,
+  PRIMARY KEY (funnel_type, day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;